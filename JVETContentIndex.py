@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Full text index of the documents of the documents directory for the
+#     JVET Meetings File Finder, the text of the Office XML (docx, pptx,
+#     xlsx) and PDF files is extracted in a pool of processes and kept in a
+#     SQLite FTS5 table searched with bm25 ranking and snippets
+#
+# PDF files are only indexed if pypdf is installed, it is imported by the
+# function that uses it
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import concurrent.futures
+import importlib.util
+import io
+import multiprocessing
+import os
+import re
+import sqlite3
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+# Version of the index layout, indexes of other versions are rebuilt
+INDEX_VERSION = '1'
+
+# Parts of each Office XML format holding its text
+OFFICE_PARTS = {'.docx': r'word/(document|footnotes|endnotes|comments|header\d*|footer\d*)\.xml',
+                '.docm': r'word/(document|footnotes|endnotes|comments|header\d*|footer\d*)\.xml',
+                '.pptx': r'ppt/(slides/slide|notesSlides/notesSlide)\d+\.xml',
+                '.pptm': r'ppt/(slides/slide|notesSlides/notesSlide)\d+\.xml',
+                '.xlsx': r'xl/(sharedStrings|worksheets/sheet\d+)\.xml',
+                '.xlsm': r'xl/(sharedStrings|worksheets/sheet\d+)\.xml'}
+
+# XML elements ending a line of text (paragraphs, shared strings and rows) and elements taken as a space (cells too)
+LINE_TAGS = {'p', 'si', 'row'}
+SPACE_TAGS = {'tab', 'br', 'c'}
+
+# Maximum number of characters indexed of each document
+MAX_TEXT = 4 * 2**20
+
+# Get the text of an Office XML part (the text of its t elements)
+def get_xml_text(data):
+    text = []
+
+    for event, element in ElementTree.iterparse(io.BytesIO(data)):
+        tag = element.tag.rsplit('}', 1)[-1]
+
+        if tag == 't' and element.text:
+            text.append(element.text)
+        elif tag in LINE_TAGS:
+            text.append('\n')
+        elif tag in SPACE_TAGS:
+            text.append(' ')
+
+        element.clear()
+
+    return ''.join(text)
+
+# Get the text of an Office XML file (parts in their natural order, e.g. slide2 before slide10)
+def get_office_text(path, extension):
+    with zipfile.ZipFile(path) as archive:
+        parts = [name for name in archive.namelist() if re.fullmatch(OFFICE_PARTS[extension], name)]
+        parts.sort(key=lambda name: [int(token) if token.isdigit() else token for token in re.split(r'(\d+)', name)])
+
+        return '\n'.join(get_xml_text(archive.read(name)) for name in parts)
+
+# Get the text of a PDF file
+def get_pdf_text(path):
+    import pypdf
+
+    return '\n'.join(page.extract_text() or '' for page in pypdf.PdfReader(path).pages)
+
+# Get the text of a document (runs in the indexing processes), None if it can not be read
+def extract_text(path):
+    extension = os.path.splitext(path)[1].lower()
+
+    try:
+        text = get_pdf_text(path) if extension == '.pdf' else get_office_text(path, extension)
+    except Exception:
+        # Damaged or unexpected files are indexed by name only, the parsers raise too many kinds of errors to list
+        return None
+
+    return text[:MAX_TEXT]
+
+# Get the extensions of the documents that can be indexed (PDF only with pypdf)
+def get_extensions():
+    extensions = set(OFFICE_PARTS)
+
+    if importlib.util.find_spec('pypdf') is not None:
+        extensions.add('.pdf')
+
+    return extensions
+
+class ContentIndex:
+    def __init__(self, index_path):
+        self.index_path = Path(index_path)
+
+    # Method to open the index, a connection is opened per operation so the index can be used from any thread
+    # The index is in WAL mode so searches can run while it is being updated
+    def connect(self):
+        conn = sqlite3.connect(str(self.index_path), timeout=30)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('''CREATE TABLE IF NOT EXISTS meta (
+                            key   TEXT PRIMARY KEY,
+                            value TEXT
+                        )''')
+        # One row per document file with the size and modification time of the version indexed
+        conn.execute('''CREATE TABLE IF NOT EXISTS docs (
+                            id       INTEGER PRIMARY KEY,
+                            path     TEXT UNIQUE,
+                            parent   TEXT,
+                            name     TEXT,
+                            size     INTEGER,
+                            mtime_ns INTEGER
+                        )''')
+        # Text of each document (rowid is the id of the document)
+        conn.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts
+                        USING fts5(name, body, tokenize='unicode61 remove_diacritics 2')''')
+
+        return conn
+
+    # Method to get a value of the meta table (None if it is not set)
+    def get_meta(self, conn, key):
+        row = conn.execute('SELECT value FROM meta WHERE key = ?', [key]).fetchone()
+        return row[0] if row is not None else None
+
+    # Method to get the documents directory the index was built for (None if it was never built)
+    def get_root(self):
+        if not self.index_path.exists():
+            return None
+
+        conn = self.connect()
+        try:
+            if self.get_meta(conn, 'version') != INDEX_VERSION:
+                return None
+            return self.get_meta(conn, 'root')
+        finally:
+            conn.close()
+
+    # Method to list the documents of a folder tree that can be indexed as {path: [parent, name, size, modification time]}
+    # Office lock files (~$) and the files of the crawler (#) are left out
+    def scan_documents(self, directory):
+        extensions = get_extensions()
+        documents = {}
+        pending = [os.path.abspath(directory)]
+
+        while pending:
+            parent = pending.pop()
+
+            try:
+                with os.scandir(parent) as scanner:
+                    entries = list(scanner)
+            except OSError:
+                continue
+
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name[:1] not in ('~', '#') and os.path.splitext(entry.name)[1].lower() in extensions:
+                        stat = entry.stat()
+                        documents[entry.path] = [parent, entry.name, stat.st_size, stat.st_mtime_ns]
+                except OSError:
+                    continue
+
+        return documents
+
+    # Method to remove a document from the index
+    def remove_document(self, conn, doc_id):
+        conn.execute('DELETE FROM docs WHERE id = ?', [doc_id])
+        conn.execute('DELETE FROM docs_fts WHERE rowid = ?', [doc_id])
+
+    # Method to bring the index up to date with the documents directory
+    # Only new documents and new versions of documents (other size or modification time) are read, in a pool of jobs
+    # processes, and the documents that are gone are removed; the index is built from scratch for another directory
+    # Progress is committed as it goes so an update that is cancelled (is_cancelled returns True) is resumed by the next one
+    # progress is called with the number of documents read and to read
+    def update(self, documents_directory, jobs=None, is_cancelled=None, progress=None):
+        conn = self.connect()
+        try:
+            if self.get_meta(conn, 'version') != INDEX_VERSION or self.get_meta(conn, 'root') != str(documents_directory):
+                conn.execute('DELETE FROM docs')
+                conn.execute('DELETE FROM docs_fts')
+                conn.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                                 [['version', INDEX_VERSION], ['root', str(documents_directory)]])
+                conn.commit()
+
+            documents = self.scan_documents(documents_directory)
+            indexed = {row[0]: row[1:] for row in conn.execute('SELECT path, id, size, mtime_ns FROM docs')}
+
+            for path, [doc_id, size, mtime] in indexed.items():
+                if path not in documents:
+                    self.remove_document(conn, doc_id)
+            conn.commit()
+
+            changed = [path for path, document in documents.items() if path not in indexed or list(indexed[path][1:]) != document[2:]]
+            if progress is not None:
+                progress(0, len(changed))
+            if not changed:
+                return 0
+
+            # The processes are started with spawn, forking a process with a GUI (and its threads) is not safe
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('spawn'))
+            try:
+                for no_read, [path, text] in enumerate(zip(changed, executor.map(extract_text, changed, chunksize=16)), 1):
+                    if is_cancelled is not None and is_cancelled():
+                        break
+
+                    parent, name, size, mtime = documents[path]
+
+                    if path in indexed:
+                        self.remove_document(conn, indexed[path][0])
+                    doc_id = conn.execute('INSERT INTO docs (path, parent, name, size, mtime_ns) VALUES (?, ?, ?, ?, ?)',
+                                          [path, parent, name, size, mtime]).lastrowid
+                    conn.execute('INSERT INTO docs_fts (rowid, name, body) VALUES (?, ?, ?)', [doc_id, name, text or ''])
+
+                    if no_read % 100 == 0 or no_read == len(changed):
+                        conn.commit()
+                        if progress is not None:
+                            progress(no_read, len(changed))
+            finally:
+                executor.shutdown(cancel_futures=True)
+                conn.commit()
+
+            return len(changed)
+        finally:
+            conn.close()
+
+    # Method to turn the text typed by the user into an FTS5 query (all the words, each one as a quoted string)
+    def get_query(self, text):
+        return ' '.join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+    # Method to search the text of the documents
+    # Yields lists of up to batch_size [parent folder, name, snippet] of the best limit matches, best first (bm25, the
+    # name weighs more than the body)
+    # is_cancelled is polled while the query runs, the search stops with sqlite3.OperationalError once it returns True
+    def search_batches(self, text, limit=1000, batch_size=100, is_cancelled=None):
+        query = self.get_query(text)
+        if not query:
+            return
+
+        conn = self.connect()
+        try:
+            if is_cancelled is not None:
+                conn.set_progress_handler(lambda: int(is_cancelled()), 10000)
+
+            cursor = conn.execute('''SELECT docs.parent, docs.name, snippet(docs_fts, 1, '[', ']', '...', 12)
+                                     FROM docs_fts JOIN docs ON docs.id = docs_fts.rowid
+                                     WHERE docs_fts MATCH ?
+                                     ORDER BY bm25(docs_fts, 5.0, 1.0) LIMIT ?''', [query, limit])
+            while batch := cursor.fetchmany(batch_size):
+                yield [list(row) for row in batch]
+        finally:
+            conn.close()
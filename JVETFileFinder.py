@@ -3,35 +3,50 @@
 #----------------------------------------------------------------------------
 # Created By  : João Santos with some help by ChatGPT
 # Created Date: 2024/01/25
-# Updated Date: 2024/01/31
-# version ='1.1'
+# Updated Date: 2026/10/16
+# version ='1.3'
 #
 # Description:
 #     JVET Meetings File Finder, searches for specific meeting files and
 #     provides an interface for opening the directly
+#
+# Searches use a persistent index of the file and folder names
+# (JVETFileIndex), only built from scratch when the documents directory
+# changes and otherwise updated with the folders that changed (live with
+# inotify on Linux), and run in a background thread that streams the
+# matches to the list as they are found; meeting folders synced by
+# NeoJVETCrawler are indexed from their files manifest without scanning them
+#
+# With Search Content the text of the documents is searched instead
+# (JVETContentIndex), ranked with a snippet of each match, the contents are
+# indexed in the background while the finder is open
 # ---------------------------------------------------------------------------
 
 __author__ = "João Santos"
 __copyright__ = "Copyright 2024, João Santos"
 __license__ = "GPL2"
-__version__ = "1.1"
+__version__ = "1.3"
 __maintainer__ = "João Santos"
 __email__ = "joaompssantos@gmail.com"
 __status__ = "Production"
 
 
 import json
-import operator
 import os
 import platform
+import sqlite3
 import subprocess
+from concurrent.futures.process import BrokenProcessPool
 from enum import Enum
+from JVETContentIndex import ContentIndex
+from JVETFileIndex import FileIndex, IndexWatcher
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QPushButton, QVBoxLayout, QFileDialog,
     QListWidget, QComboBox, QHBoxLayout, QLabel, QMessageBox, QCheckBox,
     QCompleter
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QStandardPaths, QThread, QTimer, pyqtSignal
+from PyQt6.QtGui import QKeySequence, QShortcut
 from pathlib import Path
 
 # Enum to represent different operating systems
@@ -40,6 +55,94 @@ class Platform(Enum):
     MACOS = 'Darwin'
     LINUX = 'Linux'
 
+# Thread searching an index, the matches are sent in batches as they are read
+# search_batches(is_cancelled) yields the batches of matches, refresh (if any) updates the index before the search
+# Each search has a generation number so the signals of a search that was replaced are ignored
+class SearchWorker(QThread):
+    batch_found = pyqtSignal(int, list)
+    status_changed = pyqtSignal(int, str)
+    search_finished = pyqtSignal(int, int)
+
+    def __init__(self, target_string, generation, search_batches, refresh=None):
+        super().__init__()
+
+        self.target_string = target_string
+        self.generation = generation
+        self.search_batches = search_batches
+        self.refresh = refresh
+
+    def run(self):
+        try:
+            if self.refresh is not None:
+                self.status_changed.emit(self.generation, 'Updating index...')
+                self.refresh()
+
+            no_found = 0
+            for batch in self.search_batches(self.isInterruptionRequested):
+                if self.isInterruptionRequested():
+                    return
+                no_found += len(batch)
+                self.batch_found.emit(self.generation, batch)
+                self.status_changed.emit(self.generation, f'Searching for {self.target_string}: {no_found} file(s) found...')
+
+            self.search_finished.emit(self.generation, no_found)
+        except (OSError, sqlite3.Error) as e:
+            # A cancelled search is interrupted inside the query
+            if not self.isInterruptionRequested():
+                self.status_changed.emit(self.generation, f'Search failed: {e}')
+
+# Thread bringing the file index up to date (built from scratch for another documents directory), reports its progress
+class FileIndexWorker(QThread):
+    progress_changed = pyqtSignal(str)
+
+    def __init__(self, file_index, documents_directory):
+        super().__init__()
+
+        self.file_index = file_index
+        self.documents_directory = documents_directory
+
+    def run(self):
+        try:
+            if self.file_index.get_root() != str(self.documents_directory):
+                self.progress_changed.emit(f'Indexing {self.documents_directory}...')
+            else:
+                self.progress_changed.emit('Updating index...')
+
+            changed = self.file_index.refresh(self.documents_directory, is_cancelled=self.isInterruptionRequested)
+
+            if self.isInterruptionRequested():
+                return
+            if changed is None:
+                self.progress_changed.emit(f'{self.documents_directory} indexed')
+            else:
+                self.progress_changed.emit(f'Index updated ({changed} folder(s) changed)')
+        except (OSError, sqlite3.Error) as e:
+            self.progress_changed.emit(f'Indexing failed: {e}')
+
+# Thread bringing the content index up to date, reports its progress
+class ContentIndexWorker(QThread):
+    progress_changed = pyqtSignal(str)
+
+    def __init__(self, content_index, documents_directory):
+        super().__init__()
+
+        self.content_index = content_index
+        self.documents_directory = documents_directory
+
+    # Method to report the number of documents read
+    def report_progress(self, no_read, no_documents):
+        if no_documents:
+            self.progress_changed.emit(f'Indexing contents: {no_read} out of {no_documents} document(s) read')
+
+    def run(self):
+        try:
+            no_read = self.content_index.update(self.documents_directory, is_cancelled=self.isInterruptionRequested,
+                                                progress=self.report_progress)
+            if no_read and not self.isInterruptionRequested():
+                self.progress_changed.emit(f'Contents indexed ({no_read} document(s) read)')
+        except (OSError, sqlite3.Error, BrokenProcessPool) as e:
+            self.progress_changed.emit(f'Content indexing failed: {e}')
+
 class JVETDocumentOpener(QWidget):
     def __init__(self):
         super().__init__()
@@ -48,16 +151,48 @@ class JVETDocumentOpener(QWidget):
         self.documents_directory = Path.home()
         self.show_full_path = False
         self.hide_documents_directory = True
+        self.live_index_updates = True
+        self.search_content = False
         self.found_files = []
+        # Snippet of each found file (None for name searches)
+        self.found_snippets = []
+
+        # Search running (None when there is none), threads of all the searches that did not stop yet
+        # (including cancelled ones) and generation of the last search started
+        self.search_worker = None
+        self.search_workers = set()
+        self.search_generation = 0
+        # Batches of matches waiting to be added to the document list (one per pass of the event loop so the window stays responsive)
+        self.pending_batches = []
 
         self.settings_file_path = Path.joinpath(Path(__file__).expanduser().resolve().parent, 'settings.json')
 
+        # The indexes are kept in the data directory of the user (e.g. ~/.local/share/jvet-scripts on Linux)
+        data_directory = Path(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation), 'jvet-scripts')
+        data_directory.mkdir(parents=True, exist_ok=True)
+
+        # Index of the file and folder names of the documents directory, the thread updating it and its watcher (None when
+        # not running), a name search started while the index is updated waits for it
+        self.file_index = FileIndex(Path.joinpath(data_directory, 'file_index.sqlite'))
+        self.file_worker = None
+        self.index_watcher = None
+        self.search_after_indexing = False
+
+        # Index of the text of the documents and the thread updating it (None when not running)
+        self.content_index = ContentIndex(Path.joinpath(data_directory, 'content_index.sqlite'))
+        self.content_worker = None
+
         # Load user settings
         self.load_settings()
 
         # Initialize the GUI
         self.init_ui()
 
+        # Update the index of the documents directory in the background (files may have been added since the finder was
+        # last open), the watcher is started once it is done
+        self.start_file_indexing()
+        self.start_content_indexing()
+
     def init_ui(self):
         self.setWindowTitle('JVET Document Finder')
         
@@ -101,6 +236,12 @@ class JVETDocumentOpener(QWidget):
 
         search_box_layout.addWidget(self.search_box)
 
+        # Check box to search the text of the documents instead of their names
+        self.search_content_checkbox = QCheckBox('Search Content', self)
+        self.search_content_checkbox.setChecked(self.search_content)
+        self.search_content_checkbox.stateChanged.connect(self.toggle_search_content)
+        search_box_layout.addWidget(self.search_content_checkbox)
+
         search_button = QPushButton('Search', self)
         search_button.clicked.connect(self.perform_search)
 
@@ -115,6 +256,15 @@ class JVETDocumentOpener(QWidget):
         self.document_list.doubleClicked.connect(lambda: self.open_selected_document(self.document_list.currentItem()))
         search_layout.addWidget(self.document_list)
 
+        # Status of the search and of the index
+        self.status_label = QLabel('', self)
+        search_layout.addWidget(self.status_label)
+
+        # Timer adding the pending batches of matches to the document list
+        self.display_timer = QTimer(self)
+        self.display_timer.setInterval(0)
+        self.display_timer.timeout.connect(self.show_pending_batch)
+
         # Layout for displaying and opening documents
         open_show_layout = self.create_open_show_layout()
         search_layout.addLayout(open_show_layout)
@@ -128,6 +278,9 @@ class JVETDocumentOpener(QWidget):
         # Connect returnPressed signal to perform_search method
         self.search_box.lineEdit().returnPressed.connect(self.perform_search)
 
+        # Escape cancels the search running
+        QShortcut(QKeySequence(Qt.Key.Key_Escape), self, activated=self.cancel_search)
+
     def create_open_show_layout(self):
         # Layout for opening documents and toggling options
         open_show_layout = QHBoxLayout()
@@ -159,6 +312,12 @@ class JVETDocumentOpener(QWidget):
         if new_directory:
             self.documents_directory = Path(new_directory)
             self.directory_label.setText(f"Documents Directory: {self.documents_directory}")
+            self.cancel_search(quiet=True)
+            self.stop_index_watcher()
+            self.stop_file_indexing()
+            self.stop_content_indexing()
+            self.start_file_indexing()
+            self.start_content_indexing()
             self.show_feedback_message('Directory changed successfully!')
         else:
             self.show_feedback_message('Directory change cancelled.')
@@ -168,6 +327,11 @@ class JVETDocumentOpener(QWidget):
         self.show_full_path = self.show_full_path_checkbox.isChecked()
         self.update_displayed_items()
 
+    # Handler for toggling search content option (the contents are indexed when it is enabled)
+    def toggle_search_content(self, state):
+        self.search_content = self.search_content_checkbox.isChecked()
+        self.start_content_indexing()
+
     # Handler for toggling hide documents directory option
     def toggle_hide_documents_directory(self, state):
         self.hide_documents_directory = self.hide_documents_directory_checkbox.isChecked()
@@ -176,10 +340,21 @@ class JVETDocumentOpener(QWidget):
     # Method to update displayed items in the document list
     def update_displayed_items(self):
         self.document_list.clear()
+        self.pending_batches = []
+
+        self.add_displayed_items(self.found_files, self.found_snippets)
 
-        for file_path, file_name in self.found_files:
-            display_text = self.get_display_text(file_path, file_name)
-            self.document_list.addItem(display_text)
+    # Method to add items to the document list, with the snippet of the match (if any) in a second line
+    def add_displayed_items(self, files, snippets):
+        self.document_list.addItems([self.get_display_text(file_path, file_name) + (f'\n    {" ".join(snippet.split())}' if snippet else '')
+                                     for [file_path, file_name], snippet in zip(files, snippets)])
+
+    # Slot adding the next pending batch of matches to the document list
+    def show_pending_batch(self):
+        if self.pending_batches:
+            self.add_displayed_items(*self.pending_batches.pop(0))
+        if not self.pending_batches:
+            self.display_timer.stop()
     
     # Method to get the display text for a file or folder
     def get_display_text(self, file_path, file_name):
@@ -197,32 +372,173 @@ class JVETDocumentOpener(QWidget):
         return display_text
 
     # Method to get found files
+    # The index is searched in a background thread (any search running is cancelled), matches are added as they arrive
     def perform_search(self):
         # Get string to be searched
         target_string = self.get_document_number().lower()
 
+        self.cancel_search(quiet=True)
+
         self.found_files = []
+        self.found_snippets = []
+        self.update_displayed_items()
+
+        # Name searches wait for the file index to be up to date
+        if not self.search_content and self.file_worker is not None:
+            self.search_after_indexing = True
+            self.show_feedback_message(f'Indexing {self.documents_directory}, the search for {target_string} starts once it is done...')
+            return
 
         self.show_feedback_message(f'Searching for {target_string}')
-        for file_path in self.documents_directory.rglob('*'):
-            # Ignore current item if its name starts with the target string followed by a _
-            if file_path.name.startswith(f'{target_string}_'):
-                continue
-            # Check if the target_string is in the current item name
-            elif (file_path.is_file() and not file_path.parent.name.startswith(f'{target_string}_') and target_string in str(Path(file_path.parent.name, file_path.name)).lower()) or \
-                 (file_path.is_dir() and target_string in str(file_path.name).lower()):
-                self.found_files.append([str(file_path.parent.absolute()), file_path.name])
-
-        # Sorts output list alphabetically
-        self.found_files.sort(key=operator.itemgetter(0, 1))
-
-        # Update the list of displayed items
-        self.update_displayed_items()
+
+        self.search_generation += 1
+        if self.search_content:
+            # Query the content index (best matches first)
+            self.search_worker = SearchWorker(target_string, self.search_generation,
+                                              lambda is_cancelled: self.content_index.search_batches(target_string, is_cancelled=is_cancelled))
+        else:
+            # Query the file index (sorted alphabetically), without a watcher the folders that changed are scanned first
+            refresh = None
+            if self.index_watcher is None or not self.index_watcher.is_alive():
+                documents_directory = self.documents_directory
+                refresh = lambda: self.file_index.refresh(documents_directory)
+            self.search_worker = SearchWorker(target_string, self.search_generation,
+                                              lambda is_cancelled: self.file_index.search_batches(target_string, is_cancelled=is_cancelled),
+                                              refresh)
+        self.search_worker.batch_found.connect(self.add_search_batch)
+        self.search_worker.status_changed.connect(self.show_search_status)
+        self.search_worker.search_finished.connect(self.finish_search)
+        self.search_worker.finished.connect(lambda worker=self.search_worker: self.release_search_worker(worker))
+        self.search_workers.add(self.search_worker)
+        self.search_worker.start()
+
+    # Slot for the end of a search thread, it is only released once it stopped
+    def release_search_worker(self, worker):
+        worker.wait()
+        self.search_workers.discard(worker)
+
+    # Method to cancel the search running or waiting for the file index (if any), the worker stops on its own in the background
+    def cancel_search(self, quiet=False):
+        if self.search_after_indexing:
+            self.search_after_indexing = False
+            if not quiet:
+                self.show_feedback_message('Search cancelled.')
+
+        if self.search_worker is None:
+            return
+
+        self.search_worker.requestInterruption()
+        self.search_worker = None
+
+        if not quiet:
+            self.show_feedback_message(f'Search cancelled ({len(self.found_files)} file(s) found).')
+
+    # Slot for a batch of matches of the search
+    def add_search_batch(self, generation, batch):
+        if generation != self.search_generation or self.search_worker is None:
+            return
+
+        # Content matches come with a snippet
+        files = [match[:2] for match in batch]
+        snippets = [match[2] if len(match) > 2 else None for match in batch]
+
+        self.found_files += files
+        self.found_snippets += snippets
+        self.pending_batches.append([files, snippets])
+        self.display_timer.start()
+
+    # Slot for the status messages of the search
+    def show_search_status(self, generation, message):
+        if generation == self.search_generation and self.search_worker is not None:
+            self.show_feedback_message(message)
+
+    # Slot for the end of the search
+    def finish_search(self, generation, no_found):
+        if generation != self.search_generation or self.search_worker is None:
+            return
+
+        self.search_worker = None
+
+        # Content searches only cover the documents indexed so far
+        indexing = ' (contents still being indexed)' if self.search_content and self.content_worker is not None else ''
 
         if self.found_files:
-            self.show_feedback_message(f'{len(self.found_files)} file(s) found successfully!')
+            self.show_feedback_message(f'{len(self.found_files)} file(s) found successfully!{indexing}')
         else:
-            self.show_feedback_message('No files found.')
+            self.show_feedback_message(f'No files found.{indexing}')
+
+    # Method to start bringing the content index up to date in the background (if content search is enabled)
+    def start_content_indexing(self):
+        if not self.search_content or self.content_worker is not None:
+            return
+
+        self.content_worker = ContentIndexWorker(self.content_index, self.documents_directory)
+        self.content_worker.progress_changed.connect(self.show_feedback_message)
+        self.content_worker.finished.connect(lambda worker=self.content_worker: self.finish_content_indexing(worker))
+        self.content_worker.start()
+
+    # Slot for the end of the content indexing (of a worker that was not stopped and replaced meanwhile)
+    def finish_content_indexing(self, worker):
+        if self.content_worker is worker:
+            worker.wait()
+            self.content_worker = None
+
+    # Method to stop the content indexing (what was read so far is kept, the rest is read next time)
+    def stop_content_indexing(self):
+        if self.content_worker is not None:
+            self.content_worker.requestInterruption()
+            self.content_worker.wait()
+            self.content_worker = None
+
+    # Method to start bringing the file index up to date in the background (built from scratch if it is not the one of
+    # the documents directory)
+    def start_file_indexing(self):
+        self.file_worker = FileIndexWorker(self.file_index, self.documents_directory)
+        self.file_worker.progress_changed.connect(self.show_feedback_message)
+        self.file_worker.finished.connect(lambda worker=self.file_worker: self.finish_file_indexing(worker))
+        self.file_worker.start()
+
+    # Slot for the end of the file indexing (of a worker that was not stopped and replaced meanwhile)
+    # The watcher is started and the search waiting for the index (if any) is run
+    def finish_file_indexing(self, worker):
+        if self.file_worker is not worker:
+            return
+
+        worker.wait()
+        self.file_worker = None
+
+        self.start_index_watcher()
+
+        if self.search_after_indexing:
+            self.search_after_indexing = False
+            self.perform_search()
+
+    # Method to stop the file indexing (a build is dropped, a refresh keeps the folders checked so far)
+    def stop_file_indexing(self):
+        if self.file_worker is not None:
+            self.file_worker.requestInterruption()
+            self.file_worker.wait()
+            self.file_worker = None
+
+    # Method to start applying the changes of the documents directory to the index as they happen (if enabled)
+    def start_index_watcher(self):
+        if not self.live_index_updates:
+            return
+
+        try:
+            self.index_watcher = IndexWatcher(self.file_index, self.documents_directory)
+            self.index_watcher.start()
+        except OSError as e:
+            self.index_watcher = None
+            self.show_feedback_message(f'Live index updates not available: {e}')
+
+    # Method to stop the index watcher
+    def stop_index_watcher(self):
+        if self.index_watcher is not None:
+            self.index_watcher.stop()
+            if self.index_watcher.error is not None:
+                self.show_feedback_message(f'Live index updates stopped: {self.index_watcher.error}')
+            self.index_watcher = None
 
     # Map the immutable document name to its number (returns provided text is not present in immutables list)
     def get_document_number(self):
@@ -279,6 +595,8 @@ class JVETDocumentOpener(QWidget):
                 self.documents_directory = Path(settings.get('documents_directory', str(Path.home())))
                 self.show_full_path = settings.get('show_full_path', False)
                 self.hide_documents_directory = settings.get('hide_documents_directory', True)
+                self.live_index_updates = settings.get('live_index_updates', True)
+                self.search_content = settings.get('search_content', False)
 
     # Method to save user settings
     def save_settings(self):
@@ -287,7 +605,9 @@ class JVETDocumentOpener(QWidget):
             'immutable_documents': str(self.build_immutables()),
             'documents_directory': str(self.documents_directory),
             'show_full_path': self.show_full_path,
-            'hide_documents_directory': self.hide_documents_directory
+            'hide_documents_directory': self.hide_documents_directory,
+            'live_index_updates': self.live_index_updates,
+            'search_content': self.search_content
         }
         with open(self.settings_file_path, 'w') as settings_file:
             json.dump(settings, settings_file)
@@ -304,11 +624,18 @@ class JVETDocumentOpener(QWidget):
     def closeEvent(self, event):
         # Save settings before closing the application
         self.save_settings()
+        self.cancel_search(quiet=True)
+        for worker in list(self.search_workers):
+            worker.wait()
+        self.stop_index_watcher()
+        self.stop_file_indexing()
+        self.stop_content_indexing()
         event.accept()
 
     # Method to show feedback messages
     def show_feedback_message(self, message):
         print((self, 'Feedback', message))
+        self.status_label.setText(message)
         # QMessageBox.information(self, 'Feedback', message)
 
 if __name__ == '__main__':
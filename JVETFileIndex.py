@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.2'
+#
+# Description:
+#     Persistent index of the file and folder names of the documents
+#     directory for the JVET Meetings File Finder, kept in a SQLite database
+#     with a trigram full text table so name searches do not walk the tree
+#
+# The index is kept up to date by rescanning only the folders whose
+# modification time changed and, on Linux, by an inotify watcher applying
+# the changes live
+#
+# Meeting folders with the files manifest written by NeoJVETCrawler
+# (#meeting_files.json) are indexed from it instead of being scanned, and
+# indexed again when it is rewritten; folders changed after their manifest
+# was written (e.g. files added by hand) are scanned instead
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.2"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import ctypes
+import ctypes.util
+import errno
+import json
+import os
+import platform
+import select
+import sqlite3
+import stat
+import struct
+import threading
+import time
+from pathlib import Path
+
+# Version of the index layout, indexes of other versions are rebuilt
+INDEX_VERSION = '4'
+
+# Files manifest of a meeting folder written by the crawler
+MANIFEST_NAME = '#meeting_files.json'
+
+# Folders modified less than this many nanoseconds before they are scanned are scanned again on the next refresh
+# (a change in the same tick of the file system clock would not change their modification time)
+RECENT_MTIME = 2 * 10**9
+
+class FileIndex:
+    def __init__(self, index_path):
+        self.index_path = Path(index_path)
+
+        # Whether the trigram table is available (needs SQLite 3.34 or newer with FTS5)
+        self.trigram = True
+
+    # Method to open the index, a connection is opened per operation so the index can be used from any thread
+    def connect(self, path=None):
+        conn = sqlite3.connect(str(path or self.index_path), timeout=30)
+        conn.execute('''CREATE TABLE IF NOT EXISTS meta (
+                            key   TEXT PRIMARY KEY,
+                            value TEXT
+                        )''')
+        # One row per file or folder, context is the lower case text the searches match:
+        # parent folder and name for files, name for folders
+        conn.execute('''CREATE TABLE IF NOT EXISTS entries (
+                            id          INTEGER PRIMARY KEY,
+                            parent      TEXT,
+                            name        TEXT,
+                            parent_name TEXT,
+                            is_dir      INTEGER,
+                            context     TEXT
+                        )''')
+        conn.execute('CREATE INDEX IF NOT EXISTS entries_parent ON entries (parent)')
+        # One row per scanned folder (or folder of a files manifest) with its modification time when it was indexed
+        conn.execute('''CREATE TABLE IF NOT EXISTS dirs (
+                            path     TEXT PRIMARY KEY,
+                            parent   TEXT,
+                            mtime_ns INTEGER
+                        )''')
+        conn.execute('CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent)')
+        # One row per folder indexed from its files manifest with the modification time of the manifest
+        conn.execute('''CREATE TABLE IF NOT EXISTS manifests (
+                            path     TEXT PRIMARY KEY,
+                            parent   TEXT,
+                            mtime_ns INTEGER
+                        )''')
+        conn.execute('CREATE INDEX IF NOT EXISTS manifests_parent ON manifests (parent)')
+
+        try:
+            conn.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts
+                            USING fts5(context, content='entries', content_rowid='id', tokenize='trigram')''')
+            conn.execute('''CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+                                INSERT INTO entries_fts (rowid, context) VALUES (new.id, new.context);
+                            END''')
+            conn.execute('''CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+                                INSERT INTO entries_fts (entries_fts, rowid, context) VALUES ('delete', old.id, old.context);
+                            END''')
+        except sqlite3.OperationalError:
+            self.trigram = False
+
+        return conn
+
+    # Method to get a value of the meta table (None if it is not set)
+    def get_meta(self, conn, key):
+        row = conn.execute('SELECT value FROM meta WHERE key = ?', [key]).fetchone()
+        return row[0] if row is not None else None
+
+    # Method to get the documents directory the index was built for (None if it was never built)
+    def get_root(self):
+        if not self.index_path.exists():
+            return None
+
+        conn = self.connect()
+        try:
+            if self.get_meta(conn, 'version') != INDEX_VERSION:
+                return None
+            return self.get_meta(conn, 'root')
+        finally:
+            conn.close()
+
+    # Method to get all the folders in the index that are watched for changes (scanned folders and folders with a manifest)
+    def get_directories(self):
+        conn = self.connect()
+        try:
+            return [row[0] for row in conn.execute('SELECT path FROM dirs UNION SELECT path FROM manifests')]
+        finally:
+            conn.close()
+
+    # Method to get the modification time of a folder as kept in the index (-1 if it is too recent, see RECENT_MTIME)
+    def get_index_mtime(self, mtime):
+        return -1 if time.time_ns() - mtime < RECENT_MTIME else mtime
+
+    # Method to get the modification time of the files manifest of a folder, None if there is none or the folder changed
+    # after it was written
+    def get_manifest_mtime(self, directory):
+        try:
+            mtime = os.stat(os.path.join(directory, MANIFEST_NAME)).st_mtime_ns
+            if os.stat(directory).st_mtime_ns > mtime:
+                return None
+        except OSError:
+            return None
+
+        return mtime
+
+    # Method to list a folder, returns its modification time, the index rows of its entries and the subfolders to descend into
+    # Symbolic links to folders are listed but not followed, the same as Path.rglob
+    def scan_directory(self, parent):
+        mtime = self.get_index_mtime(os.stat(parent).st_mtime_ns)
+        parent_name = os.path.basename(parent)
+        rows = []
+        subdirs = []
+
+        with os.scandir(parent) as scanner:
+            entries = list(scanner)
+
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+                if not is_dir and not entry.is_file():
+                    continue
+                if is_dir and not entry.is_symlink():
+                    subdirs.append(entry.path)
+            except OSError:
+                continue
+
+            context = entry.name if is_dir else os.path.join(parent_name, entry.name)
+            rows.append([parent, entry.name, parent_name, int(is_dir), context.lower()])
+
+        return [mtime, rows, subdirs]
+
+    # Method to get the index rows of a folder tree from its files manifest (the manifest itself included)
+    # Folders are the ones listed and the ones holding the files listed, paths in the manifest use / separators
+    def read_manifest(self, directory):
+        with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as fp:
+            manifest = json.load(fp)
+
+        paths = [[path, size] for path, size in manifest['files']] + [[MANIFEST_NAME, 0]]
+        for doc in manifest['docs']:
+            paths.append([doc['jvet_number'], None])
+            paths += [[f'{doc["jvet_number"]}/{path}', size] for path, size in doc['files']]
+
+        # Entries as {(parent, name): is_dir}, folders win over files of the same path
+        entries = {}
+        for path, size in paths:
+            parts = [part for part in path.split('/') if part]
+            for no_parts in range(1, len(parts) + 1):
+                parent = os.path.join(directory, *parts[:no_parts - 1])
+                is_dir = size is None or no_parts < len(parts)
+                entries[(parent, parts[no_parts - 1])] = entries.get((parent, parts[no_parts - 1]), False) or is_dir
+
+        rows = []
+        for [parent, name], is_dir in entries.items():
+            parent_name = os.path.basename(parent)
+            context = name if is_dir else os.path.join(parent_name, name)
+            rows.append([parent, name, parent_name, int(is_dir), context.lower()])
+
+        return rows
+
+    # Method to add a folder tree to the index from its files manifest, returns the folders added (None if the manifest
+    # can not be read or any of its folders changed after it was written, the tree is then scanned)
+    # The folders are kept with their modification time, so the ones that change later are scanned again
+    def add_manifest(self, conn, directory):
+        try:
+            mtime = os.stat(os.path.join(directory, MANIFEST_NAME)).st_mtime_ns
+            rows = self.read_manifest(directory)
+
+            folders = [directory] + [os.path.join(parent, name) for parent, name, parent_name, is_dir, context in rows if is_dir]
+            folder_stats = [os.stat(folder, follow_symlinks=False) for folder in folders]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if any(not stat.S_ISDIR(folder_stat.st_mode) or folder_stat.st_mtime_ns > mtime for folder_stat in folder_stats):
+            return None
+
+        conn.executemany('INSERT INTO entries (parent, name, parent_name, is_dir, context) VALUES (?, ?, ?, ?, ?)', rows)
+        conn.executemany('INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)',
+                         [[folder, os.path.dirname(folder), self.get_index_mtime(folder_stat.st_mtime_ns)]
+                          for folder, folder_stat in zip(folders, folder_stats)])
+        conn.execute('INSERT OR REPLACE INTO manifests VALUES (?, ?, ?)', [directory, os.path.dirname(directory), mtime])
+
+        return folders
+
+    # Method to add a folder tree to the index (the folder itself is added as an entry of its parent)
+    # Folders with a files manifest are read from it instead of being scanned
+    # is_cancelled is polled before each folder, the folders left once it returns True are not added
+    # Returns the folders added
+    def add_tree(self, conn, directory, is_cancelled=None):
+        pending = [directory]
+        added = []
+
+        while pending:
+            if is_cancelled is not None and is_cancelled():
+                break
+
+            parent = pending.pop()
+
+            if os.path.isfile(os.path.join(parent, MANIFEST_NAME)):
+                folders = self.add_manifest(conn, parent)
+                if folders is not None:
+                    added += folders
+                    continue
+
+            try:
+                mtime, rows, subdirs = self.scan_directory(parent)
+            except OSError:
+                continue
+
+            conn.executemany('INSERT INTO entries (parent, name, parent_name, is_dir, context) VALUES (?, ?, ?, ?, ?)', rows)
+            conn.execute('INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)', [parent, os.path.dirname(parent), mtime])
+
+            pending += subdirs
+            added.append(parent)
+
+        return added
+
+    # Method to remove a folder tree from the index
+    def remove_tree(self, conn, directory):
+        prefix = os.path.join(directory, '')
+
+        conn.execute('DELETE FROM entries WHERE parent = ? OR substr(parent, 1, ?) = ?', [directory, len(prefix), prefix])
+        conn.execute('DELETE FROM dirs WHERE path = ? OR substr(path, 1, ?) = ?', [directory, len(prefix), prefix])
+        conn.execute('DELETE FROM manifests WHERE path = ? OR substr(path, 1, ?) = ?', [directory, len(prefix), prefix])
+
+    # Method to scan again a folder that changed, its new subfolders are added and the ones that are gone removed
+    # Folder trees indexed from a files manifest are indexed again if the manifest changed (or is gone), and scanned
+    # folders whose manifest can now be used (written after they changed) are indexed from it
+    # Returns the folders added
+    def update_directory(self, conn, directory):
+        row = conn.execute('SELECT mtime_ns FROM manifests WHERE path = ?', [directory]).fetchone()
+
+        try:
+            manifest_mtime = os.stat(os.path.join(directory, MANIFEST_NAME)).st_mtime_ns
+        except OSError:
+            manifest_mtime = None
+
+        if (row is not None and row[0] != manifest_mtime) or (row is None and self.get_manifest_mtime(directory) is not None):
+            self.remove_tree(conn, directory)
+            return self.add_tree(conn, directory)
+
+        try:
+            mtime, rows, subdirs = self.scan_directory(directory)
+        except OSError:
+            self.remove_tree(conn, directory)
+            return []
+
+        old_subdirs = set(row[0] for row in conn.execute('SELECT path FROM dirs WHERE parent = ? UNION ALL '
+                                                         'SELECT path FROM manifests WHERE parent = ?', [directory, directory]))
+
+        conn.execute('DELETE FROM entries WHERE parent = ?', [directory])
+        conn.executemany('INSERT INTO entries (parent, name, parent_name, is_dir, context) VALUES (?, ?, ?, ?, ?)', rows)
+        conn.execute('INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)', [directory, os.path.dirname(directory), mtime])
+
+        for subdir in old_subdirs.difference(subdirs):
+            self.remove_tree(conn, subdir)
+
+        added = []
+        for subdir in subdirs:
+            if subdir not in old_subdirs:
+                added += self.add_tree(conn, subdir)
+
+        return added
+
+    # Method to build the index of a documents directory from scratch
+    # The new index is written aside and moved in place, searches running meanwhile use the old one
+    # If is_cancelled returns True while the tree is scanned the new index is dropped (the old one is kept)
+    def build(self, documents_directory, is_cancelled=None):
+        tmp_path = self.index_path.with_name(f'{self.index_path.name}.{os.getpid()}.tmp')
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+        conn = self.connect(tmp_path)
+
+        # The trigram table is filled at once after the entries (much faster than by the triggers)
+        conn.execute('DROP TRIGGER IF EXISTS entries_insert')
+        self.add_tree(conn, os.path.abspath(documents_directory), is_cancelled)
+        if is_cancelled is not None and is_cancelled():
+            conn.close()
+            tmp_path.unlink()
+            return
+        if self.trigram:
+            conn.execute("INSERT INTO entries_fts (entries_fts) VALUES ('rebuild')")
+        conn.executemany('INSERT INTO meta VALUES (?, ?)', [['version', INDEX_VERSION], ['root', str(documents_directory)]])
+        conn.commit()
+        conn.close()
+
+        # Recreate the triggers
+        self.connect(tmp_path).close()
+
+        os.replace(tmp_path, self.index_path)
+
+    # Method to bring the index up to date with the documents directory
+    # Only the folders whose modification time changed are scanned again (and the folders whose files manifest changed
+    # indexed again), the index is only built from scratch if it is not the one of documents_directory
+    # is_cancelled is polled before each folder, once it returns True the folders checked so far are kept and the rest
+    # are left for the next refresh (a build is dropped)
+    # Returns the number of folders scanned again (None if the index was built)
+    def refresh(self, documents_directory, is_cancelled=None):
+        if self.get_root() != str(documents_directory):
+            self.build(documents_directory, is_cancelled)
+            return None
+
+        conn = self.connect()
+        try:
+            changed = 0
+
+            for directory, mtime in conn.execute('SELECT path, mtime_ns FROM dirs').fetchall():
+                if is_cancelled is not None and is_cancelled():
+                    break
+
+                try:
+                    current_mtime = os.stat(directory).st_mtime_ns
+                except OSError:
+                    current_mtime = None
+
+                if current_mtime != mtime:
+                    self.update_directory(conn, directory)
+                    changed += 1
+
+            for directory, mtime in conn.execute('SELECT path, mtime_ns FROM manifests').fetchall():
+                if is_cancelled is not None and is_cancelled():
+                    break
+
+                try:
+                    current_mtime = os.stat(os.path.join(directory, MANIFEST_NAME)).st_mtime_ns
+                except OSError:
+                    current_mtime = None
+
+                if current_mtime != mtime:
+                    self.update_directory(conn, directory)
+                    changed += 1
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        return changed
+
+    # Method to scan again a set of folders reported as changed, returns the folders added
+    def update_directories(self, directories):
+        conn = self.connect()
+        try:
+            # Parents go before their subfolders
+            added = []
+            for directory in sorted(directories):
+                added += self.update_directory(conn, directory)
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        return added
+
+    # Method to search the index with the same rules as the tree walk of the finder
+    # target_string is matched (lower case) in the names of the folders and in the parent folder and name of the files,
+    # entries named after the target followed by a _ and the files inside them are left out
+    # Yields lists of up to batch_size [parent folder, name] of the matches sorted by folder and name
+    # is_cancelled is polled while the query runs, the search stops with sqlite3.OperationalError once it returns True
+    def search_batches(self, target_string, batch_size=500, is_cancelled=None):
+        prefix = f'{target_string}_'
+
+        query = '''SELECT parent, name FROM entries
+                   WHERE instr(context, ?) > 0 AND substr(name, 1, ?) != ? AND (is_dir OR substr(parent_name, 1, ?) != ?)'''
+        params = [target_string, len(prefix), prefix, len(prefix), prefix]
+
+        # The trigram table finds the candidates of targets with at least 3 characters, shorter ones are scanned
+        if self.trigram and len(target_string) >= 3:
+            query += ' AND id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)'
+            params.append('"' + target_string.replace('"', '""') + '"')
+
+        conn = self.connect()
+        try:
+            if is_cancelled is not None:
+                conn.set_progress_handler(lambda: int(is_cancelled()), 10000)
+
+            cursor = conn.execute(query + ' ORDER BY parent, name', params)
+            while batch := cursor.fetchmany(batch_size):
+                yield [list(row) for row in batch]
+        finally:
+            conn.close()
+
+    # Method to search the index, returns all the matches of search_batches at once
+    def search(self, target_string):
+        return [match for batch in self.search_batches(target_string) for match in batch]
+
+# inotify flags (linux/inotify.h)
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Thread applying the changes of the documents directory to the index as they happen (Linux only, with inotify)
+# Every folder in the index is watched, events are gathered for a short while and their folders scanned again
+class IndexWatcher(threading.Thread):
+    # Events of a folder that change its entries
+    EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+
+    # Seconds without events before the changes are applied, and at most between updates while events keep coming
+    QUIET_TIME = 0.5
+    MAX_DELAY = 2
+
+    def __init__(self, file_index, documents_directory):
+        super().__init__(daemon=True)
+
+        if platform.system() != 'Linux':
+            raise OSError(errno.ENOSYS, 'inotify is only available on Linux')
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+
+        self.file_index = file_index
+        self.documents_directory = documents_directory
+        # Watched folders as {watch descriptor: folder}
+        self.watches = {}
+        # Error that stopped the watcher (e.g. too many folders for the inotify watch limit)
+        self.error = None
+        self.stop_event = threading.Event()
+
+    # Method to watch a folder (folders that are already gone are ignored)
+    def add_watch(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.EVENTS | IN_ONLYDIR)
+
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(error, f'{os.strerror(error)}: {directory}')
+
+        self.watches[wd] = directory
+
+    # Method to read the pending events, returns the folders that changed (None in it if events were lost)
+    def read_events(self):
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+
+        while offset < len(data):
+            wd, mask, cookie, length = struct.unpack_from('iIII', data, offset)
+            offset += struct.calcsize('iIII') + length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.add(None)
+            elif mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+            elif wd in self.watches:
+                changed.add(self.watches[wd])
+
+        return changed
+
+    # Method to apply the changes to the index and watch the new folders
+    def apply_changes(self, changed):
+        if None in changed:
+            # Events were lost, every folder is checked
+            self.file_index.refresh(self.documents_directory)
+            added = self.file_index.get_directories()
+        else:
+            added = self.file_index.update_directories(changed)
+
+        # The new folders are scanned again once watched, entries created before their watch was added are found then
+        while added:
+            for directory in added:
+                self.add_watch(directory)
+
+            added = self.file_index.update_directories(added)
+
+    def run(self):
+        try:
+            for directory in self.file_index.get_directories():
+                self.add_watch(directory)
+
+            changed = set()
+            first_change = None
+
+            while not self.stop_event.is_set():
+                ready = select.select([self.fd], [], [], self.QUIET_TIME)[0]
+
+                if ready:
+                    changed |= self.read_events()
+                    first_change = first_change or time.monotonic()
+
+                # Apply the changes once the events stop (or after MAX_DELAY if they keep coming)
+                if changed and (not ready or time.monotonic() - first_change > self.MAX_DELAY):
+                    self.apply_changes(changed)
+                    changed = set()
+                    first_change = None
+        except (OSError, sqlite3.Error) as e:
+            self.error = e
+        finally:
+            os.close(self.fd)
+
+    # Method to stop the watcher
+    def stop(self):
+        self.stop_event.set()
+        self.join()
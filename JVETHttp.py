@@ -0,0 +1,593 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Shared HTTP transport for the JVET scripts, a single session with
+#     pooled keep-alive connections, gzip transfer encoding, timeouts and
+#     an on-disk cache of pages revalidated with conditional requests.
+#     Failed requests are retried with a jittered exponential backoff and
+#     the concurrent requests to each host adapt to how the host copes.
+#     Requests, bytes received, cache hits and retries are counted in JVETStats
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import contextlib
+import email.utils
+import hashlib
+import json
+import JVETStats
+import os
+import random
+import tempfile
+import threading
+import time
+import urllib.parse
+import zipfile
+import zlib
+
+
+# Shared session (created on first use or by initSession)
+session = None
+session_lock = threading.Lock()
+
+# Timeout in seconds for connecting and for each read from the server
+timeout = 60
+
+# Size of the blocks written to disk when downloading files
+chunk_size = 1024 * 1024
+
+# Size of the blocks read from the network, a stopped download notices it after at most one of them
+read_size = 64 * 1024
+
+# Directory of the on-disk response cache (None disables the cache)
+cache_dir = None
+
+# Semaphore shared by all the processes of a run capping their concurrent requests (None for no cap)
+network_slots = None
+
+# Number of times a failed request is retried and base delay in seconds of the exponential backoff between retries
+max_retries = 5
+backoff = 1
+# Longest delay in seconds between retries (also caps the waits asked by the servers with Retry-After)
+max_backoff = 300
+
+# Status codes of the replies that are retried
+retry_status = [429, 500, 502, 503, 504]
+
+# Seconds after which a reply is considered slow (the host is asked for fewer concurrent requests)
+slow_reply = 10
+
+# Concurrent requests allowed to each host at most, and the limiter of each host
+host_jobs = 4
+host_limiters = {}
+host_limiters_lock = threading.Lock()
+
+
+# Raised when a transfer ends before all the bytes announced by the server are received
+class IncompleteDownload(IOError):
+    pass
+
+
+# Raised when a transfer is stopped with its stop event (e.g. on Ctrl+C), it is not retried
+class TransferStopped(Exception):
+    pass
+
+
+# Raise TransferStopped if stop_event is set
+def checkStopped(url, stop_event):
+    if stop_event is not None and stop_event.is_set():
+        raise TransferStopped(f'Transfer of {url} stopped')
+
+
+# Adaptive limit of the concurrent requests to a host (used as a context manager around each request)
+# The limit is halved when the host asks to slow down (429 / 503) or replies slowly, and grows by one after limit
+# replies in a row without problems, up to max_limit
+class HostLimiter:
+    def __init__(self, max_limit):
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.active = 0
+        self.successes = 0
+        # No requests are sent before this time (time.monotonic) when the host asked to wait
+        self.paused_until = 0
+        self.condition = threading.Condition()
+
+    def __enter__(self):
+        with self.condition:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0 and self.active < self.limit:
+                    break
+                self.condition.wait(wait if wait > 0 else None)
+
+            self.active += 1
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    # Fewer concurrent requests, and none at all during pause seconds
+    def slowDown(self, pause=0):
+        with self.condition:
+            self.limit = max(1, self.limit // 2)
+            self.successes = 0
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    # Count a reply without problems, allowing one more concurrent request after limit of them in a row
+    def succeeded(self):
+        with self.condition:
+            self.successes += 1
+
+            if self.successes >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self.successes = 0
+                self.condition.notify_all()
+
+
+# Create the shared session, pool_size is the number of keep-alive connections kept per host (and the
+# most concurrent requests to a host), failed requests are retried up to retries times starting backoff_delay seconds apart
+def initSession(pool_size=4, request_timeout=60, retries=5, backoff_delay=1):
+    import requests
+    import requests.adapters
+
+    global session, timeout, max_retries, backoff, host_jobs
+
+    timeout = request_timeout
+    max_retries = retries
+    backoff = backoff_delay
+
+    with host_limiters_lock:
+        host_jobs = max(1, pool_size)
+        host_limiters.clear()
+
+    new_session = requests.Session()
+    new_session.headers.update({'User-Agent': f'jvet-scripts/{__version__}',
+                                'Accept-Encoding': 'gzip, deflate'})
+
+    # Connection pools for http and https, blocking so that no more than pool_size connections are open per host
+    adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=max(1, pool_size), pool_block=True)
+    new_session.mount('http://', adapter)
+    new_session.mount('https://', adapter)
+
+    with session_lock:
+        if session is not None:
+            session.close()
+        session = new_session
+
+    return session
+
+
+# Get the shared session, creating it with the default settings if needed
+def getSession():
+    with session_lock:
+        if session is not None:
+            return session
+
+    return initSession()
+
+
+# Set the semaphore capping the concurrent requests of all the processes of a run
+def initNetworkSlots(slots):
+    global network_slots
+
+    network_slots = slots
+
+
+# Hold one of the network slots (does nothing if there is no cap)
+def networkSlot():
+    return network_slots if network_slots is not None else contextlib.nullcontext()
+
+
+# Get the limiter of the concurrent requests to the host of url
+def getHostLimiter(url):
+    host = urllib.parse.urlparse(url).netloc
+
+    with host_limiters_lock:
+        if host not in host_limiters:
+            host_limiters[host] = HostLimiter(host_jobs)
+
+        return host_limiters[host]
+
+
+# Exceptions of failed transfers (retried, and reported instead of stopping the run once the retries are exhausted)
+def transferErrors():
+    import requests
+
+    return (requests.RequestException, IncompleteDownload)
+
+
+# Seconds to wait asked by the Retry-After header of a response (seconds or HTTP date), 0 if there is none
+def getRetryAfter(response):
+    value = response.headers.get('Retry-After', '').strip() if response is not None else ''
+
+    if value.isdigit():
+        return int(value)
+
+    try:
+        return max(0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0
+
+
+# Run request (a function performing a whole request to url) holding a slot of the host and a network slot
+# Connection errors, timeouts, incomplete transfers and the replies with a status in retry_status are retried up to
+# max_retries times with a jittered exponential backoff, waiting at least what the server asks in Retry-After
+# Once stop_event is set no more attempts are made (TransferStopped is raised)
+def retryRequest(url, request, stop_event=None):
+    import requests
+
+    limiter = getHostLimiter(url)
+
+    for attempt in range(max_retries + 1):
+        checkStopped(url, stop_event)
+
+        try:
+            with limiter, networkSlot():
+                result = request()
+            limiter.succeeded()
+            return result
+        except transferErrors() as e:
+            response = e.response if isinstance(e, requests.RequestException) else None
+            status = response.status_code if response is not None else None
+
+            # Errors that do not go away by retrying (e.g. 404)
+            if isinstance(e, requests.HTTPError) and status not in retry_status:
+                raise
+            if attempt == max_retries:
+                raise
+
+            retry_after = min(getRetryAfter(response), max_backoff)
+            # The host asked to slow down or did not reply in time
+            if status in (429, 503) or isinstance(e, requests.Timeout):
+                limiter.slowDown(retry_after)
+
+            JVETStats.count('retries')
+            delay = max(retry_after, random.uniform(0, min(max_backoff, backoff * 2 ** attempt)))
+            if stop_event is not None:
+                stop_event.wait(delay)
+            else:
+                time.sleep(delay)
+
+
+# Send a GET request with the shared session, raises requests.HTTPError on error status codes (other than those in accepted)
+# Replies slower than slow_reply seconds ask the host limiter for fewer concurrent requests
+def sendRequest(url, stream=False, headers=None, accepted=()):
+    response = getSession().get(url, stream=stream, headers=headers, timeout=timeout)
+    JVETStats.count('requests')
+
+    if response.elapsed.total_seconds() > slow_reply:
+        getHostLimiter(url).slowDown()
+
+    if response.status_code not in accepted:
+        try:
+            response.raise_for_status()
+        except BaseException:
+            # Give the connection back to the pool (streamed replies keep it until closed)
+            response.close()
+            raise
+
+    # Streamed bodies are counted as they are read
+    if not stream:
+        JVETStats.count('bytes', len(response.content))
+
+    return response
+
+
+# Perform a GET request with the shared session holding a slot of the host and a network slot, with retries
+# When streaming the slots are only held while the headers are received (use downloadFile for whole transfers)
+def fetch(url, stream=False, headers=None, stop_event=None):
+    return retryRequest(url, lambda: sendRequest(url, stream=stream, headers=headers), stop_event)
+
+
+# Get the (decoded) body of url
+def fetchContent(url, stop_event=None):
+    return fetch(url, stop_event=stop_event).content
+
+
+# Size in bytes of the file at url from the Content-Length of a HEAD request (None if the server does not tell)
+def fetchSize(url, stop_event=None):
+    def request():
+        response = getSession().head(url, headers={'Accept-Encoding': 'identity'}, timeout=timeout, allow_redirects=True)
+        JVETStats.count('requests')
+        response.raise_for_status()
+        return response
+
+    length = retryRequest(url, request, stop_event).headers.get('Content-Length', '')
+
+    return int(length) if length.isdigit() else None
+
+
+# Set the directory of the on-disk response cache (None disables it)
+def initCache(directory):
+    global cache_dir
+
+    if directory is not None:
+        directory = os.path.expanduser(directory)
+        os.makedirs(directory, exist_ok=True)
+
+    cache_dir = directory
+
+
+# Paths of the metadata and body files of the cache entry of url
+def getCachePaths(url):
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    return [os.path.join(cache_dir, key + '.json'), os.path.join(cache_dir, key + '.body')]
+
+
+# Write a file atomically so concurrent readers never see it half written
+def writeAtomic(path, data):
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+    with open(tmp_path, 'wb') as fp:
+        fp.write(data)
+
+    os.replace(tmp_path, path)
+
+
+# Read the metadata of the cache entry of url (None if there is no entry)
+def readCacheMeta(url):
+    if cache_dir is None:
+        return None
+
+    meta_path = getCachePaths(url)[0]
+
+    try:
+        with open(meta_path, 'r') as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+
+# Store the validators of a response (and optionally its body) in the cache
+def writeCacheEntry(url, response, body=None):
+    if cache_dir is None:
+        return
+
+    meta_path, body_path = getCachePaths(url)
+
+    if body is not None:
+        writeAtomic(body_path, body)
+
+    meta = {'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'stored': time.time()}
+    writeAtomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+
+# Headers of a conditional request built from the validators stored in meta
+def getConditionalHeaders(meta):
+    headers = {}
+
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+
+    return headers
+
+
+# Get the body of url through the on-disk cache
+# policy sets how fresh a cached page has to be:
+#     'forever'    - a cached page is always used (pages that never change)
+#     'revalidate' - the server is always asked with a conditional request
+#     seconds      - the cached page is used if it is younger than this, otherwise revalidated
+#     None         - the cache is not used
+def fetchCached(url, policy='revalidate'):
+    if cache_dir is None or policy is None:
+        return fetchContent(url)
+
+    meta = readCacheMeta(url)
+    body_path = getCachePaths(url)[1]
+    headers = None
+
+    if meta is not None and os.path.isfile(body_path):
+        # Use the cached page without asking the server if it is fresh
+        if policy == 'forever' or (policy != 'revalidate' and time.time() - meta['stored'] < policy):
+            JVETStats.count('cache_hits')
+            with open(body_path, 'rb') as fp:
+                return fp.read()
+
+        headers = getConditionalHeaders(meta)
+
+    response = fetch(url, headers=headers)
+
+    # Page not modified, use the cached one
+    if response.status_code == 304:
+        JVETStats.count('cache_hits')
+        with open(body_path, 'rb') as fp:
+            body = fp.read()
+        writeCacheEntry(url, response)
+        return body
+
+    writeCacheEntry(url, response, response.content)
+
+    return response.content
+
+
+# Read the validators of the file a partial download was taken from (None if they are unknown or of another url)
+def readPartMeta(url, part_path):
+    try:
+        with open(part_path + '.meta', 'r') as fp:
+            meta = json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+    return meta if meta.get('url') == url else None
+
+
+# Store the validators of the file a partial download is taken from next to it (path.part.meta)
+def writePartMeta(url, part_path, response):
+    meta = {'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')}
+    writeAtomic(part_path + '.meta', json.dumps(meta).encode('utf-8'))
+
+
+# Remove a partial download and its validators
+def removePart(part_path):
+    for path in [part_path, part_path + '.meta']:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+
+# Check if path is a complete zip archive (the zip files and Office documents downloaded are all zip archives)
+# A truncated archive has no central directory, the members are read back to check their CRC too
+def isCompleteArchive(path):
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return archive.testzip() is None
+    except (NotImplementedError, RuntimeError):
+        # Members that can not be read here (e.g. deflate64 or encrypted), the archive is complete up to its central directory
+        return True
+    except (zipfile.BadZipfile, OSError, EOFError, zlib.error):
+        return False
+
+
+# Download url to path, returns the number of bytes written and their sha256 hex digest
+# The file is written to path.part and only moved to path once its size is checked (or, if the server does not send it,
+# once it is checked to be a complete zip archive), so path is never left truncated
+# An interrupted download (path.part left behind) is resumed with a Range request when the server allows it, the
+# validators of the file (ETag or Last-Modified) are kept next to the part (path.part.meta) to check it did not change
+# If conditional is set and path exists it is only downloaded again if it changed on the server (returns None otherwise)
+# Failed transfers are retried (resuming from the bytes already received)
+# Setting stop_event stops the transfer (TransferStopped is raised), path.part is kept to be resumed by the next run
+def downloadFile(url, path, conditional=False, stop_event=None):
+    return retryRequest(url, lambda: downloadFileOnce(url, path, conditional, stop_event), stop_event)
+
+
+# Single attempt of downloadFile
+def downloadFileOnce(url, path, conditional=False, stop_event=None):
+    part_path = path + '.part'
+    digest = hashlib.sha256()
+    # Files are already compressed, the identity encoding also keeps the sizes comparable with Content-Length
+    headers = {'Accept-Encoding': 'identity'}
+    meta = readCacheMeta(url)
+
+    if conditional and os.path.isfile(path):
+        # Validators from the cache or, if there are none, the time of the local copy
+        conditional_headers = getConditionalHeaders(meta) if meta is not None else {}
+        if not conditional_headers:
+            conditional_headers['If-Modified-Since'] = email.utils.formatdate(os.path.getmtime(path), usegmt=True)
+        headers.update(conditional_headers)
+
+    # Resume from the bytes already downloaded by an interrupted download
+    # Without validators (none sent by the server) the part can not be checked against the file on the server, so it is
+    # downloaded again from the start
+    offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+    part_meta = readPartMeta(url, part_path)
+    validator = (part_meta.get('etag') or part_meta.get('last_modified')) if part_meta is not None else None
+    if offset > 0 and validator is None:
+        removePart(part_path)
+        offset = 0
+    if offset > 0:
+        headers['Range'] = f'bytes={offset}-'
+        # The server sends the whole file instead if it changed since the part was downloaded
+        headers['If-Range'] = validator
+
+    with sendRequest(url, stream=True, headers=headers, accepted=[416]) as response:
+        # Local copy is up to date
+        if response.status_code == 304:
+            JVETStats.count('cache_hits')
+            return None
+
+        # Range not satisfiable, the part is not usable
+        restart = response.status_code == 416
+
+        if not restart:
+            if response.status_code == 206:
+                # Continue the part (its bytes are part of the digest)
+                mode = 'ab'
+                size = offset
+                with open(part_path, 'rb') as fp:
+                    while chunk := fp.read(chunk_size):
+                        digest.update(chunk)
+
+                total = response.headers.get('Content-Range', '').split('/')[-1]
+                expected_size = int(total) if total.isdigit() else None
+            else:
+                # Whole file (no previous part or the server does not support ranges)
+                mode = 'wb'
+                size = 0
+                expected_size = int(response.headers['Content-Length']) if response.headers.get('Content-Length', '').isdigit() else None
+
+                # Keep the validators for the next conditional download and for resuming
+                writeCacheEntry(url, response)
+                writePartMeta(url, part_path, response)
+
+            with open(part_path, mode) as fp:
+                for chunk in response.iter_content(chunk_size=read_size):
+                    checkStopped(url, stop_event)
+                    fp.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                    JVETStats.count('bytes', len(chunk))
+
+    if restart:
+        JVETStats.count('retries')
+        removePart(part_path)
+        return downloadFileOnce(url, path, conditional, stop_event)
+
+    # The part is kept to be resumed later
+    if expected_size is not None and size != expected_size:
+        raise IncompleteDownload(f'Incomplete download of {url} ({size} out of {expected_size} bytes)')
+    if expected_size is None and not isCompleteArchive(part_path):
+        raise IncompleteDownload(f'Incomplete download of {url} ({size} bytes, not a complete zip archive)')
+
+    # Put complete file in place
+    os.replace(part_path, path)
+    removePart(part_path)
+
+    return [size, digest.hexdigest()]
+
+
+# Download url to a temporary file object kept in memory, spilled to disk only if it grows over spill_size bytes
+# Returns the file object (positioned at its start), the number of bytes and their sha256 hex digest
+# Failed transfers are retried from the start, setting stop_event stops the transfer (TransferStopped is raised)
+def downloadToBuffer(url, spill_size, stop_event=None):
+    return retryRequest(url, lambda: downloadToBufferOnce(url, spill_size, stop_event), stop_event)
+
+
+# Single attempt of downloadToBuffer
+def downloadToBufferOnce(url, spill_size, stop_event=None):
+    size = 0
+    digest = hashlib.sha256()
+    buffer = tempfile.SpooledTemporaryFile(max_size=spill_size)
+
+    try:
+        with sendRequest(url, stream=True, headers={'Accept-Encoding': 'identity'}) as response:
+            expected_size = int(response.headers['Content-Length']) if response.headers.get('Content-Length', '').isdigit() else None
+
+            for chunk in response.iter_content(chunk_size=read_size):
+                checkStopped(url, stop_event)
+                buffer.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+                JVETStats.count('bytes', len(chunk))
+
+        if expected_size is not None and size != expected_size:
+            raise IncompleteDownload(f'Incomplete download of {url} ({size} out of {expected_size} bytes)')
+    except BaseException:
+        buffer.close()
+        raise
+
+    buffer.seek(0)
+
+    return [buffer, size, digest.hexdigest()]
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Run instrumentation for the JVET scripts, counts the wall time,
+#     requests, bytes transferred, cache hits, retries and extracted bytes
+#     of each stage of each meeting and writes them as a JSON run report
+#     and as a Prometheus textfile collector file
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import json
+import os
+import threading
+import time
+
+
+# Counters of each stage as {(meeting, stage): {counter: value}}
+stats = {}
+stats_lock = threading.Lock()
+
+# Stage being run by this process as [meeting, stage, start time] (None when there is none)
+current_stage = None
+
+# Counters of every stage, in the order they appear in the reports
+counters = ['seconds', 'requests', 'bytes', 'cache_hits', 'retries', 'extracted_bytes', 'extract_seconds']
+
+# Meeting name of the stages that are not part of a meeting
+global_meeting = 'all_meetings'
+
+
+# Add value to a counter of the stage being run (ignored if there is none)
+def count(counter, value=1):
+    with stats_lock:
+        if current_stage is None:
+            return
+
+        entry = stats.setdefault((current_stage[0], current_stage[1]), dict.fromkeys(counters, 0))
+        entry[counter] += value
+
+
+# Start a stage of a meeting, the stage running before (if any) is stopped
+# Everything counted from now on, by any thread of this process, goes to this stage
+def startStage(meeting, stage):
+    global current_stage
+
+    stopStage()
+
+    with stats_lock:
+        stats.setdefault((meeting, stage), dict.fromkeys(counters, 0))
+        current_stage = [meeting, stage, time.perf_counter()]
+
+
+# Stop the stage being run adding its wall time
+def stopStage():
+    global current_stage
+
+    with stats_lock:
+        if current_stage is None:
+            return
+
+        meeting, stage, start = current_stage
+        stats[(meeting, stage)]['seconds'] += time.perf_counter() - start
+        current_stage = None
+
+
+# Remove and return the counters of the stages of a meeting (to send them from a worker process to the main one)
+def popMeetingStats(meeting):
+    with stats_lock:
+        keys = [key for key in stats if key[0] == meeting]
+        return {key: stats.pop(key) for key in keys}
+
+
+# Add the counters of another process (from popMeetingStats)
+def mergeStats(other_stats):
+    with stats_lock:
+        for key, other_entry in other_stats.items():
+            entry = stats.setdefault(key, dict.fromkeys(counters, 0))
+            for counter, value in other_entry.items():
+                entry[counter] += value
+
+
+# Counters with the derived rates (bytes per second of the transfers and of the extraction)
+def getRates(entry):
+    rates = dict(entry)
+    rates['bytes_per_second'] = entry['bytes'] / entry['seconds'] if entry['seconds'] else 0
+    rates['extraction_bytes_per_second'] = entry['extracted_bytes'] / entry['extract_seconds'] if entry['extract_seconds'] else 0
+
+    return rates
+
+
+# Build the run report, with the counters of each stage of each meeting and their totals
+def getReport(started, finished):
+    meetings = {}
+    totals = dict.fromkeys(counters, 0)
+
+    with stats_lock:
+        for [meeting, stage], entry in stats.items():
+            meeting_report = meetings.setdefault(meeting, {'stages': {}, 'totals': dict.fromkeys(counters, 0)})
+            meeting_report['stages'][stage] = getRates(entry)
+
+            for counter, value in entry.items():
+                meeting_report['totals'][counter] += value
+                totals[counter] += value
+
+    for meeting_report in meetings.values():
+        meeting_report['totals'] = getRates(meeting_report['totals'])
+
+    # Total wall time is the one of the run (stages of different meetings may overlap)
+    totals['seconds'] = finished - started
+
+    return {'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(started)),
+            'finished': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(finished)),
+            'totals': getRates(totals),
+            'meetings': meetings}
+
+
+# Write a file atomically so readers (e.g. the Prometheus node exporter) never see it half written
+def writeAtomic(path, text):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+
+    with open(tmp_path, 'w') as fp:
+        fp.write(text)
+
+    os.replace(tmp_path, path)
+
+
+# Write the run report as json
+def writeJsonReport(report, path):
+    writeAtomic(path, json.dumps(report, indent=4) + '\n')
+
+
+# Write the run report in the Prometheus text format (for the node exporter textfile collector)
+def writePrometheusFile(report, path, finished):
+    lines = []
+
+    # Metrics of each stage of each meeting
+    metrics = [['seconds', 'stage_seconds', 'Wall time of the stage'],
+               ['requests', 'stage_requests', 'HTTP requests made'],
+               ['bytes', 'stage_bytes', 'Bytes received from the servers'],
+               ['cache_hits', 'stage_cache_hits', 'Pages and files served from the cache or not modified'],
+               ['retries', 'stage_retries', 'Requests retried'],
+               ['extracted_bytes', 'stage_extracted_bytes', 'Bytes extracted from zip files'],
+               ['extraction_bytes_per_second', 'stage_extraction_bytes_per_second', 'Extraction throughput']]
+
+    for counter, name, description in metrics:
+        lines.append(f'# HELP jvet_crawler_{name} {description}')
+        lines.append(f'# TYPE jvet_crawler_{name} gauge')
+        for meeting, meeting_report in sorted(report['meetings'].items()):
+            for stage, entry in meeting_report['stages'].items():
+                lines.append(f'jvet_crawler_{name}{{meeting="{meeting}",stage="{stage}"}} {entry[counter]:g}')
+
+    # Metrics of the whole run
+    lines.append('# HELP jvet_crawler_run_seconds Wall time of the run')
+    lines.append('# TYPE jvet_crawler_run_seconds gauge')
+    lines.append(f'jvet_crawler_run_seconds {report["totals"]["seconds"]:g}')
+    lines.append('# HELP jvet_crawler_run_bytes Bytes received from the servers during the run')
+    lines.append('# TYPE jvet_crawler_run_bytes gauge')
+    lines.append(f'jvet_crawler_run_bytes {report["totals"]["bytes"]:g}')
+    lines.append('# HELP jvet_crawler_last_run_timestamp_seconds Time the last run finished')
+    lines.append('# TYPE jvet_crawler_last_run_timestamp_seconds gauge')
+    lines.append(f'jvet_crawler_last_run_timestamp_seconds {finished:.0f}')
+
+    writeAtomic(path, '\n'.join(lines) + '\n')
@@ -3,14 +3,16 @@
 #----------------------------------------------------------------------------
 # Created By  : João Santos
 # Created Date: 2023/12/13
-# Updated Date: 2024/01/31
-# version ='1.3'
+# Updated Date: 2026/10/16
+# version ='1.4'
 #
 # Description:
 #     JVET Meetings crawler, fetches meeting files and all documents
 #
+# Heavy dependencies (bs4, lxml, openpyxl, tabulate and requests) are only
+# imported by the functions that use them, keeping the startup fast
+#
 # To Do:
-#  - Parallel fetch or extraction or fetch and extraction
 #  - Replace os, shutil and glob with pathlib
 #  - Find smarter way of computing last meeting
 # ---------------------------------------------------------------------------
@@ -18,22 +20,35 @@
 __author__ = "João Santos"
 __copyright__ = "Copyright 2023, João Santos"
 __license__ = "GPL2"
-__version__ = "1.3"
+__version__ = "1.4"
 __maintainer__ = "João Santos"
 __email__ = "joaompssantos@gmail.com"
 __status__ = "Production"
 
 
 import argparse
-from bs4 import BeautifulSoup
+import collections
+import concurrent.futures
+import contextlib
+import datetime
 import glob
-import openpyxl
+import hashlib
+import io
+import itertools
+import JVETHttp
+import JVETStats
+import multiprocessing
 import os
-import pandas
+import queue
+import re
 import shutil
-from tabulate import tabulate
-import urllib
+import sqlite3
+import threading
+import time
+import traceback
+import urllib.parse
 import zipfile
+import zlib
 
 
 # Pause function for debug
@@ -41,34 +56,93 @@ def pause():
     programPause = input("\nPress the <ENTER> key to continue...")
 
 
-# Function to deal with the input arguments
-def getArgs():
+# Function to deal with the input arguments (argv defaults to the command line)
+def getArgs(argv=None):
     parser = argparse.ArgumentParser(description='Get and keep up to date the documentation and meeting notes of JVET')
     parser.add_argument('-v', '--verbose', dest='verbose', action='store_true', required=False, help='verbose mode to get extra information')
     parser.add_argument('-p', '--pause', dest='pause', action='store_true', required=False, help='pause on verbose')
     parser.add_argument('-s', '--nosavexls', dest='savexls', action='store_false', required=False, help='disable saving information as xls file')
+    parser.add_argument('-F', '--sinks', dest='sinks', type=str, required=False,
+                        help='comma separated formats the infos of each meeting are saved in (xlsx, csv, jsonl, sqlite)', default='xlsx')
     parser.add_argument('-r', '--rmzip', dest='rmzip', action='store_true', required=False, help='remove zip files after extraction')
+    parser.add_argument('-D', '--delta', dest='delta', action='store_true', required=False,
+                        help='extract only the files that changed when a new version of a doc arrives (instead of extracting it again)')
+    parser.add_argument('-S', '--stream', dest='stream', action='store_true', required=False,
+                        help='extract zip files straight from the download without storing them (implies --rmzip)')
+    parser.add_argument('-M', '--spillsize', dest='spillsize', type=int, required=False,
+                        help='size in MiB over which a streamed zip file is spilled to a temporary file instead of memory', default=32)
+    parser.add_argument('-e', '--extractjobs', dest='extractjobs', type=int, required=False,
+                        help='number of processes extracting zip files at once', default=1)
+    parser.add_argument('-x', '--splitsize', dest='splitsize', type=int, required=False,
+                        help='size in MiB over which a zip file is split between several extraction processes', default=64)
     parser.add_argument('-f', '--force', dest='force', action='store_true', required=False, help='force to redo operations that would be skipped')
+    parser.add_argument('-j', '--jobs', dest='jobs', type=int, required=False, help='maximum number of concurrent downloads per host',
+                        default=4)
+    parser.add_argument('-t', '--timeout', dest='timeout', type=float, required=False, help='timeout in seconds for the server connection and replies',
+                        default=60)
+    parser.add_argument('-O', '--order', dest='order', type=str, required=False, choices=['table', 'small', 'large', 'balanced'],
+                        help='order of the downloads: as in the docs table, smallest or largest first, or balanced (large and small '
+                             'transfers interleaved so both keep the workers busy)', default='table')
+    parser.add_argument('-y', '--priority', dest='priority', type=str, required=False,
+                        help='comma separated doc numbers or ranges (e.g. JVET-AB0100:JVET-AB0150) downloaded before the others')
+    parser.add_argument('-Y', '--watchlist', dest='watchlist', type=str, required=False,
+                        help='file with doc numbers or ranges downloaded before the others (one per line, # for comments)')
+    parser.add_argument('-T', '--retries', dest='retries', type=int, required=False,
+                        help='number of times a failed request is retried before giving up on it', default=5)
+    parser.add_argument('-B', '--backoff', dest='backoff', type=float, required=False,
+                        help='base delay in seconds between retries (doubled on each retry, with random jitter)', default=1)
+    parser.add_argument('-c', '--cachedir', dest='cachedir', type=str, required=False, help='directory to cache the fetched pages',
+                        default=os.path.join('~', '.cache', 'jvet-scripts', 'http'))
+    parser.add_argument('-C', '--nocache', dest='cache', action='store_false', required=False, help='disable the cache of fetched pages')
+    parser.add_argument('-a', '--activedays', dest='activedays', type=int, required=False,
+                        help='days after its start during which a meeting pages are revalidated on each run (cached forever after)',
+                        default=90)
+    parser.add_argument('-m', '--meetingjobs', dest='meetingjobs', type=int, required=False,
+                        help='number of meetings processed at once (in separate processes)', default=1)
+    parser.add_argument('-N', '--netjobs', dest='netjobs', type=int, required=False,
+                        help='maximum number of concurrent connections of all the meetings processed at once', default=8)
+    parser.add_argument('-w', '--watch', dest='watch', type=int, nargs='?', const=60, required=False,
+                        help='after the sync keep polling the active meeting every WATCH seconds (60 if not given) for new or revised docs')
     parser.add_argument('-l', '--lastmeetings', dest='lastmeetings', type=int, required=False, help='fetch only last lastmeetings', default=-1)
-    parser.add_argument('-d', '--docsource', dest='docsource', nargs=1, type=str, required=False,
+    parser.add_argument('-d', '--docsource', dest='docsource', type=str, required=False,
                         help='link to the page with the list of all JVET meetings (might not work if changed)',
                         default = 'https://www.jvet-experts.org/doc_end_user/all_meeting.php')
-    parser.add_argument('-n', '--notesource', dest='notesource', nargs=1, type=str, required=False,
+    parser.add_argument('-n', '--notesource', dest='notesource', type=str, required=False,
                         help='link to the page with the list of all JVET meeting notes (might not work if changed)',
                         default = 'https://www.itu.int/wftp3/av-arch/jvet-site/')
-    parser.add_argument('-z', '--zipdir', dest='zipdir', nargs=1, type=str, required=False, help='directory to store the zip files',
+    parser.add_argument('-z', '--zipdir', dest='zipdir', type=str, required=False, help='directory to store the zip files',
                         default = 'zipfiles')
 
+    parser.add_argument('-k', '--store', dest='store', type=str, required=False,
+                        help='content-addressed store where a single copy of each zip and extracted file is kept and linked from the output directory')
+    parser.add_argument('-K', '--storelink', dest='storelink', type=str, required=False, choices=['hardlink', 'reflink'],
+                        help='how files are linked to the store, hardlinked files share changes, reflinks (copy-on-write) do not',
+                        default='hardlink')
+    parser.add_argument('-R', '--report', dest='report', type=str, required=False,
+                        help='file to save the run report to (json), defaults to #run_report.json in the output directory')
+    parser.add_argument('-P', '--prometheus', dest='prometheus', type=str, required=False,
+                        help='file to save the run metrics to in the Prometheus text format (e.g. for the node exporter textfile collector)')
+    parser.add_argument('-g', '--gc', dest='gc', action='store_true', required=False,
+                        help='remove the files of the store that are no longer used in the output directory and exit')
+
     requiredNamed = parser.add_argument_group('required arguments')
     requiredNamed.add_argument('-o', '--outputdir', dest='outputdir', type=str, required=True, help='directory to store the documents')
 
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+
+    # The store is always used by its real path, so the paths of its blobs match the ones found walking it
+    if args.store:
+        args.store = os.path.realpath(os.path.expanduser(args.store))
 
+    return args
 
-# Save list to xls
+
+# Save list to xls (rows are streamed to the file instead of kept in memory)
 def saveXlsFile(list, path):
-    wb = openpyxl.Workbook()
-    ws = wb.active
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet')
 
     # Append each row in the table to the worksheet
     for row in list:
@@ -84,8 +158,10 @@ def getAllMeetingsTable(args):
     all_meetings_url = args.docsource
     notes_meetings_url = args.notesource
 
+    from bs4 import BeautifulSoup
+
     # Get url source to be parsed by BeautifulSoup
-    all_meetings_source = urllib.request.urlopen(all_meetings_url)
+    all_meetings_source = JVETHttp.fetchCached(all_meetings_url, 'revalidate')
     # Read html from source
     all_meetings_soup = BeautifulSoup(all_meetings_source, 'lxml')
     # Table iterator
@@ -94,7 +170,7 @@ def getAllMeetingsTable(args):
     all_meetings_links = BeautifulSoup('<a href="Meeting Link"></a>', 'lxml').find_all('a') + all_meetings_soup.table.findAll('a')
 
     # Get url source to be parsed by BeautifulSoup
-    notes_meetings_source = urllib.request.urlopen(notes_meetings_url)
+    notes_meetings_source = JVETHttp.fetchCached(notes_meetings_url, 'revalidate')
     # Read html from source
     notes_meetings_soup = BeautifulSoup(notes_meetings_source, 'lxml')
     # Links iterator extracted to a list for convenience
@@ -145,6 +221,8 @@ def getAllMeetingsTable(args):
 
     # Print table
     if args.verbose:
+        from tabulate import tabulate
+
         print('Global table with all the meetings info:\n')
         print(tabulate(meeting_info_table, headers='firstrow'))
 
@@ -160,11 +238,13 @@ def getAllMeetingsTable(args):
 
 
 # Function to try and fetch the zip url from the preview page
-def fetchZipUrl(doc_number, prev_url):
+def fetchZipUrl(doc_number, prev_url, stop_event=None):
+    from bs4 import BeautifulSoup
+
     zip_link = None
 
     # Open prev_url with BeautifulSoup
-    html_page = urllib.request.urlopen(prev_url)
+    html_page = JVETHttp.fetchContent(prev_url, stop_event)
     soup = BeautifulSoup(html_page, 'lxml')
 
     # Check all the urls and extract the last which corresponds with the doc_number
@@ -175,47 +255,194 @@ def fetchZipUrl(doc_number, prev_url):
     return zip_link
 
 
-# Get table of meeting docs
-def getDocsTable(args, meeting_url):
-    # Get meeting raw table from meeting page
-    meeting_raw_table = pandas.read_html(meeting_url, extract_links = 'all')[1]
+# Open the memo of the zip urls resolved from preview pages (None if the cache is disabled)
+def openZipUrlMemo(args):
+    if not args.cache:
+        return None
+
+    cache_dir = os.path.expanduser(args.cachedir)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Meeting worker processes may share it, wait for their locks instead of failing
+    conn = sqlite3.connect(os.path.join(cache_dir, 'zip_urls.sqlite'), timeout=60)
+    conn.execute('''CREATE TABLE IF NOT EXISTS zip_urls (
+                        jvet_number   TEXT,
+                        last_uploaded TEXT,
+                        zip_url       TEXT,
+                        PRIMARY KEY (jvet_number, last_uploaded)
+                    )''')
+    conn.commit()
+
+    return conn
+
+
+# Resolve the zip urls of the docs (DocRecord) without a zip link from their preview pages
+# Preview pages are fetched concurrently and the urls memoized by doc number and upload date, so each
+# preview page is only fetched once, returns a dictionary with the zip url (or None) of each doc number
+def resolvePreviewZipUrls(args, docs):
+    zip_urls = {}
+
+    if not docs:
+        return zip_urls
+
+    conn = openZipUrlMemo(args)
+
+    # Docs resolved in previous runs
+    pending = []
+    for doc in docs:
+        row = None
+        if conn is not None:
+            row = conn.execute('SELECT zip_url FROM zip_urls WHERE jvet_number = ? AND last_uploaded = ?',
+                               [doc.number, doc.last_uploaded]).fetchone()
+        if row is not None:
+            zip_urls[doc.number] = row[0]
+            JVETStats.count('cache_hits')
+        else:
+            pending.append(doc)
+
+    # Set to stop the requests running if the resolution is interrupted
+    stop_event = threading.Event()
+
+    # Fetch the preview page of each doc without a zip link (a page that can not be fetched is tried again on the next run)
+    def resolve(doc):
+        preview_page_url = urllib.parse.urljoin(args.docsource.replace('all_meeting.php', ''), doc.preview_link)
+
+        try:
+            return fetchZipUrl(doc.number, preview_page_url, stop_event)
+        except JVETHttp.transferErrors() as e:
+            printLocked(f'            Could not fetch the preview page of {doc.number} ({e})')
+            return None
+
+    with downloadPool(args, stop_event) as executor:
+        for doc, zip_url in zip(pending, executor.map(resolve, pending)):
+            zip_urls[doc.number] = zip_url
+
+            # Only found urls are kept, a missing link is checked again on the next run
+            if conn is not None and zip_url is not None:
+                conn.execute('INSERT OR REPLACE INTO zip_urls VALUES (?, ?, ?)', [doc.number, doc.last_uploaded, zip_url])
+
+    if conn is not None:
+        conn.commit()
+        conn.close()
+
+    return zip_urls
+
+
+# Compact record of a row of the meeting docs table
+DocRecord = collections.namedtuple('DocRecord', ['number', 'preview_link', 'last_uploaded', 'title', 'authors',
+                                                 'zip_text', 'zip_link'])
+
+# Whitespace collapsed in the text of the docs table cells
+cell_whitespace = re.compile(r'[\r\n]+|\s{2,}')
+
+
+# Text of a table cell with the whitespace collapsed
+def getCellText(cell):
+    return cell_whitespace.sub(' ', ''.join(cell.itertext()).strip())
 
-    # Drop unneeded columns (namely: MPEG number, Created and First upload)
-    meeting_raw_table.drop([1, 2, 3], axis=1, inplace=True)
+
+# First link of a table cell (None if there is none)
+def getCellLink(cell):
+    for link in cell.iter('a'):
+        if link.get('href') is not None:
+            return link.get('href')
+
+    return None
+
+
+# Parse the docs table (second table) of a meeting page incrementally, yielding a DocRecord per document row
+# The first (headers) and last rows of the table are skipped, as well as rows without the zip column
+def parseDocsTable(page, chunk_size=64 * 1024):
+    import lxml.etree
+
+    parser = lxml.etree.HTMLPullParser(events=('start', 'end'), tag=('table', 'tr'))
+
+    # Number of tables started so far and stack of the open ones (so rows of nested tables are ignored)
+    no_tables = 0
+    open_tables = []
+    # Rows of the docs table seen so far, and the last one (only known not to be the last row once another arrives)
+    no_rows = 0
+    pending_row = None
+
+    for start in range(0, len(page), chunk_size):
+        parser.feed(page[start:start + chunk_size])
+
+        for event, element in parser.read_events():
+            if element.tag == 'table':
+                if event == 'start':
+                    no_tables += 1
+                    open_tables.append(no_tables)
+                else:
+                    open_tables.pop()
+                    # Nothing else is needed after the docs table
+                    if no_tables >= 2 and not open_tables:
+                        return
+                continue
+
+            # Only the complete rows that belong directly to the docs table are of interest
+            if event != 'end' or element.tag != 'tr' or not open_tables or open_tables[-1] != 2:
+                continue
+
+            # Cells of the row (cells spanning several columns are repeated)
+            cells = []
+            for cell in element:
+                if cell.tag in ('td', 'th'):
+                    cells.extend([cell] * int(cell.get('colspan') or 1))
+
+            no_rows += 1
+            if pending_row is not None and no_rows > 2:
+                yield pending_row
+            pending_row = None
+
+            # Rows without the zip column are skipped (MPEG number, Created and First upload are not needed)
+            if len(cells) >= 8:
+                pending_row = DocRecord(getCellText(cells[0]), getCellLink(cells[0]), getCellText(cells[4]),
+                                        getCellText(cells[5]), getCellText(cells[6]),
+                                        getCellText(cells[7]), getCellLink(cells[7]))
+
+            # Free the parsed row and the ones before it
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    parser.close()
+
+
+# Get table of meeting docs, cache_policy sets how the meeting page is cached (see JVETHttp.fetchCached)
+def getDocsTable(args, meeting_url, cache_policy='revalidate'):
+    # Get meeting page
+    meeting_page = JVETHttp.fetchCached(meeting_url, cache_policy)
 
     # Create the actual meeting table with all information
     meeting_table = [['JVET Number', 'Title', 'Zip', 'Authors', 'Last Uploaded']]
 
-    # Loop raw table skipping first line (headers)
-    for irow in range(1, meeting_raw_table.shape[0] - 1):
-        # Check if exists and skip if it does not
-        if isinstance(meeting_raw_table.iloc[irow, 4], float):
-            continue
-        # Check if withdrawn and skip
-        elif meeting_raw_table.iloc[irow, 4][0].lower() == 'withdrawn':
-            continue
-        # Sometimes zip link does not exist but it does not seem to be withdrawn
-        # This addresses that case
-        elif meeting_raw_table.iloc[irow, 4][1] is None:
-            preview_page_url = urllib.parse.urljoin(args.docsource.replace('all_meeting.php', ''),
-                                                    meeting_raw_table.iloc[irow, 0][1])
-            zip_url = fetchZipUrl(meeting_raw_table.iloc[irow, 0][0], preview_page_url)
-            
+    # Document rows of the docs table, withdrawn docs are skipped
+    docs = [doc for doc in parseDocsTable(meeting_page) if doc.zip_text.lower() != 'withdrawn']
+
+    # Sometimes zip link does not exist but it does not seem to be withdrawn
+    # This addresses that case by getting the link from the preview pages
+    preview_zip_urls = resolvePreviewZipUrls(args, [doc for doc in docs if doc.zip_link is None])
+
+    # Loop the documents
+    for doc in docs:
+        if doc.zip_link is None:
+            zip_url = preview_zip_urls[doc.number]
+
             # If for some reason no link was found the current doc is skipped
             if zip_url is None:
                 continue
         else:
             # Generate proper zip url
-            zip_url = meeting_raw_table.iloc[irow, 4][1].replace('..', '')
+            zip_url = doc.zip_link.replace('..', '')
 
         # Generate full zip url
         zip_url = urllib.parse.urljoin(args.docsource.replace('doc_end_user/all_meeting.php', ''), zip_url)
 
-        curr_doc = [meeting_raw_table.iloc[irow, 0][0], # JVET Number
-                    meeting_raw_table.iloc[irow, 2][0], # Title
-                    zip_url,                            # Link to zip
-                    meeting_raw_table.iloc[irow, 3][0], # Author list
-                    meeting_raw_table.iloc[irow, 1][0]] # Last uploaded date
+        curr_doc = [doc.number,         # JVET Number
+                    doc.title,          # Title
+                    zip_url,            # Link to zip
+                    doc.authors,        # Author list
+                    doc.last_uploaded]  # Last uploaded date
 
         meeting_table.append(curr_doc)
 
@@ -223,12 +450,14 @@ def getDocsTable(args, meeting_url):
 
 
 # Get notes and logistics links
-def getNotesLinks(args, notes_url):
+def getNotesLinks(args, notes_url, cache_policy='revalidate'):
+    from bs4 import BeautifulSoup
+
     notes_link = None
     logistics_link = None
 
     # Open prev_url with BeautifulSoup
-    html_page = urllib.request.urlopen(notes_url)
+    html_page = JVETHttp.fetchCached(notes_url, cache_policy)
     soup = BeautifulSoup(html_page, 'lxml')
 
     # Check all the urls and extract the last which corresponds with the notes or logistics tag
@@ -244,29 +473,31 @@ def getNotesLinks(args, notes_url):
 
 # Save meeting infos to xls
 def saveMeetingInfosXlsFile(meeting_name, no_docs, docs_list, notes_links, path):
-    # Create workbook and make active
-    wb = openpyxl.Workbook()
-    ws = wb.active
-
-    # Add meeting title
-    ws.append(['Meeting:', meeting_name])
-    # Make it bold
-    ws['A1'].font = openpyxl.styles.Font(bold = True)
-    ws['B1'].font = openpyxl.styles.Font(bold = True)
-    # Add link to folder
-    ws['B1'].hyperlink = os.path.dirname(path)
+    import openpyxl
+    import openpyxl.cell
+    import openpyxl.styles
+
+    # Create a write-only workbook (rows are streamed to the file), cells with style or links are created beforehand
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet')
+
+    # Cell with an optional hyperlink and bold font
+    def getCell(value, link=None, bold=False):
+        cell = openpyxl.cell.WriteOnlyCell(ws, value=value)
+        if link:
+            cell.hyperlink = link
+        if bold:
+            cell.font = openpyxl.styles.Font(bold = True)
+        return cell
+
+    # Add meeting title in bold with a link to the folder
+    ws.append([getCell('Meeting:', bold=True), getCell(meeting_name, os.path.dirname(path), bold=True)])
     # Skip row
     ws.append([''])
 
-    # Add links to notes and logistics
-    ws.append(['Notes:', notes_links[0][0]])
-    ws.append(['Logistics:', notes_links[1][0]])
-    # Add links to local files
-    ws['A3'].hyperlink = notes_links[0][1]
-    ws['A4'].hyperlink = notes_links[1][1]
-    # Add links to remote files
-    ws['B3'].hyperlink = notes_links[0][0]
-    ws['B4'].hyperlink = notes_links[1][0]
+    # Add links to notes and logistics (local files on the labels and remote files on the urls)
+    ws.append([getCell('Notes:', notes_links[0][1]), getCell(notes_links[0][0], notes_links[0][0])])
+    ws.append([getCell('Logistics:', notes_links[1][1]), getCell(notes_links[1][0], notes_links[1][0])])
     # Skip row
     ws.append([''])
 
@@ -278,41 +509,220 @@ def saveMeetingInfosXlsFile(meeting_name, no_docs, docs_list, notes_links, path)
     # Append headers to the worksheet
     ws.append(docs_list[0])
 
-    # Add links to docs folders and to zip url
-    for ix, doc in zip(range(len(docs_list) - 1), docs_list[1:]):
-        # Append each row in the docs list to the worksheet
-        ws.append(doc)
-        # Target cell
-        cell = f'A{9 + ix}'
-        ws[cell].hyperlink = doc[0]
-
-        # Target cell
-        cell = f'C{9 + ix}'
-        ws[cell].hyperlink = doc[2]
-    
+    # Append each row in the docs list to the worksheet with links to the doc folder and to the zip url
+    for doc in docs_list[1:]:
+        ws.append([getCell(doc[0], doc[0]), doc[1], getCell(doc[2], doc[2])] + list(doc[3:]))
+
     # Save the workbook
     wb.save(os.path.expanduser(path))
 
 
+# Save the docs table of a meeting as csv (notes links are not included)
+def saveMeetingInfosCsvFile(meeting_name, no_docs, docs_list, notes_links, path):
+    import csv
+
+    with open(os.path.expanduser(path), 'w', newline='', encoding='utf-8') as fp:
+        csv.writer(fp).writerows(docs_list)
+
+
+# Save the docs table of a meeting as json lines, one object per doc (notes links are not included)
+def saveMeetingInfosJsonlFile(meeting_name, no_docs, docs_list, notes_links, path):
+    import json
+
+    keys = ['jvet_number', 'title', 'zip_url', 'authors', 'last_uploaded']
+
+    with open(os.path.expanduser(path), 'w', encoding='utf-8') as fp:
+        for doc in docs_list[1:]:
+            fp.write(json.dumps(dict(zip(keys, doc), meeting=meeting_name), ensure_ascii=False) + '\n')
+
+
+# Save the infos of a meeting as a SQLite database with a docs table and a meeting table (name, docs, notes and logistics)
+def saveMeetingInfosSqliteFile(meeting_name, no_docs, docs_list, notes_links, path):
+    path = os.path.expanduser(path)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+
+    # The database is built aside and moved in place, readers never see it half written
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    conn.execute('CREATE TABLE meeting (key TEXT PRIMARY KEY, value TEXT, local_path TEXT)')
+    conn.execute('''CREATE TABLE docs (
+                        jvet_number   TEXT PRIMARY KEY,
+                        title         TEXT,
+                        zip_url       TEXT,
+                        authors       TEXT,
+                        last_uploaded TEXT
+                    )''')
+    conn.executemany('INSERT INTO meeting VALUES (?, ?, ?)', [['name', meeting_name, None], ['docs', no_docs, None],
+                                                              ['notes'] + list(notes_links[0]), ['logistics'] + list(notes_links[1])])
+    conn.executemany('INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?, ?)', docs_list[1:])
+    conn.commit()
+    conn.close()
+
+    os.replace(tmp_path, path)
+
+
+# Metadata sinks of each meeting as {name: [file name, function writing the file]}
+metadata_sinks = {'xlsx': ['#meeting_info.xlsx', saveMeetingInfosXlsFile],
+                  'csv': ['#meeting_info.csv', saveMeetingInfosCsvFile],
+                  'jsonl': ['#meeting_info.jsonl', saveMeetingInfosJsonlFile],
+                  'sqlite': ['#meeting_info.sqlite', saveMeetingInfosSqliteFile]}
+
+
+# Metadata sinks selected with --sinks (xlsx is left out with --nosavexls)
+def getSinks(args):
+    return [sink for sink in args.sinks.split(',') if sink and (sink != 'xlsx' or args.savexls)]
+
+
+# Write the metadata files of a meeting with the selected sinks
+# A file is only written again if the meeting infos changed since it was written (hash kept in the sync manifest)
+def saveMeetingInfos(args, conn, meeting_folder, no_docs, docs_table, notes_links):
+    meeting_name = os.path.basename(meeting_folder)
+    infos_hash = hashlib.sha256(repr([meeting_name, no_docs, docs_table, notes_links]).encode('utf-8')).hexdigest()
+
+    for sink in getSinks(args):
+        file_name, save = metadata_sinks[sink]
+        path = os.path.join(meeting_folder, file_name)
+
+        if os.path.exists(path) and readSinkHash(conn, sink) == infos_hash:
+            print(f'            {file_name} is up to date')
+            continue
+
+        save(meeting_name, no_docs, docs_table, notes_links, path)
+        writeSinkHash(conn, sink, infos_hash)
+        print(f'            {file_name} saved')
+
+
+# Name of the manifest of the files of each meeting, read by JVETFileFinder instead of scanning the meeting folder
+files_manifest_name = '#meeting_files.json'
+
+
+# List the files and folders of a folder tree, leaving out the subfolders in skipped_dirs (e.g. the extracted doc folders)
+# and the files manifest; returns [path relative to the folder with / separators, size (None for folders)] of each one
+def listFolderFiles(folder, skipped_dirs):
+    files = []
+
+    for root, dirs, names in os.walk(folder):
+        relative_root = os.path.relpath(root, folder)
+
+        if root == folder:
+            dirs[:] = [name for name in dirs if name not in skipped_dirs]
+            names = [name for name in names if not name.startswith(files_manifest_name)]
+
+        for name in dirs:
+            files.append([os.path.normpath(os.path.join(relative_root, name)).replace(os.path.sep, '/'), None])
+        for name in names:
+            path = os.path.join(root, name)
+            if os.path.isfile(path):
+                files.append([os.path.normpath(os.path.join(relative_root, name)).replace(os.path.sep, '/'), os.path.getsize(path)])
+
+    return files
+
+
+# Check if a folder, or a folder holding any of its files (paths relative to it, size None for folders), changed after
+# a modification time in nanoseconds (or is gone)
+def folderChangedSince(folder, files, mtime_ns):
+    folders = {folder}
+    for path, size in files:
+        parts = path.split('/')
+        folders.update(os.path.join(folder, *parts[:no_parts]) for no_parts in range(1, len(parts) + (size is None)))
+
+    try:
+        return any(os.stat(path).st_mtime_ns > mtime_ns for path in folders)
+    except OSError:
+        return True
+
+
+# Write the manifest of the files of a meeting: the extracted files of each doc with its infos and the other files
+# Docs extracted before the files were recorded in the sync manifest, and docs whose folders changed after the last
+# manifest was written (e.g. files added by hand), are listed from their folder
+# The manifest is only written again if it changed (hash kept in the sync manifest)
+def saveFilesManifest(conn, meeting_folder, docs_table):
+    import json
+
+    manifest = readSyncManifest(conn)
+    extracted = [doc for doc in docs_table[1:] if doc[0] in manifest and manifest[doc[0]]['status'] == 'extracted']
+
+    path = os.path.join(meeting_folder, files_manifest_name)
+    try:
+        manifest_mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        manifest_mtime = None
+
+    docs = []
+    for doc in extracted:
+        extract_dir = os.path.join(meeting_folder, doc[0])
+        files = [[row['path'], row['size']] for row in
+                 conn.execute('SELECT path, size FROM extracted_files WHERE jvet_number = ? ORDER BY path', [doc[0]])]
+
+        if not files or (manifest_mtime is not None and folderChangedSince(extract_dir, files, manifest_mtime)):
+            files = listFolderFiles(extract_dir, set())
+            writeExtractedFiles(conn, doc[0], files)
+
+        docs.append({'jvet_number': doc[0], 'title': doc[1], 'zip_url': doc[2], 'authors': doc[3], 'last_uploaded': doc[4],
+                     'files': sorted(files, key=lambda file: file[0])})
+
+    files_manifest = {'meeting': os.path.basename(meeting_folder), 'docs': docs,
+                      'files': sorted(listFolderFiles(meeting_folder, set(doc[0] for doc in extracted)), key=lambda file: file[0])}
+
+    text = json.dumps(files_manifest, ensure_ascii=False)
+    manifest_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    if os.path.exists(path) and readSinkHash(conn, 'files_manifest') == manifest_hash:
+        return False
+
+    # Written aside and moved in place, the finder never reads it half written
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fp:
+        fp.write(text)
+    os.replace(tmp_path, path)
+
+    writeSinkHash(conn, 'files_manifest', manifest_hash)
+
+    return True
+
+
+# Mark the files manifest of a meeting as newer than the folder, so the finder keeps using it; writing the sync manifest
+# (its journal file) changes the folder after the files manifest was written or found unchanged
+def touchFilesManifest(meeting_folder):
+    path = os.path.join(meeting_folder, files_manifest_name)
+
+    if os.path.exists(path):
+        os.utime(path)
+
+
 # Function to collect all relevant information of a single meeting (docs + notes)
-def getMeetingInfos(args, meeting_path, meeting_info):
+# A notes listing that can not be fetched does not stop the meeting, it is returned in the list of errors
+def getMeetingInfos(args, meeting_path, meeting_info, cache_policy='revalidate'):
     # Links to the information and documents to fetch
     meeting_url = meeting_info[-1]
     notes_url = meeting_info[-2]
 
     # Get table of meeting docs
-    docs_table = getDocsTable(args, meeting_url)
+    docs_table = getDocsTable(args, meeting_url, cache_policy)
 
     # Get number of docs in this meeting
     no_docs = len(docs_table) - 1
 
+    # Errors of the infos that could not be fetched
+    errors = []
+
     if notes_url == '':
         notes_links = [None, None]
     else:
-        notes_links = getNotesLinks(args, notes_url)
+        # Without the listing the notes are not fetched (they are on the next run)
+        try:
+            notes_links = getNotesLinks(args, notes_url, cache_policy)
+        except JVETHttp.transferErrors() as e:
+            print(f'        Could not fetch the notes listing {notes_url} ({e})')
+            notes_links = [None, None]
+            errors.append(f'Notes:    {notes_url}    (listing could not be fetched: {e})')
 
     # Print table
     if args.verbose:
+        from tabulate import tabulate
+
         print(meeting_info)
         print(f'Infos for meeting {os.path.basename(meeting_path)} (number of docs: {no_docs}):')
         print(f'    Meeting output directory: {meeting_path}')
@@ -324,7 +734,15 @@ def getMeetingInfos(args, meeting_path, meeting_info):
         if args.pause:
             pause()
 
-    return no_docs, docs_table, notes_links
+    return no_docs, docs_table, notes_links, errors
+
+
+# Download a notes or logistics file if it changed since the last time, a failed download is tried again on the next run
+def downloadNotesFile(url, path):
+    try:
+        JVETHttp.downloadFile(url, path, conditional=True)
+    except JVETHttp.transferErrors() as e:
+        print(f'            Could not fetch {url} ({e})')
 
 
 # Download notes and logistics files
@@ -355,95 +773,1251 @@ def fetchNotesLogistics(notes_urls, meeting_folder):
     elif not notes_urls[0] is None:
         # Notes out file name
         notes_file = notes_file + '-temp' + os.path.splitext(urllib.parse.urlparse(notes_urls[0]).path.split('/')[-1])[-1]
-        # Fetch file to notes_file
-        urllib.request.urlretrieve(notes_urls[0], notes_file)
+        # Fetch file to notes_file (if it changed since the last time)
+        downloadNotesFile(notes_urls[0], notes_file)
 
     if not notes_urls[1] is None:
         # Notes out file name
         logistics_file = os.path.join(meeting_folder, urllib.parse.urlparse(notes_urls[1]).path.split('/')[-1])
-        # Fetch file to logistics_file
-        urllib.request.urlretrieve(notes_urls[1], logistics_file)
+        # Fetch file to logistics_file (if it changed since the last time)
+        downloadNotesFile(notes_urls[1], logistics_file)
 
     return [[notes_urls[0], notes_file], [notes_urls[1], logistics_file]]
 
 
-# Download notes and logistics files
-def fetchZipFiles(docs_table, zip_folder, dir_exists):
-    # Create a list with the zip files location
-    zip_files = []
+# Lock to keep the progress lines of concurrent workers from interleaving
+print_lock = threading.Lock()
 
-    # Docs number
-    no_docs = len(docs_table) - 1
+
+# Thread safe print for messages coming from worker threads
+def printLocked(message):
+    with print_lock:
+        print(message)
+
+
+# Pool of download threads for a with block, leaving the block with an exception (e.g. Ctrl+C) does not wait for the
+# transfers running: stop_event is set so they stop at their next block (partial zip files are kept to be resumed)
+# and the pending ones are dropped
+@contextlib.contextmanager
+def downloadPool(args, stop_event):
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.jobs))
+
+    try:
+        yield executor
+    except BaseException:
+        stop_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+
+    executor.shutdown()
+
+
+# Download a single zip file (runs in a worker thread), returns the file path, size, sha256 and buffer
+# If stream is set the zip is kept in a buffer (spilled to a temporary file over --spillsize MiB) instead of zip_file
+# Setting stop_event stops the download (JVETHttp.TransferStopped is raised)
+def downloadZipFile(args, doc_number, zip_url, zip_file, ix, no_docs, stream=False, stop_event=None):
+    zip_buffer = None
+
+    # The concurrent connections to the host are limited by JVETHttp
+    if stream:
+        # Fetch file to memory
+        zip_buffer, size, sha256 = JVETHttp.downloadToBuffer(urllib.parse.quote(zip_url, safe=':/'), args.spillsize * 2**20,
+                                                             stop_event)
+    else:
+        # Fetch file to zip_file
+        size, sha256 = JVETHttp.downloadFile(urllib.parse.quote(zip_url, safe=':/'), zip_file, stop_event=stop_event)
+
+    # Keep a single copy of the zip file in the document store
+    if args.store and not stream:
+        storeFile(args, zip_file, sha256)
+
+    # Print a message indicating that the download is complete
+    printLocked(f'            [{ix + 1:04} out of {no_docs:04}] Downloading {doc_number} ...    Done!')
+
+    return [zip_file, size, sha256, zip_buffer]
+
+
+# Get the result of a downloadZipFile future, a failed transfer (once its retries are exhausted) does not stop the meeting
+# Returns the result (None if the download failed) and the transfer error (None if it did not fail)
+def getDownloadResult(future, doc_number, ix, no_docs):
+    try:
+        return [future.result(), None]
+    except JVETHttp.transferErrors() as e:
+        printLocked(f'            [{ix + 1:04} out of {no_docs:04}] Downloading {doc_number} ...    Failed! ({e})')
+        return [None, e]
+
+
+# Path of the blob with the given sha256 in the document store
+def getBlobPath(args, sha256):
+    return os.path.join(args.store, sha256[:2], sha256[2:])
+
+
+# Copy src to dst sharing their data blocks (copy-on-write), falls back to a normal copy where not supported
+def reflinkFile(src, dst):
+    try:
+        import fcntl
+
+        with open(src, 'rb') as src_fp, open(dst, 'wb') as dst_fp:
+            # FICLONE ioctl
+            fcntl.ioctl(dst_fp.fileno(), 0x40049409, src_fp.fileno())
+    except (ImportError, OSError):
+        shutil.copyfile(src, dst)
+
+
+# Create dst as a link to src (hardlink or reflink), falls back to a copy if they are on different file systems
+def linkFile(args, src, dst):
+    if args.storelink == 'reflink':
+        reflinkFile(src, dst)
+        return
+
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+# Replace a file with a link to its blob in the document store (the blob is created if it does not exist yet)
+def storeFile(args, path, sha256=None):
+    if sha256 is None:
+        sha256 = hashFile(path)[1]
+
+    blob_path = getBlobPath(args, sha256)
+
+    # Already linked
+    if os.path.exists(blob_path) and os.path.samefile(blob_path, path):
+        return
+
+    if not os.path.exists(blob_path):
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+
+        # New blob made from the file (another process may be adding the same one)
+        tmp_blob_path = f'{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            linkFile(args, path, tmp_blob_path)
+            os.replace(tmp_blob_path, blob_path)
+        finally:
+            if os.path.exists(tmp_blob_path):
+                os.remove(tmp_blob_path)
+
+        # The file and its new blob already share their data (hardlink or reflink), or the blob is a copy (no link
+        # support) and linking the file back to it would only copy it again
+        return
+
+    # Replace the file with a link to the blob
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    linkFile(args, blob_path, tmp_path)
+    os.replace(tmp_path, path)
+
+
+# Store all the files of a directory tree in the document store
+def storeTree(args, directory):
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.isfile(path) and not os.path.islink(path):
+                storeFile(args, path)
+
+
+# Remove the blobs of the document store that are not used by any file of the output directory
+# A blob is used if a file is a hardlink to it, or if a file has the same size and contents (reflinks and copies)
+def collectStoreGarbage(args):
+    store_dir = args.store
+
+    # Blobs by inode and by size
+    blobs_by_inode = {}
+    blobs_by_size = {}
+    for root, dirs, files in os.walk(store_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            blobs_by_inode[(stat.st_dev, stat.st_ino)] = path
+            blobs_by_size.setdefault(stat.st_size, []).append(path)
+
+    print(f'Checking which of the {len(blobs_by_inode)} files of the store are in use...')
+
+    used = set()
+    for root, dirs, files in os.walk(os.path.expanduser(args.outputdir)):
+        # The store may be inside the output directory
+        dirs[:] = [name for name in dirs if os.path.realpath(os.path.join(root, name)) != store_dir]
+
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.islink(path) or not os.path.isfile(path):
+                continue
+
+            stat = os.stat(path)
+            blob_path = blobs_by_inode.get((stat.st_dev, stat.st_ino))
+
+            # Copy or reflink of a blob of the same size, compare the contents
+            if blob_path is None and any(blob not in used for blob in blobs_by_size.get(stat.st_size, [])):
+                blob_path = getBlobPath(args, hashFile(path)[1])
+
+            used.add(blob_path)
+
+    # Remove unused blobs
+    no_removed = 0
+    for blob_path in blobs_by_inode.values():
+        if blob_path not in used:
+            os.remove(blob_path)
+            no_removed += 1
+
+    # Remove empty fan-out directories
+    for name in os.listdir(store_dir):
+        path = os.path.join(store_dir, name)
+        if os.path.isdir(path) and not os.listdir(path):
+            os.rmdir(path)
+
+    print(f'{no_removed} unused file(s) removed from the store.')
+
+
+# Open (and create if needed) the sync manifest of a meeting
+def openSyncManifest(meeting_folder):
+    conn = sqlite3.connect(os.path.join(meeting_folder, '#sync_manifest.sqlite'))
+    conn.row_factory = sqlite3.Row
+
+    # One row per document present in the meeting folder
+    # status is 'extracted', 'bad' (the zip could not be extracted) or 'failed' (the download failed)
+    # Bad and failed documents are downloaded again on the next run
+    conn.execute('''CREATE TABLE IF NOT EXISTS documents (
+                        jvet_number   TEXT PRIMARY KEY,
+                        last_uploaded TEXT,
+                        zip_url       TEXT,
+                        zip_file      TEXT,
+                        size          INTEGER,
+                        sha256        TEXT,
+                        status        TEXT
+                    )''')
+
+    # Hash of the meeting infos last written by each metadata sink
+    conn.execute('''CREATE TABLE IF NOT EXISTS sinks (
+                        name       TEXT PRIMARY KEY,
+                        infos_hash TEXT
+                    )''')
+
+    # Files and folders extracted from the zip file of each document (paths relative to its folder, size NULL for folders)
+    conn.execute('''CREATE TABLE IF NOT EXISTS extracted_files (
+                        jvet_number TEXT,
+                        path        TEXT,
+                        size        INTEGER,
+                        PRIMARY KEY (jvet_number, path)
+                    )''')
+    conn.commit()
+
+    return conn
+
+
+# Get the hash of the meeting infos last written by a metadata sink (None if it never wrote them)
+def readSinkHash(conn, sink):
+    row = conn.execute('SELECT infos_hash FROM sinks WHERE name = ?', [sink]).fetchone()
+
+    return row['infos_hash'] if row is not None else None
+
+
+# Record the hash of the meeting infos written by a metadata sink
+def writeSinkHash(conn, sink, infos_hash):
+    conn.execute('INSERT OR REPLACE INTO sinks VALUES (?, ?)', [sink, infos_hash])
+    conn.commit()
+
+
+# Read the sync manifest into a dictionary indexed by JVET number
+def readSyncManifest(conn):
+    return {row['jvet_number']: dict(row) for row in conn.execute('SELECT * FROM documents')}
+
+
+# Add or replace the sync manifest entry of a document
+def writeSyncManifestEntry(conn, doc, zip_file, size, sha256, status):
+    conn.execute('INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)',
+                 [doc[0], doc[4], doc[2], zip_file, size, sha256, status])
+    conn.commit()
+
+
+# Replace the list of files extracted for a document
+def writeExtractedFiles(conn, doc_number, files):
+    conn.execute('DELETE FROM extracted_files WHERE jvet_number = ?', [doc_number])
+    conn.executemany('INSERT OR REPLACE INTO extracted_files VALUES (?, ?, ?)', [[doc_number, path, size] for path, size in files])
+    conn.commit()
+
+
+# Remove the documents that are in the sync manifest but not in the docs table (withdrawn)
+def removeWithdrawnDocs(conn, docs_table, meeting_folder, zip_folder):
+    current_docs = set(doc[0] for doc in docs_table[1:])
+
+    for doc_number, entry in readSyncManifest(conn).items():
+        if doc_number in current_docs:
+            continue
+
+        print(f'            Removing withdrawn {doc_number}')
+
+        # Remove extracted folder and zip file
+        extract_dir = os.path.join(meeting_folder, doc_number)
+        if os.path.isdir(extract_dir):
+            shutil.rmtree(extract_dir)
+        if entry['zip_file'] and os.path.isfile(os.path.join(zip_folder, entry['zip_file'])):
+            os.remove(os.path.join(zip_folder, entry['zip_file']))
+
+        conn.execute('DELETE FROM documents WHERE jvet_number = ?', [doc_number])
+        conn.execute('DELETE FROM extracted_files WHERE jvet_number = ?', [doc_number])
+
+    conn.commit()
+
+
+# Get the error list of a meeting from its sync manifest (sorted as the docs table)
+# Zip files that could not be extracted and, marked as such, the failed downloads
+def getSyncManifestErrors(conn, docs_table, zip_folder):
+    manifest = readSyncManifest(conn)
+
+    return [f'{doc[0]}:    {os.path.join(zip_folder, manifest[doc[0]]["zip_file"])}'
+            + ('    (download failed)' if manifest[doc[0]]['status'] == 'failed' else '') for doc in docs_table[1:]
+            if doc[0] in manifest and manifest[doc[0]]['status'] in ('bad', 'failed')]
+
+
+# Compute the size and sha256 of a file
+def hashFile(path):
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as fp:
+        while chunk := fp.read(1024 * 1024):
+            digest.update(chunk)
+
+    return [os.path.getsize(path), digest.hexdigest()]
+
+
+# Check which zip files need to be downloaded (new or changed since the last sync) and remove their old versions
+# Up to date files from runs without a sync manifest are added to it instead of being downloaded again
+def planZipDownloads(docs_table, zip_folder, meeting_folder, conn):
+    # List of [index, doc number, zip url, zip file] to download
+    downloads = []
+
+    manifest = readSyncManifest(conn)
 
     # Loop docs_table
     for zip_link, ix in zip(docs_table[1:], range(len(docs_table[1:]))):
         # zip out file name
         zip_file = os.path.join(zip_folder, urllib.parse.urlparse(zip_link[2]).path.split('/')[-1])
-        
-        # If meeting directory already exists
-        if dir_exists:
-            # List old versions of the current file (if they exist, return empty list if it does not)
-            old_zip_file = glob.glob(os.path.join(zip_folder, zip_link[0] + '*'))
-
-            # If file to download already exists its skipped
-            if os.path.isfile(zip_file):
-                # Set current file as None so it can be checked during extraction
-                zip_files.append(None)
+        # Extraction target directory
+        extract_dir = os.path.join(meeting_folder, zip_link[0])
+
+        entry = manifest.get(zip_link[0])
+
+        # Skip documents that did not change since the last sync (bad zip files may have been truncated in transit and
+        # failed downloads may work now, both are downloaded again)
+        if entry is not None:
+            if entry['last_uploaded'] == zip_link[4] and entry['zip_url'] == zip_link[2] and entry['status'] == 'extracted' \
+               and os.path.isdir(extract_dir):
                 continue
-            # If there is a different version of the file to download the file is removed
-            elif old_zip_file:
-                os.remove(old_zip_file[0])
+        # Files downloaded and extracted before the sync manifest existed are kept (unless truncated)
+        elif os.path.isfile(zip_file) and os.path.isdir(extract_dir) and zipfile.is_zipfile(zip_file):
+            writeSyncManifestEntry(conn, zip_link, os.path.basename(zip_file), *hashFile(zip_file), 'extracted')
+            continue
 
-        print(f'            [{ix + 1:04} out of {no_docs:04}] Downloading {zip_link[0]} ...', end='')
-        # Fetch file to notes_file
-        urllib.request.urlretrieve(urllib.parse.quote(zip_link[2], safe=':/'), zip_file)
-        # Print a message indicating that the extraction is complete
-        print('    Done!')
+        # If there are different versions of the file to download they are removed
+        # The partial download of the current version (and its validators) is kept so it can be resumed
+        for old_zip_file in glob.glob(os.path.join(zip_folder, zip_link[0] + '*')):
+            if old_zip_file not in (zip_file + '.part', zip_file + '.part.meta'):
+                os.remove(old_zip_file)
 
-        # Append file to list
-        zip_files.append(zip_file)
+        downloads.append([ix, zip_link[0], zip_link[2], zip_file])
 
-    return zip_files
+    return downloads
 
 
-# Extract all meeting files
-def extractZipFiles(args, docs_table, zip_files, meeting_folder, dir_exists):
-    # Create an error list for files that can't be extracted
-    errorlist = []
+# Split a doc number in its prefix and number (e.g. JVET-AB0123 in JVET-AB and 123)
+def splitDocNumber(doc_number):
+    match = re.match(r'^(.*?)(\d+)$', doc_number.strip())
+
+    if match is None:
+        raise ValueError(f'Invalid doc number: {doc_number}')
+
+    return [match.group(1), int(match.group(2))]
+
+
+# Get the doc ranges given with --priority and --watchlist as [prefix, first number, last number]
+# Single doc numbers are ranges of one doc, the watchlist is read again for each meeting so it can be edited while watching
+def getPriorityRanges(args):
+    items = args.priority.split(',') if args.priority else []
+
+    if args.watchlist:
+        with open(os.path.expanduser(args.watchlist)) as fp:
+            items += [line.split('#')[0] for line in fp]
+
+    ranges = []
+    for item in [item.strip() for item in items if item.strip()]:
+        first, last = [splitDocNumber(doc_number) for doc_number in (item.split(':') if ':' in item else [item, item])]
+
+        if first[0] != last[0]:
+            raise ValueError(f'Invalid doc range: {item}')
+
+        ranges.append([first[0], min(first[1], last[1]), max(first[1], last[1])])
+
+    return ranges
+
+
+# Check if a doc number is in one of the priority ranges
+def isPriorityDoc(doc_number, ranges):
+    try:
+        prefix, number = splitDocNumber(doc_number)
+    except ValueError:
+        return False
+
+    return any(prefix == range_prefix and first <= number <= last for range_prefix, first, last in ranges)
+
+
+# Get the size of the zip files to download as {ix: bytes}
+# Revised docs take the size of their previous version from the sync manifest, the others are asked with HEAD requests
+# Sizes the server does not tell are None
+def getDownloadSizes(args, downloads, conn):
+    manifest = readSyncManifest(conn)
+    sizes = {ix: (manifest.get(doc_number) or {}).get('size') for ix, doc_number, zip_url, zip_file in downloads}
+
+    # Set to stop the requests running if the sizing is interrupted
+    stop_event = threading.Event()
+
+    # Size of a zip file from a HEAD request (None if the request fails, the download itself reports it)
+    def fetchSize(zip_url):
+        try:
+            return JVETHttp.fetchSize(zip_url, stop_event)
+        except JVETHttp.transferErrors():
+            return None
+
+    unknown = [[ix, zip_url] for ix, doc_number, zip_url, zip_file in downloads if sizes[ix] is None]
+
+    if unknown:
+        with downloadPool(args, stop_event) as executor:
+            for [ix, zip_url], size in zip(unknown, executor.map(fetchSize, [zip_url for ix, zip_url in unknown])):
+                sizes[ix] = size
+
+    return sizes
+
+
+# Sort the downloads of a meeting with --order, the docs given with --priority or --watchlist go first
+# Downloads of unknown size are taken as the largest ones
+# Balanced interleaves the largest and the smallest downloads: the large ones start early (they do not end up
+# as a long tail with the other workers idle) while the small ones keep flowing on the rest of the workers
+def scheduleZipDownloads(args, downloads, conn):
+    ranges = getPriorityRanges(args)
+
+    if args.order == 'table' and not ranges:
+        return downloads
+
+    sizes = getDownloadSizes(args, downloads, conn) if args.order != 'table' else {}
+
+    # Size of a download for sorting
+    def getSize(download):
+        size = sizes.get(download[0])
+        return float('inf') if size is None else size
+
+    # Sort a group of downloads with --order
+    def sortDownloads(group):
+        if args.order == 'small':
+            return sorted(group, key=getSize)
+        if args.order == 'large':
+            return sorted(group, key=getSize, reverse=True)
+        if args.order == 'balanced':
+            group = sorted(group, key=getSize)
+            small, large = group[:(len(group) + 1) // 2], group[(len(group) + 1) // 2:][::-1]
+            return [download for pair in itertools.zip_longest(large, small) for download in pair if download is not None]
+        return group
+
+    priority = [download for download in downloads if isPriorityDoc(download[1], ranges)]
+    others = [download for download in downloads if not isPriorityDoc(download[1], ranges)]
+
+    if downloads:
+        known = [size for size in sizes.values() if size is not None]
+        print(f'            Scheduling {len(downloads)} downloads ({args.order} order, {len(priority)} prioritized'
+              + (f', {sum(known) / 2**20:.1f} MiB in {len(known)} known sizes' if args.order != 'table' else '') + ')')
+
+    return sortDownloads(priority) + sortDownloads(others)
+
+
+# Path where zipfile extracts a member inside extract_dir (same sanitizing as ZipFile.extract)
+def getMemberPath(member, extract_dir):
+    arcname = member.filename.replace('/', os.path.sep)
+
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    # Remove drive letters, leading separators and '.' or '..' components
+    arcname = os.path.splitdrive(arcname)[1]
+    arcname = os.path.sep.join(part for part in arcname.split(os.path.sep) if part not in ('', os.path.curdir, os.path.pardir))
+
+    if os.path.sep == '\\':
+        arcname = zipfile.ZipFile._sanitize_windows_name(arcname, os.path.sep)
+
+    return os.path.join(extract_dir, arcname)
+
+
+# Compute the CRC32 of a file
+def crc32File(path):
+    crc = 0
+
+    with open(path, 'rb') as fp:
+        while chunk := fp.read(1024 * 1024):
+            crc = zlib.crc32(chunk, crc)
+
+    return crc
+
+
+# Remove whatever is at path or at one of its parent folders inside extract_dir and is not of the type expected there
+# (a file or link where a folder goes, or a folder where a file goes), as left by an older version of the doc
+def clearMemberPath(path, extract_dir, is_dir):
+    parent = extract_dir
+    for part in os.path.relpath(os.path.dirname(path), extract_dir).split(os.path.sep):
+        parent = os.path.join(parent, part)
+        if part != os.path.curdir and os.path.lexists(parent) and (os.path.islink(parent) or not os.path.isdir(parent)):
+            os.remove(parent)
+
+    if not os.path.lexists(path):
+        return
+
+    if os.path.isdir(path) and not os.path.islink(path):
+        if not is_dir:
+            shutil.rmtree(path)
+    elif is_dir:
+        os.remove(path)
+
+
+# Update extract_dir (with an older version of the doc) to the contents of archive writing only what changed
+# Members are compared by size and CRC32 with the files on disk, files that are not in the archive are deleted
+# Returns the number of written, removed and unchanged files and the number of bytes written
+def extractZipDelta(args, archive, extract_dir):
+    no_written = 0
+    no_written_bytes = 0
+    no_removed = 0
+    no_unchanged = 0
+
+    # Paths of the archive members
+    member_paths = set()
+    dir_paths = set()
+
+    for member in archive.infolist():
+        path = getMemberPath(member, extract_dir)
+
+        # Files of the older version in the way of the member (e.g. a file that is now a folder)
+        clearMemberPath(path, extract_dir, member.is_dir())
+
+        if member.is_dir():
+            dir_paths.add(path)
+            os.makedirs(path, exist_ok=True)
+            continue
+
+        member_paths.add(path)
+
+        # Unchanged member
+        if os.path.isfile(path) and os.path.getsize(path) == member.file_size and crc32File(path) == member.CRC:
+            no_unchanged += 1
+            continue
+
+        # Remove the old file first, it may be a link shared with other files (document store)
+        if os.path.lexists(path):
+            os.remove(path)
+
+        archive.extract(member, path=extract_dir)
+        no_written += 1
+        no_written_bytes += member.file_size
+
+        # Keep a single copy of each extracted file in the document store
+        if args.store:
+            storeFile(args, path)
+
+    # Remove the files that are no longer in the archive, and then the directories left empty
+    for root, dirs, files in os.walk(extract_dir, topdown=False):
+        for name in files:
+            path = os.path.join(root, name)
+            if path not in member_paths:
+                os.remove(path)
+                no_removed += 1
+
+        if root != extract_dir and root not in dir_paths and not os.listdir(root):
+            os.rmdir(root)
+
+    return [no_written, no_removed, no_unchanged, no_written_bytes]
+
+
+# Paths (relative to extract_dir, with / separators) and sizes of archive members (size None for folders)
+def getMemberList(infos, extract_dir):
+    members = []
+
+    for info in infos:
+        path = os.path.relpath(getMemberPath(info, extract_dir), extract_dir)
+        if path != os.path.curdir:
+            members.append([path.replace(os.path.sep, '/'), None if info.is_dir() else info.file_size])
+
+    return members
+
+
+# Prepare the folder a doc is extracted to, returns whether it is updated with a delta extraction
+# With the delta option an existing doc folder (older version of the doc) is updated, otherwise it is removed
+def prepareExtractDir(args, extract_dir):
+    delta = args.delta and os.path.isdir(extract_dir)
+
+    if os.path.exists(extract_dir) and not delta:
+        shutil.rmtree(extract_dir)
+
+    return delta
+
+
+# Extract an archive (path, file object or bytes) to extract_dir
+# Returns the details for the progress message, the number of bytes extracted, the time it took and the members extracted
+# Also runs in the extraction worker processes, members restricts the extraction to these member indices (a chunk of a large zip)
+def extractArchive(args, source, extract_dir, delta=False, members=None):
+    start = time.perf_counter()
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    with zipfile.ZipFile(source, 'r') as archive:
+        if delta:
+            # Update the existing doc folder
+            no_written, no_removed, no_unchanged, no_bytes = extractZipDelta(args, archive, extract_dir)
+            return [f' ({no_written} written, {no_removed} removed, {no_unchanged} unchanged)', no_bytes, time.perf_counter() - start,
+                    getMemberList(archive.infolist(), extract_dir)]
+
+        if members is None:
+            # Extract all contents of the zip file to a directory with the doc number name
+            archive.extractall(path=extract_dir)
+            infos = archive.infolist()
+            no_bytes = sum(info.file_size for info in infos)
+            # Keep a single copy of each extracted file in the document store
+            if args.store:
+                storeTree(args, extract_dir)
+        else:
+            infos = [archive.infolist()[index] for index in members]
+            no_bytes = 0
+            for info in infos:
+                path = archive.extract(info, path=extract_dir)
+                no_bytes += info.file_size
+                if args.store and not info.is_dir():
+                    storeFile(args, path)
+
+    return ['', no_bytes, time.perf_counter() - start, getMemberList(infos, extract_dir)]
+
+
+# Run func in this process, returns a finished future holding its result or exception
+def runInline(func, *func_args):
+    future = concurrent.futures.Future()
+
+    try:
+        future.set_result(func(*func_args))
+    except Exception as e:
+        future.set_exception(e)
+
+    return future
+
+
+# Split the members of a zip file in up to no_chunks chunks of similar uncompressed size, returns lists of member indices
+# The directories of all members are created beforehand so the processes extracting the chunks never race to create them
+def splitZipMembers(zip_file, extract_dir, no_chunks):
+    with zipfile.ZipFile(zip_file, 'r') as archive:
+        infos = archive.infolist()
+
+    for info in infos:
+        path = getMemberPath(info, extract_dir)
+        os.makedirs(path if info.is_dir() else os.path.dirname(path), exist_ok=True)
+
+    # Largest members first, each one to the chunk with the fewest bytes so far
+    chunks = [[0, []] for _ in range(no_chunks)]
+    for index in sorted(range(len(infos)), key=lambda index: infos[index].file_size, reverse=True):
+        chunk = min(chunks, key=lambda chunk: chunk[0])
+        chunk[0] += infos[index].file_size
+        chunk[1].append(index)
+
+    return [sorted(members) for size, members in chunks if members]
 
+
+# Start the extraction of a zip file in the pool of extraction processes (in this process if executor is None)
+# Zip files over --splitsize MiB are split in chunks of members extracted by several processes at once
+# Streamed zip files are sent to the workers as bytes, those spilled to disk are extracted in this process
+# Returns the futures of the extraction (the first one holds the details for the progress message)
+def submitZipExtraction(args, executor, curr_doc, zip_file, meeting_folder, zip_buffer=None, size=None):
+    # Extraction target directory
+    extract_dir = os.path.join(meeting_folder, curr_doc)
+    delta = prepareExtractDir(args, extract_dir)
+
+    if zip_buffer is not None:
+        try:
+            if executor is None or size > args.spillsize * 2**20:
+                return [runInline(extractArchive, args, zip_buffer, extract_dir, delta)]
+            return [executor.submit(extractArchive, args, zip_buffer.read(), extract_dir, delta)]
+        finally:
+            zip_buffer.close()
+
+    if executor is None:
+        return [runInline(extractArchive, args, zip_file, extract_dir, delta)]
+
+    # Large zip files are extracted in parts (a delta extraction needs the whole archive)
+    if not delta and os.path.getsize(zip_file) > args.splitsize * 2**20:
+        try:
+            chunks = splitZipMembers(zip_file, extract_dir, args.extractjobs)
+        except zipfile.BadZipfile as e:
+            future = concurrent.futures.Future()
+            future.set_exception(e)
+            return [future]
+
+        if len(chunks) > 1:
+            return [executor.submit(extractArchive, args, zip_file, extract_dir, False, members) for members in chunks]
+
+    return [executor.submit(extractArchive, args, zip_file, extract_dir, delta)]
+
+
+# Wait for the extraction of a zip file started by submitZipExtraction
+# Returns an error entry if it fails (None otherwise), the progress message (None on error) and the members extracted
+# Zip files that can not be read (bad, with members compressed with an unsupported method such as deflate64, encrypted or
+# with corrupt compressed data) fail only their doc
+def finishZipExtraction(args, curr_doc, zip_file, futures, ix, no_docs, streamed=False):
+    error = None
+    message = None
+    files = []
+
+    # Wait for all the parts even if one fails, so none is still writing
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except (zipfile.BadZipfile, NotImplementedError, RuntimeError, zlib.error, EOFError):
+            error = f'{curr_doc}:    {zip_file}'
+
+    for details, no_bytes, seconds, members in results:
+        JVETStats.count('extracted_bytes', no_bytes)
+        JVETStats.count('extract_seconds', seconds)
+        files += members
+
+    if error is None:
+        details = results[0][0] if len(futures) == 1 else f' (in {len(futures)} parts)'
+        message = f'            [{ix + 1:04} out of {no_docs:04}] Extracting {curr_doc} ...    Done!{details}'
+
+    # Remove zip files if option is set
+    if args.rmzip and not streamed:
+        os.remove(zip_file)
+
+    return [error, message, files]
+
+
+# Pool of processes extracting zip files (None to extract them in this process)
+# The processes are started with spawn, forking the crawler while its download threads run is not safe
+def getExtractionPool(args):
+    if args.extractjobs > 1:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=args.extractjobs, mp_context=multiprocessing.get_context('spawn'))
+
+    return None
+
+
+# Download and extract all new or changed meeting files, each archive is extracted as soon as its download finishes
+# The sync manifest is updated after each extraction
+def fetchAndExtractZipFiles(args, docs_table, zip_folder, meeting_folder, conn):
     # Docs number
     no_docs = len(docs_table) - 1
 
-    # Loop docs_table
-    for curr_doc, zip_file, ix in zip(docs_table[1:], zip_files, range(len(docs_table[1:]))):
-        curr_doc = curr_doc[0]
+    # Get the files that actually need to be downloaded
+    downloads = scheduleZipDownloads(args, planZipDownloads(docs_table, zip_folder, meeting_folder, conn), conn)
 
-        # Check if file is None (meaning it was already present and extracted)
-        if zip_file is None:
-            continue
+    # Name of the meeting for the progress reports
+    meeting_name = os.path.basename(meeting_folder)
 
-        # Extraction target directory
-        extract_dir = os.path.join(meeting_folder, curr_doc)
+    # Bounded queue between the download (producer) and the extraction (consumer) stages
+    extract_queue = queue.Queue(maxsize=max(1, 2 * args.jobs))
+    # Set when the consumer stops early (or the user interrupts) so the downloads running stop and no more files are queued
+    stop_event = threading.Event()
+    # Exception raised while downloading (re-raised once the pipeline is stopped)
+    download_error = []
 
-        # If meeting directory exists and doc folder exists the former is removed
-        if dir_exists and os.path.exists(extract_dir):
-            shutil.rmtree(extract_dir)
+    # Producer: download the files with a bounded pool of workers and queue them as they finish
+    # Queued items are [ix, result, failure], failed downloads are queued too so the consumer records them
+    def produce():
+        try:
+            with downloadPool(args, stop_event) as executor:
+                futures = {executor.submit(downloadZipFile, args, doc_number, zip_url, zip_file, ix, no_docs, args.stream, stop_event): ix
+                           for ix, doc_number, zip_url, zip_file in downloads}
+
+                try:
+                    for no_downloaded, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                        if stop_event.is_set():
+                            break
+                        ix = futures[future]
+                        extract_queue.put([ix] + getDownloadResult(future, docs_table[ix + 1][0], ix, no_docs))
+                        reportProgress(meeting_name, 'downloaded', no_downloaded, len(downloads))
+                finally:
+                    # Do not start pending downloads once the loop is left
+                    for future in futures:
+                        future.cancel()
+        except BaseException as e:
+            download_error.append(e)
+        finally:
+            # Signal the end of the downloads
+            extract_queue.put(None)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    # Consumer: extract the files in the order they were downloaded, in a pool of processes with --extractjobs
+    # Errors are kept with their doc index so the list follows the docs table order
+    errorlist = []
+    no_extracted = 0
+    executor = getExtractionPool(args)
+    # Archives being extracted as {ix: [zip_file, size, sha256, streamed, futures]}, at most two per extraction job
+    extracting = {}
+    max_extracting = 2 * max(1, args.extractjobs)
+    # Progress messages are printed in the docs table order, waiting for the ones of the docs before them
+    messages = {}
+    message_order = sorted(ix for ix, doc_number, zip_url, zip_file in downloads)
+    # Zip file of each download, for the manifest entries of the failed ones
+    downloads_by_ix = {ix: zip_file for ix, doc_number, zip_url, zip_file in downloads}
+    no_printed = 0
+    producing = True
+    try:
+        while producing or extracting:
+            if producing and len(extracting) < max_extracting:
+                # Start the extraction of the next downloaded file
+                try:
+                    item = extract_queue.get(timeout=0.05 if extracting else None)
+                except queue.Empty:
+                    item = False
+
+                if item is None:
+                    producing = False
+                elif item and item[2] is not None:
+                    # Failed download, retried on the next run
+                    ix = item[0]
+                    writeSyncManifestEntry(conn, docs_table[ix + 1], os.path.basename(downloads_by_ix[ix]), None, None, 'failed')
+                    messages[ix] = None
+                    no_extracted += 1
+                    reportProgress(meeting_name, 'extracted', no_extracted, len(downloads))
+                elif item:
+                    ix, [zip_file, size, sha256, zip_buffer], failure = item
+                    extracting[ix] = [zip_file, size, sha256, zip_buffer is not None,
+                                      submitZipExtraction(args, executor, docs_table[ix + 1][0], zip_file, meeting_folder, zip_buffer, size)]
+            else:
+                # Wait for an extraction to finish
+                concurrent.futures.wait([future for entry in extracting.values() for future in entry[4]], timeout=0.05,
+                                        return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for ix in [ix for ix, entry in extracting.items() if all(future.done() for future in entry[4])]:
+                zip_file, size, sha256, streamed, futures = extracting.pop(ix)
+
+                error, messages[ix], files = finishZipExtraction(args, docs_table[ix + 1][0], zip_file, futures, ix, no_docs, streamed)
+
+                if error is not None:
+                    errorlist.append([ix, error])
+
+                # Record the document as synced with the files extracted
+                writeSyncManifestEntry(conn, docs_table[ix + 1], os.path.basename(zip_file), size, sha256,
+                                       'extracted' if error is None else 'bad')
+                writeExtractedFiles(conn, docs_table[ix + 1][0], files if error is None else [])
+
+                no_extracted += 1
+                reportProgress(meeting_name, 'extracted', no_extracted, len(downloads))
+
+            # Print the messages of the docs whose previous docs are done
+            while no_printed < len(message_order) and message_order[no_printed] in messages:
+                message = messages.pop(message_order[no_printed])
+                if message is not None:
+                    printLocked(message)
+                no_printed += 1
+    except BaseException:
+        stop_event.set()
+        # Keep emptying the queue so the producer never blocks while finishing
+        while producer.is_alive() or not extract_queue.empty():
+            try:
+                item = extract_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            # Release the buffers of downloaded files that will not be extracted
+            if item is not None and item[1] is not None and item[1][3] is not None:
+                item[1][3].close()
+        raise
+    finally:
+        # Wait for the extractions already running, the pending ones are dropped
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    producer.join()
+
+    if download_error:
+        raise download_error[0]
+
+    return [error for ix, error in sorted(errorlist)]
+
+
+# Get the cache policy of the pages of a meeting
+# Pages of closed meetings (started more than activedays ago and not the last one) do not change and are cached forever
+def getMeetingCachePolicy(args, meeting_row, meeting_info_table):
+    if meeting_row == meeting_info_table[-1]:
+        return 'revalidate'
+
+    try:
+        start_date = datetime.date.fromisoformat(meeting_row[2].strip())
+    except ValueError:
+        return 'revalidate'
+
+    if (datetime.date.today() - start_date).days > args.activedays:
+        return 'forever'
+
+    return 'revalidate'
+
+
+# Name of the folder of a meeting (YYYY_MM_L_CITY)
+def getMeetingName(meeting_row):
+    # Meeting name YYYY_MM_L_CITY
+    return f"{meeting_row[2].split('-')[0]}_{meeting_row[2].split('-')[1]}_{meeting_row[4]}_{meeting_row[1].replace(' ', '_')}"
+    # NR_L_CITY_YYYY_MM
+    # return f"{int(meeting_row[0]):03}_{meeting_row[4]}_{meeting_row[1].replace(' ', '_')}_{meeting_row[2].split('-')[0]}_{meeting_row[2].split('-')[1]}"
+
+
+# Sync a single meeting (docs + notes), returns a summary with the meeting name, number of docs and errors
+# If the meeting page can not be fetched the meeting is marked as failed in the summary (it is synced on the next run)
+def processMeeting(args, meeting_row, meeting_info_table, ix, no_meetings):
+    # Check flag for folder
+    dir_exists = False
+    # Meeting name YYYY_MM_L_CITY
+    meeting_name = getMeetingName(meeting_row)
+
+    # Defines the folder name in the format: YYYY_MM_L_CITY
+    meeting_folder = os.path.expanduser(os.path.join(args.outputdir, meeting_name))
+
+    # If the corresponding folder already exists only the new or changed documents are synced
+    # If the force option is activated the current meeting operations are performed form scratch
+    if os.path.exists(meeting_folder):
+        if args.force:
+            shutil.rmtree(meeting_folder)
+        else:
+            dir_exists = True
+
+    print(f'    [{ix + 1:03} out of {no_meetings:03}] Working on meeting {meeting_name}...')
+
+    # Create directory for meeting
+    if not dir_exists:
+        os.mkdir(meeting_folder)
+
+    # Open the meeting sync manifest
+    manifest_conn = openSyncManifest(meeting_folder)
+
+    # Get current meeting table
+    print('        Fetching meeting infos...')
+    reportProgress(meeting_name, 'infos')
+    JVETStats.startStage(meeting_name, 'infos')
+    try:
+        no_docs, docs_table, notes_links, infos_errors = getMeetingInfos(args, meeting_folder, meeting_row,
+                                                                         getMeetingCachePolicy(args, meeting_row, meeting_info_table))
+    except JVETHttp.transferErrors() as e:
+        print(f'        Could not fetch the meeting page {meeting_row[-1]} ({e})\n')
+        JVETStats.stopStage()
+        manifest_conn.close()
+
+        print(f'    [{ix + 1:03} out of {no_meetings:03}] Failed meeting {meeting_name}!\n')
+
+        return {'meeting': meeting_name, 'docs': 0, 'failed': True,
+                'errors': [f'Meeting page:    {meeting_row[-1]}    (could not be fetched: {e})']}
+    print('        Meeting infos fetched!\n')
+
+    # Download and unzip zip files
+    print('        Fetching and extracting doc zip files...')
+    JVETStats.startStage(meeting_name, 'zips')
+    # Create zip directory if it does not exist (not needed when streaming)
+    zip_dir = os.path.join(meeting_folder, args.zipdir)
+    if not os.path.exists(zip_dir) and not args.stream:
+        os.mkdir(zip_dir)
+    # Remove the documents that were withdrawn since the last sync
+    removeWithdrawnDocs(manifest_conn, docs_table, meeting_folder, zip_dir)
+    fetchAndExtractZipFiles(args, docs_table, zip_dir, meeting_folder, manifest_conn)
+    # Remove zip files directory if option is set
+    if args.rmzip and os.path.isdir(zip_dir):
+        shutil.rmtree(zip_dir)
+    print('        Zip files fetched and extracted!\n')
+
+    # Infos of the meeting that could not be fetched and files that could not be extracted (in this or previous syncs)
+    error_list = infos_errors + getSyncManifestErrors(manifest_conn, docs_table, zip_dir)
+
+    # Error file path
+    error_file = os.path.join(meeting_folder, '#extraction_error_list.txt')
+
+    # If there were errors during the extraction
+    if len(error_list) > 0:
+
+        # Save list to file
+        with open(error_file, 'w') as fp:
+            for error in error_list:
+                fp.write(f'{error}\n')
+
+        # Information messages
+        print(f'{len(error_list)} file(s) could not be downloaded or extracted.')
+        print(f'A file with details was saved to: {error_file}.\n')
+    # Remove outdated error file
+    elif os.path.exists(error_file):
+        os.remove(error_file)
+
+    # Download notes and logistics files
+    print('        Fetching notes and logistics files...')
+    reportProgress(meeting_name, 'notes')
+    JVETStats.startStage(meeting_name, 'notes')
+    notes_links = fetchNotesLogistics(notes_links, meeting_folder)
+    print('        Files fetched!\n')
+
+    # Save infos to xls and the other selected formats (only if they changed)
+    if getSinks(args):
+        print('        Saving meeting infos...')
+        JVETStats.startStage(meeting_name, 'sinks')
+        saveMeetingInfos(args, manifest_conn, meeting_folder, no_docs, docs_table, notes_links)
+        print('        Meeting infos saved!\n')
+
+    JVETStats.stopStage()
+    manifest_conn.close()
+
+    print(f'    [{ix + 1:03} out of {no_meetings:03}] Finished meeting {meeting_name}!\n')
+
+    # The docs table is kept for the files manifest, written by saveMeetingFilesManifest once every file is written
+    return {'meeting': meeting_name, 'docs': no_docs, 'failed': False, 'errors': error_list, 'docs_table': docs_table}
+
+
+# Write the manifest of the files of a meeting synced by processMeeting for the finder (a stage of its own, it walks the
+# meeting folder), to be called once every file of the meeting is written (the log of the worker processes included)
+# The docs table is taken out of the summary
+def saveMeetingFilesManifest(args, summary):
+    docs_table = summary.pop('docs_table', None)
+    if docs_table is None:
+        return
+
+    meeting_folder = os.path.expanduser(os.path.join(args.outputdir, summary['meeting']))
+
+    JVETStats.startStage(summary['meeting'], 'files_manifest')
+    with contextlib.closing(openSyncManifest(meeting_folder)) as conn:
+        saveFilesManifest(conn, meeting_folder, docs_table)
+    touchFilesManifest(meeting_folder)
+    JVETStats.stopStage()
+
+
+# Queue where meeting worker processes report their progress (None when meetings are processed in this process)
+progress_queue = None
+
+
+# Report the progress of a meeting stage to the main process (done out of total items, if it has items)
+def reportProgress(meeting_name, stage, done=None, total=None):
+    if progress_queue is not None:
+        progress_queue.put([meeting_name, stage, done, total])
+
+
+# Initialize a meeting worker process
+def initMeetingWorker(args, network_slots, progress):
+    global progress_queue
+
+    progress_queue = progress
+
+    # Each process has its own session and cache handle, the network slots are shared by all
+    JVETHttp.initSession(args.jobs, args.timeout, args.retries, args.backoff)
+    JVETHttp.initCache(args.cachedir if args.cache else None)
+    JVETHttp.initNetworkSlots(network_slots)
+
+
+# Sync a meeting in a worker process, the detailed output goes to the #crawler_log.txt file of the meeting
+# The log is also written if the meeting fails (with the error that stopped it), the status reported is then 'failed'
+# The counters of the meeting stages are sent back with its summary
+def processMeetingWorker(args, meeting_row, meeting_info_table, ix, no_meetings):
+    log = io.StringIO()
+    summary = None
+
+    # Same folder as processMeeting
+    meeting_name = getMeetingName(meeting_row)
+    meeting_folder = os.path.expanduser(os.path.join(args.outputdir, meeting_name))
+
+    try:
+        with contextlib.redirect_stdout(log):
+            try:
+                summary = processMeeting(args, meeting_row, meeting_info_table, ix, no_meetings)
+            except BaseException:
+                traceback.print_exc(file=log)
+                raise
+    finally:
+        os.makedirs(meeting_folder, exist_ok=True)
+        with open(os.path.join(meeting_folder, '#crawler_log.txt'), 'w') as fp:
+            fp.write(log.getvalue())
+        if summary is None:
+            reportProgress(meeting_name, 'failed')
+
+    # After the log, so the files manifest lists it
+    saveMeetingFilesManifest(args, summary)
+    summary['stats'] = JVETStats.popMeetingStats(summary['meeting'])
+    reportProgress(meeting_name, 'done')
+
+    return summary
+
+
+# Print a status line with the progress of the meetings being processed
+def printMeetingsStatus(status, no_finished, no_meetings):
+    active = [f'{meeting} ({stage}{f" {done}/{total}" if total else ""})'
+              for meeting, [stage, done, total] in status.items() if stage not in ('done', 'failed')]
+
+    print(f'    [{no_finished:03} out of {no_meetings:03} done] ' + (', '.join(active) if active else '...'))
+
+
+# Sync several meetings at once in worker processes, returns their summaries in table order
+def processMeetingsParallel(args, meeting_rows, meeting_info_table):
+    no_meetings = len(meeting_rows)
+    summaries = [None] * no_meetings
+
+    # Cap of the concurrent requests of all the workers together
+    network_slots = multiprocessing.BoundedSemaphore(max(1, args.netjobs))
+    progress = multiprocessing.Queue()
+
+    # Progress of each meeting as [stage, done, total]
+    status = {}
+    last_status = 0
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.meetingjobs, initializer=initMeetingWorker,
+                                                initargs=(args, network_slots, progress)) as executor:
+        futures = {executor.submit(processMeetingWorker, args, meeting_row, meeting_info_table, ix, no_meetings): ix
+                   for meeting_row, ix in zip(meeting_rows, range(no_meetings))}
+        pending = set(futures)
 
         try:
-            with zipfile.ZipFile(zip_file, 'r') as archive:
-                print(f'            [{ix + 1:04} out of {no_docs:04}] Extracting {curr_doc} ...', end='')
-                # Extract all contents of the zip file to a directory with the doc number name
-                archive.extractall(path=extract_dir)
-                # Print a message indicating that the extraction is complete
-                print('    Done!')
-        except zipfile.BadZipfile:
-            errorlist.append(f'{curr_doc}:    {zip_file}')
-        
-        # Remove zip files if option is set
-        if args.rmzip == 'yes':
-            os.remove(zip_file)
-    
-    return errorlist
+            while pending:
+                done, pending = concurrent.futures.wait(pending, timeout=1)
+
+                # Collect progress reports
+                while True:
+                    try:
+                        meeting, stage, done_items, total_items = progress.get_nowait()
+                    except queue.Empty:
+                        break
+
+                    if meeting not in status:
+                        print(f'    Working on meeting {meeting}...')
+                    status[meeting] = [stage, done_items, total_items]
+
+                for future in done:
+                    summary = future.result()
+                    JVETStats.mergeStats(summary.pop('stats'))
+                    summaries[futures[future]] = summary
+                    status[summary['meeting']] = ['done', None, None]
+                    print(f'    [{futures[future] + 1:03} out of {no_meetings:03}] Finished meeting {summary["meeting"]} '
+                          f'({getSummaryText(summary)})')
+
+                # Status of the active meetings (at most every few seconds)
+                if pending and time.monotonic() - last_status >= 5:
+                    last_status = time.monotonic()
+                    printMeetingsStatus(status, no_meetings - len(pending), no_meetings)
+        except BaseException:
+            # Do not start the meetings that are still waiting
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    return summaries
+
+
+# Text of the summary of a meeting for the progress and summary lines
+def getSummaryText(summary):
+    if summary['failed']:
+        return 'failed, the meeting page could not be fetched'
+
+    return f'{summary["docs"]} docs, {len(summary["errors"])} error(s)'
+
+
+# Print the summary of the run and combine the errors of all meetings in a single file
+def saveRunSummary(args, summaries):
+    summary_file = os.path.join(os.path.expanduser(args.outputdir), '#extraction_error_summary.txt')
+
+    print('Summary:')
+    for summary in summaries:
+        print(f'    {summary["meeting"]}: {getSummaryText(summary)}')
+
+    no_errors = sum(len(summary['errors']) for summary in summaries)
+
+    if no_errors > 0:
+        with open(summary_file, 'w') as fp:
+            for summary in summaries:
+                if summary['errors']:
+                    fp.write(f'{summary["meeting"]}:\n')
+                    for error in summary['errors']:
+                        fp.write(f'    {error}\n')
+
+        print(f'\n{no_errors} file(s) could not be fetched or extracted in total, details saved to: {summary_file}.\n')
+    else:
+        if os.path.exists(summary_file):
+            os.remove(summary_file)
+        print('')
+
+
+# Compare the docs table of a meeting with its sync manifest, returns the new, revised, withdrawn and failed doc numbers
+# Failed docs are the ones whose last download failed or whose zip file was bad, and that were not revised since
+def diffDocsTable(conn, docs_table):
+    manifest = readSyncManifest(conn)
+    current_docs = set(doc[0] for doc in docs_table[1:])
+
+    new_docs = [doc[0] for doc in docs_table[1:] if doc[0] not in manifest]
+    revised_docs = [doc[0] for doc in docs_table[1:] if doc[0] in manifest
+                    and (manifest[doc[0]]['last_uploaded'] != doc[4] or manifest[doc[0]]['zip_url'] != doc[2])]
+    withdrawn_docs = [doc_number for doc_number in manifest if doc_number not in current_docs]
+    failed_docs = [doc[0] for doc in docs_table[1:] if doc[0] in manifest and doc[0] not in revised_docs
+                   and manifest[doc[0]]['status'] in ('failed', 'bad')]
+
+    return [new_docs, revised_docs, withdrawn_docs, failed_docs]
+
+
+# Longest time in seconds between the retries of a doc that keeps failing while watching a meeting
+watch_max_retry = 3600
+
+
+# Keep the active (last) meeting up to date, polling its docs table every args.watch seconds until interrupted
+# The page is revalidated with the cache (a conditional request when it did not change) and compared with the sync
+# manifest, the meeting is only synced (new and revised docs) when something changed
+# Docs that failed (e.g. a zip file that is not found) are retried at a doubling interval, up to watch_max_retry seconds,
+# instead of syncing the meeting on every poll, and a poll that fails is logged and tried again on the next one
+def watchMeeting(args, meeting_info_table):
+    meeting_row = meeting_info_table[-1]
+    meeting_name = getMeetingName(meeting_row)
+    meeting_folder = os.path.expanduser(os.path.join(args.outputdir, meeting_name))
+
+    # Later syncs must never start the meeting from scratch
+    watch_args = argparse.Namespace(**vars(args))
+    watch_args.force = False
+
+    # Retries of the failed docs as {doc number: [time of the next retry (time.monotonic), seconds since the last one]}
+    retries = {}
+
+    # Schedule the next retry of the docs failed in the sync manifest (every sync retries all of them)
+    def scheduleRetries():
+        with contextlib.closing(openSyncManifest(meeting_folder)) as conn:
+            failed_docs = [doc_number for doc_number, entry in readSyncManifest(conn).items() if entry['status'] in ('failed', 'bad')]
+
+        for doc_number in set(retries).difference(failed_docs):
+            del retries[doc_number]
+
+        for doc_number in failed_docs:
+            delay = min(watch_max_retry, 2 * retries[doc_number][1]) if doc_number in retries else args.watch
+            retries[doc_number] = [time.monotonic() + delay, delay]
+
+    print(f'Watching meeting {meeting_name} every {args.watch} seconds (Ctrl+C to stop)...\n')
+
+    try:
+        scheduleRetries()
+
+        while True:
+            poll_start = time.monotonic()
+
+            try:
+                with contextlib.closing(openSyncManifest(meeting_folder)) as conn:
+                    new_docs, revised_docs, withdrawn_docs, failed_docs = diffDocsTable(
+                        conn, getDocsTable(watch_args, meeting_row[-1], 'revalidate'))
+
+                retried_docs = [doc_number for doc_number in failed_docs
+                                if doc_number not in retries or retries[doc_number][0] <= time.monotonic()]
+
+                if new_docs or revised_docs or withdrawn_docs or retried_docs:
+                    print(f'{datetime.datetime.now():%Y-%m-%d %H:%M:%S} {meeting_name}: {len(new_docs)} new, '
+                          f'{len(revised_docs)} revised, {len(withdrawn_docs)} withdrawn, {len(retried_docs)} retried doc(s)')
+                    for label, doc_numbers in [['New', new_docs], ['Revised', revised_docs], ['Withdrawn', withdrawn_docs],
+                                               ['Retried', retried_docs]]:
+                        if doc_numbers:
+                            print(f'    {label}: {", ".join(doc_numbers)}')
+
+                    summary = processMeeting(watch_args, meeting_row, meeting_info_table, 0, 1)
+                    saveMeetingFilesManifest(watch_args, summary)
+                    if summary['failed']:
+                        print(f'{datetime.datetime.now():%Y-%m-%d %H:%M:%S} {meeting_name}: sync failed ({summary["errors"][0]})')
+
+                    scheduleRetries()
+            except JVETHttp.transferErrors() as e:
+                print(f'{datetime.datetime.now():%Y-%m-%d %H:%M:%S} {meeting_name}: poll failed, trying again on the next one ({e})')
+
+            time.sleep(max(0, args.watch - (time.monotonic() - poll_start)))
+    except KeyboardInterrupt:
+        print('\nWatch stopped.')
 
 
 # Parse meeting info table
@@ -457,86 +2031,35 @@ def parseGlobalInfo(args, meeting_info_table):
     # Number of meetings
     no_meetings = len(meeting_info_table[start:])
 
+    # Several meetings at once in worker processes
+    if args.meetingjobs > 1 and no_meetings > 1:
+        summaries = processMeetingsParallel(args, meeting_info_table[start:], meeting_info_table)
     # Loop table meetings
-    for meeting_row, ix in zip(meeting_info_table[start:], range(no_meetings)):
-        # Check flag for folder
-        dir_exists = False
-        # Meeting name YYYY_MM_L_CITY
-        meeting_name = f"{meeting_row[2].split('-')[0]}_{meeting_row[2].split('-')[1]}_{meeting_row[4]}_{meeting_row[1].replace(' ', '_')}"
-        # NR_L_CITY_YYYY_MM
-        # meeting_name = f"{int(meeting_row[0]):03}_{meeting_row[4]}_{meeting_row[1].replace(' ', '_')}_{meeting_row[2].split('-')[0]}_{meeting_row[2].split('-')[1]}"))
-
-        # Defines the folder name in the format: YYYY_MM_L_CITY
-        meeting_folder = os.path.expanduser(os.path.join(args.outputdir, meeting_name))
-
-        # Defines the name of the file where all the meeting information is stored
-        meeting_file = os.path.join(meeting_folder, '#meeting_info.xlsx')
-
-        # Skips current if the corresponding folder already exists
-        # If the meeting information file does not exist or the force option
-        # is activated the current meeting operations are performed form scratch
-        # The same happens for the last meeting
-        if os.path.exists(meeting_folder):
-            if args.force                           \
-               or not os.path.exists(meeting_file)  \
-               or meeting_row == meeting_info_table[-1]: # Last meeting always redone
-                shutil.rmtree(meeting_folder)
-            else:
-                dir_exists = True #continue
-        
-        print(f'    [{ix + 1:03} out of {no_meetings:03}] Working on meeting {meeting_name}...')
-        
-        # Create directory for meeting
-        if not dir_exists:
-            os.mkdir(meeting_folder)
-
-        # Get current meeting table
-        print('        Fetching meeting infos...')
-        no_docs, docs_table, notes_links = getMeetingInfos(args, meeting_folder, meeting_row)
-        print('        Meeting infos fetched!\n')
-
-        # Download zip files
-        print('        Fetching doc zip files...')
-        # Create zip directory if it does not exist
-        zip_dir = os.path.join(meeting_folder, args.zipdir)
-        if not os.path.exists(zip_dir):
-            os.mkdir(zip_dir)
-        zip_files = fetchZipFiles(docs_table, zip_dir, dir_exists)
-        print('        Zip files fetched!\n')
-
-        # Unzip zip files
-        print('        Extracting doc zip files...')
-        error_list = extractZipFiles(args, docs_table, zip_files, meeting_folder, dir_exists)
-        # Remove zip files if option is set
-        if args.rmzip == 'yes':
-            os.remove(os.path.join(meeting_folder, args.zipdir))
-        print('        Zip files extracted!\n')
-
-        # If there were errors during the extraction
-        if len(error_list) > 0:
-            # Error file path
-            error_file = os.path.join(meeting_folder, '#extraction_error_list.txt')
-
-            # Save list to file
-            with open(error_file, 'w') as fp:
-                for error in error_list:
-                    fp.write(f'{error}')
-            
-            # Information messages
-            print(f'{len(error_list)} file(s) could not be extracted.')
-            print(f'A file with details was saved to: {error_file}.\n')
-
-        # Download notes and logistics files
-        print('        Fetching notes and logistics files...')
-        notes_links = fetchNotesLogistics(notes_links, meeting_folder)
-        print('        Files fetched!\n')
-        
-        # Save infos to xls
-        if args.savexls:
-            saveMeetingInfosXlsFile(os.path.basename(meeting_folder), no_docs, docs_table, notes_links,
-                                    meeting_file)
-        
-        print(f'    [{ix + 1:03} out of {no_meetings:03}] Finished meeting {meeting_name}!\n')
+    else:
+        summaries = []
+        for meeting_row, ix in zip(meeting_info_table[start:], range(no_meetings)):
+            summary = processMeeting(args, meeting_row, meeting_info_table, ix, no_meetings)
+            saveMeetingFilesManifest(args, summary)
+            summaries.append(summary)
+
+    saveRunSummary(args, summaries)
+
+
+# Save the report with the time, transfers and extraction throughput of each stage of the run (json and optionally Prometheus)
+def saveRunReport(args, started):
+    finished = time.time()
+    report = JVETStats.getReport(started, finished)
+
+    report_file = args.report if args.report else os.path.join(args.outputdir, '#run_report.json')
+    JVETStats.writeJsonReport(report, os.path.expanduser(report_file))
+    print(f'Run report saved to: {report_file}')
+
+    if args.prometheus:
+        JVETStats.writePrometheusFile(report, os.path.expanduser(args.prometheus), finished)
+
+    totals = report['totals']
+    print(f'    {totals["seconds"]:.1f} s, {totals["requests"]} requests, {totals["bytes"] / 2**20:.1f} MiB received '
+          f'({totals["cache_hits"]} cache hits, {totals["retries"]} retries), {totals["extracted_bytes"] / 2**20:.1f} MiB extracted\n')
 
 
 # Defining main function 
@@ -544,11 +2067,46 @@ def main():
     # Parse arguments
     args = getArgs()
 
+    # Streamed zip files are never stored
+    if args.stream:
+        args.rmzip = True
+
+    # Formats of the meeting infos
+    unknown_sinks = [sink for sink in getSinks(args) if sink not in metadata_sinks]
+    if unknown_sinks:
+        print(f'Unknown --sinks format(s): {", ".join(unknown_sinks)} (choose from {", ".join(metadata_sinks)}).')
+        return
+
+    # Docs downloaded first
+    try:
+        getPriorityRanges(args)
+    except (OSError, ValueError) as e:
+        print(f'Invalid --priority or --watchlist: {e}')
+        return
+
+    # Only clean the document store
+    if args.gc:
+        if not args.store:
+            print('The --gc option needs the --store directory.')
+            return
+        collectStoreGarbage(args)
+        return
+
+    # Shared HTTP session, one keep-alive connection per concurrent download
+    JVETHttp.initSession(args.jobs, args.timeout, args.retries, args.backoff)
+    # Cache of fetched pages
+    JVETHttp.initCache(args.cachedir if args.cache else None)
+
     print('Fetching all JVET documents, please wait...\n')
 
+    # Start of the run for the run report
+    started = time.time()
+
     # Get all meetings table
     print('Compiling table with all meetings information...')
+    JVETStats.startStage(JVETStats.global_meeting, 'meetings')
     meeting_info_table = getAllMeetingsTable(args)
+    JVETStats.stopStage()
     print('Table compiled!\n')
 
     # Parse the previous table information and download files
@@ -560,8 +2118,15 @@ def main():
     parseGlobalInfo(args, meeting_info_table)
     print('Parsing completed!\n')
 
+    saveRunReport(args, started)
+
     print('All files fetched!')
 
+    # Keep following the active meeting
+    if args.watch:
+        print('')
+        watchMeeting(args, meeting_info_table)
+
 
 # Call main function
 if __name__=="__main__": 
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Offline benchmark of NeoJVETCrawler against the local stand-in of the
+#     JVET site (jvet_standin.py), records the time and throughput of each
+#     stage (getAllMeetingsTable, getDocsTable and fetchAndExtractZipFiles,
+#     split in its downloads and extractions) and of whole runs from scratch
+#     and up to date.
+#     Extra crawler options can be given after --, for example:
+#         python3 bench_crawler.py -m 4 -d 50 -L 20 -- --jobs 8 --extractjobs 4
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import JVETHttp
+import JVETStats
+import jvet_standin
+import NeoJVETCrawler
+
+
+# Function to deal with the input arguments
+def getArgs():
+    parser = argparse.ArgumentParser(description='Benchmark the crawler stages against a local stand-in of the JVET site')
+    parser.add_argument('crawlerargs', nargs='*', type=str, help='extra options of the crawler (after --)')
+    parser.add_argument('-m', '--meetings', dest='meetings', type=int, required=False, help='number of meetings', default=3)
+    parser.add_argument('-d', '--docs', dest='docs', type=int, required=False, help='number of docs per meeting', default=30)
+    parser.add_argument('-s', '--zipsize', dest='zipsize', type=int, required=False, help='size in KiB of the contents of each zip file',
+                        default=256)
+    parser.add_argument('-f', '--zipfiles', dest='zipfiles', type=int, required=False, help='number of files in each zip file', default=3)
+    parser.add_argument('-L', '--latency', dest='latency', type=float, required=False, help='latency in milliseconds added to each request',
+                        default=0)
+    parser.add_argument('-b', '--bandwidth', dest='bandwidth', type=int, required=False,
+                        help='bandwidth limit in KiB/s of each connection (0 for no limit)', default=0)
+    parser.add_argument('-j', '--json', dest='json', type=str, required=False, help='file to save the results to (json)')
+    parser.add_argument('-k', '--keep', dest='keep', action='store_true', required=False, help='keep the output directory of the runs')
+
+    return parser.parse_args()
+
+
+# Run func with its output hidden, returns its result and wall time in seconds
+def timeCall(func, *func_args):
+    start = time.perf_counter()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*func_args)
+
+    return result, time.perf_counter() - start
+
+
+# Size in bytes of all the files of a directory tree
+def getTreeSize(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, dirs, files in os.walk(directory) for name in files)
+
+
+# Record the result of a stage (the requests and bytes are the ones served by the site since its last reset)
+def recordStage(results, site, name, seconds, items, item_name, extra_bytes=None):
+    no_bytes = site.bytes_sent if extra_bytes is None else extra_bytes
+    results.append({'stage': name, 'seconds': seconds, 'items': items, 'item_name': item_name,
+                    'requests': site.requests, 'bytes': no_bytes})
+
+    print(f'    {name:24} {seconds * 1000:10.1f} ms  {items:6} {item_name:9} {items / seconds if seconds else 0:10.1f} {item_name}/s'
+          f'  {site.requests:6} requests  {no_bytes / seconds / 2**20 if seconds else 0:8.1f} MiB/s')
+
+    site.resetStats()
+
+
+# Time each stage of the crawler on its own
+def benchmarkStages(args, site, crawler_args, results):
+    print('Stages:')
+
+    site.resetStats()
+    meeting_info_table, seconds = timeCall(NeoJVETCrawler.getAllMeetingsTable, crawler_args)
+    recordStage(results, site, 'getAllMeetingsTable', seconds, len(meeting_info_table) - 1, 'meetings')
+
+    # Meeting folders and docs tables
+    meetings = []
+    for meeting_row in meeting_info_table[1:]:
+        meeting_folder = os.path.join(crawler_args.outputdir, f'{meeting_row[0]:03}_{meeting_row[4]}')
+        os.makedirs(os.path.join(meeting_folder, crawler_args.zipdir), exist_ok=True)
+        meetings.append([meeting_row, meeting_folder])
+
+    docs_tables = []
+    seconds = 0
+    for meeting_row, meeting_folder in meetings:
+        docs_table, meeting_seconds = timeCall(NeoJVETCrawler.getDocsTable, crawler_args, meeting_row[-1])
+        docs_tables.append(docs_table)
+        seconds += meeting_seconds
+    recordStage(results, site, 'getDocsTable', seconds, sum(len(table) - 1 for table in docs_tables), 'docs')
+
+    # Downloads and extractions overlap, their split comes from the counters of the stage (bytes downloaded, and bytes
+    # extracted with the time spent extracting them summed over the extraction processes)
+    no_zips = 0
+    seconds = 0
+    zips_stats = dict.fromkeys(JVETStats.counters, 0)
+    for [meeting_row, meeting_folder], docs_table in zip(meetings, docs_tables):
+        meeting_name = os.path.basename(meeting_folder)
+        conn = NeoJVETCrawler.openSyncManifest(meeting_folder)
+
+        JVETStats.startStage(meeting_name, 'zips')
+        result, meeting_seconds = timeCall(NeoJVETCrawler.fetchAndExtractZipFiles, crawler_args, docs_table,
+                                           os.path.join(meeting_folder, crawler_args.zipdir), meeting_folder, conn)
+        JVETStats.stopStage()
+
+        no_zips += len(NeoJVETCrawler.readSyncManifest(conn))
+        conn.close()
+        seconds += meeting_seconds
+        for entry in JVETStats.popMeetingStats(meeting_name).values():
+            for counter, value in entry.items():
+                zips_stats[counter] += value
+    recordStage(results, site, 'fetchAndExtractZipFiles', seconds, no_zips, 'zips', zips_stats['bytes'])
+    recordStage(results, site, '  extraction', zips_stats['extract_seconds'], no_zips, 'zips', zips_stats['extracted_bytes'])
+
+    return meeting_info_table
+
+
+# Time whole runs of the crawler, from scratch and with everything up to date
+def benchmarkRuns(args, site, crawler_args, results):
+    print('End to end:')
+
+    for name in ['run (from scratch)', 'run (up to date)']:
+        site.resetStats()
+        start = time.perf_counter()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            meeting_info_table = NeoJVETCrawler.getAllMeetingsTable(crawler_args)
+            NeoJVETCrawler.parseGlobalInfo(crawler_args, meeting_info_table)
+
+        recordStage(results, site, name, time.perf_counter() - start, args.meetings * args.docs, 'docs')
+
+
+# Defining main function
+def main():
+    args = getArgs()
+
+    site = jvet_standin.JVETSite(args.meetings, args.docs, args.zipsize * 1024, args.zipfiles)
+    server = jvet_standin.startServer(site, 0, args.latency / 1000, args.bandwidth * 1024)
+    docs_url, notes_url = jvet_standin.getSourceUrls(server)
+
+    work_dir = tempfile.mkdtemp(prefix='jvet-bench-')
+    results = []
+
+    print(f'{args.meetings} meetings with {args.docs} docs of {args.zipsize} KiB '
+          f'(latency {args.latency:.0f} ms, bandwidth {"unlimited" if not args.bandwidth else f"{args.bandwidth} KiB/s"})\n')
+
+    try:
+        for name in ['stages', 'runs']:
+            output_dir = os.path.join(work_dir, name)
+            os.mkdir(output_dir)
+
+            # Crawler options as given in the command line, with a cache of its own
+            crawler_args = NeoJVETCrawler.getArgs(['-o', output_dir, '-d', docs_url, '-n', notes_url, '--nosavexls',
+                                                   '-c', os.path.join(work_dir, f'{name}_cache')] + args.crawlerargs)
+            # Streamed zip files are never stored
+            if crawler_args.stream:
+                crawler_args.rmzip = True
+            JVETHttp.initSession(crawler_args.jobs, crawler_args.timeout, crawler_args.retries, crawler_args.backoff)
+            JVETHttp.initCache(crawler_args.cachedir if crawler_args.cache else None)
+
+            if name == 'stages':
+                benchmarkStages(args, site, crawler_args, results)
+            else:
+                benchmarkRuns(args, site, crawler_args, results)
+    finally:
+        server.shutdown()
+        if args.keep:
+            print(f'\nOutput kept in {work_dir}')
+        else:
+            shutil.rmtree(work_dir)
+
+    if args.json:
+        with open(args.json, 'w') as fp:
+            json.dump({'meetings': args.meetings, 'docs': args.docs, 'zipsize': args.zipsize, 'latency': args.latency,
+                       'bandwidth': args.bandwidth, 'crawlerargs': args.crawlerargs, 'results': results}, fp, indent=4)
+
+
+# Call main function
+if __name__=="__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Benchmark of the meeting docs table parser of NeoJVETCrawler against
+#     saved meeting pages (e.g. curl -o page.html "<meeting url>"), when no
+#     page is given a synthetic one is generated. If pandas is installed the
+#     old pandas.read_html based parsing is timed as well for comparison
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import NeoJVETCrawler
+
+
+# Function to deal with the input arguments
+def getArgs():
+    parser = argparse.ArgumentParser(description='Benchmark the parsing of saved JVET meeting pages')
+    parser.add_argument('pages', nargs='*', type=str, help='saved meeting pages (html files)')
+    parser.add_argument('-r', '--rows', dest='rows', type=int, required=False, help='rows of the synthetic page used when no page is given',
+                        default=1500)
+    parser.add_argument('-n', '--repeat', dest='repeat', type=int, required=False, help='number of times each page is parsed',
+                        default=5)
+    parser.add_argument('-m', '--memory', dest='memory', action='store_true', required=False, help='also measure the peak memory of each parser')
+
+    return parser.parse_args()
+
+
+# Build a meeting page with a docs table of no_rows documents
+def buildSyntheticPage(no_rows):
+    rows = ['<tr><td>JVET number</td><td>MPEG number</td><td>Created</td><td>First upload</td><td>Last upload</td>'
+            '<td>Title</td><td>Source</td><td>Files</td></tr>']
+
+    for ix in range(1, no_rows + 1):
+        doc = f'JVET-Z{ix:04}'
+        if ix % 10 == 0:
+            zip_cell = 'withdrawn'
+        else:
+            zip_cell = f'<a href="../doc_end_user/documents/99_City/wg11/{doc}-v1.zip">{doc}-v1.zip</a>'
+        rows.append(f'<tr><td><a href="doc_end_user/current_document.php?id={ix}">{doc}</a></td><td>m{60000 + ix}</td>'
+                    f'<td>2024-01-01 10:00:00</td><td>2024-01-02 10:00:00</td><td>2024-01-03 10:00:00</td>'
+                    f'<td>Title of the contribution number {ix} on some coding tool</td>'
+                    f'<td>First Author, Second Author, Third Author (Company)</td><td>{zip_cell}</td></tr>')
+    rows.append('<tr><td colspan="8"></td></tr>')
+
+    return ('<html><head><meta charset="utf-8"></head><body><table><tr><td>Meeting</td></tr></table><table>'
+            + '\n'.join(rows) + '</table></body></html>').encode('utf-8')
+
+
+# Docs table parsed with the crawler parser
+def parseStreaming(page):
+    return list(NeoJVETCrawler.parseDocsTable(page))
+
+
+# Docs table parsed with pandas (as done before the streaming parser)
+def parsePandas(page):
+    import pandas
+
+    raw_table = pandas.read_html(io.BytesIO(page), extract_links='all')[1]
+    raw_table.drop([1, 2, 3], axis=1, inplace=True)
+
+    return [raw_table.iloc[irow, :] for irow in range(1, raw_table.shape[0] - 1)]
+
+
+# Time (best of repeat) and optionally peak memory of parsing page with parse
+def benchmark(parse, page, repeat, memory):
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        no_rows = len(parse(page))
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        parse(page)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return no_rows, best, peak
+
+
+# Defining main function
+def main():
+    args = getArgs()
+
+    # Pages to parse as [name, content]
+    if args.pages:
+        pages = []
+        for path in args.pages:
+            with open(path, 'rb') as fp:
+                pages.append([os.path.basename(path), fp.read()])
+    else:
+        pages = [[f'synthetic ({args.rows} rows)', buildSyntheticPage(args.rows)]]
+
+    parsers = [['streaming', parseStreaming]]
+    try:
+        import pandas
+        parsers.append(['pandas', parsePandas])
+    except ImportError:
+        print('pandas is not installed, only the streaming parser is measured\n')
+
+    for name, page in pages:
+        print(f'{name}: {len(page) / 1024:.1f} KiB')
+
+        for parser_name, parse in parsers:
+            no_rows, best, peak = benchmark(parse, page, args.repeat, args.memory)
+
+            line = f'    {parser_name:10} {no_rows:5} rows  {best * 1000:9.2f} ms  {no_rows / best:10.0f} rows/s  {len(page) / best / 2**20:7.1f} MiB/s'
+            if peak is not None:
+                line += f'  peak {peak / 2**20:7.2f} MiB'
+            print(line)
+
+
+# Call main function
+if __name__=="__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Startup time regression benchmark of NeoJVETCrawler, measures the
+#     import time of the module and the time of running it with --help and
+#     fails (exit code 1) if they go over budget or if any heavy dependency
+#     is imported at module load
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+
+# Repository directory
+repo_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Modules that must only be imported on the code paths that use them
+heavy_modules = ['bs4', 'lxml', 'openpyxl', 'pandas', 'requests', 'tabulate']
+
+
+# Function to deal with the input arguments
+def getArgs():
+    parser = argparse.ArgumentParser(description='Check the startup time of NeoJVETCrawler against a budget')
+    parser.add_argument('-i', '--importbudget', dest='importbudget', type=float, required=False,
+                        help='budget in milliseconds for importing NeoJVETCrawler (self + dependencies)', default=60)
+    parser.add_argument('-b', '--helpbudget', dest='helpbudget', type=float, required=False,
+                        help='budget in milliseconds for running NeoJVETCrawler.py --help (whole process)', default=250)
+    parser.add_argument('-n', '--repeat', dest='repeat', type=int, required=False, help='number of runs (the best one is used)',
+                        default=5)
+
+    return parser.parse_args()
+
+
+# Import time of NeoJVETCrawler in milliseconds (from -X importtime) and the top level modules it imported
+def measureImport():
+    code = 'import sys; before = set(sys.modules); import NeoJVETCrawler; print(" ".join(set(sys.modules) - before))'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=repo_dir,
+                            capture_output=True, text=True, check=True)
+
+    # Cumulative time (microseconds) of the line of the module itself
+    import_time = None
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| NeoJVETCrawler$', line)
+        if match:
+            import_time = int(match.group(1)) / 1000
+
+    loaded = set(module.split('.')[0] for module in result.stdout.split())
+
+    return import_time, loaded
+
+
+# Wall time in milliseconds of running NeoJVETCrawler.py --help
+def measureHelp():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(repo_dir, 'NeoJVETCrawler.py'), '--help'],
+                   capture_output=True, check=True)
+
+    return (time.perf_counter() - start) * 1000
+
+
+# Defining main function
+def main():
+    args = getArgs()
+
+    import_times = []
+    help_times = []
+    loaded = set()
+
+    for _ in range(args.repeat):
+        import_time, run_loaded = measureImport()
+        import_times.append(import_time)
+        loaded |= run_loaded
+        help_times.append(measureHelp())
+
+    failed = False
+
+    print(f'Import of NeoJVETCrawler: {min(import_times):7.1f} ms (budget {args.importbudget:.0f} ms)')
+    if min(import_times) > args.importbudget:
+        print('    Over budget!')
+        failed = True
+
+    print(f'NeoJVETCrawler.py --help: {min(help_times):7.1f} ms (budget {args.helpbudget:.0f} ms)')
+    if min(help_times) > args.helpbudget:
+        print('    Over budget!')
+        failed = True
+
+    eager = sorted(loaded.intersection(heavy_modules))
+    if eager:
+        print(f'Heavy modules imported at module load: {", ".join(eager)}')
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+# Call main function
+if __name__=="__main__":
+    main()
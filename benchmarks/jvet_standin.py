@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Local stand-in of the JVET documents site and of the ITU notes site
+#     serving synthetic versions of the pages parsed by NeoJVETCrawler
+#     (all_meeting.php, meeting docs tables with withdrawn and missing zip
+#     rows, preview pages, the wftp3 notes listings) and zip files of
+#     configurable size and count, with optional latency and bandwidth
+#     limits. Supports HEAD, conditional (ETag / Last-Modified) and Range
+#     requests like the real servers, and can answer a fraction of the
+#     requests with 503 (Retry-After) to exercise the crawler retries
+#
+#     Run it and point the crawler to it:
+#         python3 jvet_standin.py -P 8766
+#         python3 NeoJVETCrawler.py -o out -d http://127.0.0.1:8766/doc_end_user/all_meeting.php
+#                                          -n http://127.0.0.1:8766/wftp3/av-arch/jvet-site/
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import argparse
+import email.utils
+import hashlib
+import http.server
+import io
+import random
+import re
+import threading
+import time
+import urllib.parse
+import zipfile
+
+
+# Path of the pages of the documents site and of the notes site
+docs_path = '/doc_end_user/'
+notes_path = '/wftp3/av-arch/jvet-site/'
+
+# Size of the blocks sent when the bandwidth is limited
+block_size = 16 * 1024
+
+
+# Function to deal with the input arguments
+def getArgs():
+    parser = argparse.ArgumentParser(description='Serve a synthetic JVET documents site for offline crawler runs')
+    parser.add_argument('-P', '--port', dest='port', type=int, required=False, help='port to listen on (0 for any free port)', default=8766)
+    parser.add_argument('-m', '--meetings', dest='meetings', type=int, required=False, help='number of meetings', default=3)
+    parser.add_argument('-d', '--docs', dest='docs', type=int, required=False, help='number of docs per meeting', default=20)
+    parser.add_argument('-s', '--zipsize', dest='zipsize', type=int, required=False, help='size in KiB of the contents of each zip file',
+                        default=64)
+    parser.add_argument('-f', '--zipfiles', dest='zipfiles', type=int, required=False, help='number of files in each zip file', default=3)
+    parser.add_argument('-w', '--withdrawn', dest='withdrawn', type=float, required=False, help='fraction of withdrawn docs', default=0.1)
+    parser.add_argument('-x', '--missing', dest='missing', type=float, required=False,
+                        help='fraction of docs without a zip link in the docs table (only on their preview page)', default=0.1)
+    parser.add_argument('-L', '--latency', dest='latency', type=float, required=False, help='latency in milliseconds added to each request',
+                        default=0)
+    parser.add_argument('-b', '--bandwidth', dest='bandwidth', type=int, required=False,
+                        help='bandwidth limit in KiB/s of each connection (0 for no limit)', default=0)
+    parser.add_argument('-E', '--errorrate', dest='errorrate', type=float, required=False,
+                        help='fraction of the requests answered with 503 Service Unavailable', default=0)
+    parser.add_argument('-r', '--seed', dest='seed', type=int, required=False, help='seed of the synthetic contents', default=1)
+
+    return parser.parse_args()
+
+
+# Synthetic JVET site, holds the meetings, their docs and the statistics of the requests served
+class JVETSite:
+    def __init__(self, no_meetings=3, no_docs=20, zip_size=64 * 1024, zip_files=3, withdrawn=0.1, missing=0.1, seed=1, error_rate=0):
+        self.error_rate = error_rate
+        self.error_rng = random.Random(seed)
+        self.zip_size = zip_size
+        self.zip_files = zip_files
+        self.seed = seed
+        self.meetings = []
+        # Zip files already built by (doc number, version)
+        self.zips = {}
+        self.lock = threading.Lock()
+        # Requests served and bytes sent
+        self.requests = 0
+        self.bytes_sent = 0
+        # Time of the last change of the contents (Last-Modified of every page)
+        self.modified = time.time()
+
+        rng = random.Random(seed)
+
+        for number in range(1, no_meetings + 1):
+            letter = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'[(number - 1) % 26]
+            year = 2010 + number
+            month = (number - 1) % 12 + 1
+
+            docs = []
+            for doc_ix in range(1, no_docs + 1):
+                draw = rng.random()
+                kind = 'withdrawn' if draw < withdrawn else 'missing' if draw < withdrawn + missing else 'zip'
+                docs.append({'number': f'JVET-{letter}{doc_ix:04}', 'kind': kind, 'version': 1,
+                             'uploaded': f'{year}-{month:02}-01 10:00:00'})
+
+            self.meetings.append({'number': number, 'letter': letter, 'city': f'City {number}',
+                                  'start': f'{year}-{month:02}-10', 'end': f'{year}-{month:02}-18', 'docs': docs})
+
+    # Upload a new version of a doc (its zip file changes)
+    def bumpVersion(self, doc_number):
+        with self.lock:
+            for meeting in self.meetings:
+                for doc in meeting['docs']:
+                    if doc['number'] == doc_number:
+                        doc['version'] += 1
+                        doc['uploaded'] = time.strftime('%Y-%m-%d %H:%M:%S')
+            self.modified = time.time()
+
+    # Whether to answer a request with an error (drawn with error_rate)
+    def drawError(self):
+        with self.lock:
+            return self.error_rng.random() < self.error_rate
+
+    # Reset the statistics of the requests served
+    def resetStats(self):
+        with self.lock:
+            self.requests = 0
+            self.bytes_sent = 0
+
+    # Count a served request
+    def countRequest(self, no_bytes):
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += no_bytes
+
+    # Folder of the documents of a meeting in the zip urls (e.g. 1_City_1)
+    def getDocsFolder(self, meeting):
+        return f"{meeting['number']}_{meeting['city'].replace(' ', '_')}"
+
+    # Folder of the notes of a meeting in the notes site (e.g. 2011_01_A_City_1)
+    def getNotesFolder(self, meeting):
+        return f"{meeting['start'][:4]}_{meeting['start'][5:7]}_{meeting['letter']}_{meeting['city'].replace(' ', '_')}"
+
+    # Relative link to the zip file of a doc
+    def getZipLink(self, meeting, doc):
+        return f"../doc_end_user/documents/{self.getDocsFolder(meeting)}/wg11/{doc['number']}-v{doc['version']}.zip"
+
+    # Contents of the zip file of a doc version (random data does not compress, so the zip has about zip_size bytes)
+    def getZip(self, doc_number, version):
+        key = (doc_number, version)
+
+        with self.lock:
+            if key in self.zips:
+                return self.zips[key]
+
+        rng = random.Random(f'{self.seed}{doc_number}{version}')
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for file_ix in range(self.zip_files):
+                archive.writestr(f'{doc_number}-v{version}/{doc_number}_{file_ix}.docx', rng.randbytes(self.zip_size // self.zip_files))
+
+        with self.lock:
+            self.zips[key] = buffer.getvalue()
+
+        return self.zips[key]
+
+    # Page with the table of all meetings (newest first as in the real site)
+    def getAllMeetingsPage(self):
+        rows = ''.join(f"<tr><td><a href='meeting.php?id={meeting['number']}'>{meeting['number']}</a></td><td>{meeting['city']}</td>"
+                       f"<td>{meeting['start']}</td><td>{meeting['end']}</td><td>{meeting['letter']}</td></tr>"
+                       for meeting in reversed(self.meetings))
+
+        return ("<html><body><table><tr><th>Number</th><th>City</th><th>Start date</th><th>End date</th><th>Letter</th></tr>"
+                f"{rows}</table></body></html>")
+
+    # Page of a meeting with the table of its docs
+    def getMeetingPage(self, number):
+        rows = []
+
+        for doc in self.meetings[number - 1]['docs']:
+            if doc['kind'] == 'withdrawn':
+                zip_cell = 'withdrawn'
+            elif doc['kind'] == 'missing':
+                zip_cell = f"{doc['number']}-v{doc['version']}"
+            else:
+                zip_cell = f"<a href='{self.getZipLink(self.meetings[number - 1], doc)}'>{doc['number']}-v{doc['version']}.zip</a>"
+
+            rows.append(f"<tr><td><a href='preview.php?doc={doc['number']}'>{doc['number']}</a></td><td>m{doc['number'][-4:]}</td>"
+                        f"<td>2020-01-01 10:00:00</td><td>2020-01-02 10:00:00</td><td>{doc['uploaded']}</td>"
+                        f"<td>Title of {doc['number']}</td><td>Author A, Author B (Company)</td><td>{zip_cell}</td></tr>")
+
+        return ("<html><body><table><tr><td>Meeting</td></tr></table><table>"
+                "<tr><td>JVET number</td><td>MPEG number</td><td>Created</td><td>First upload</td><td>Last upload</td>"
+                "<td>Title</td><td>Source</td><td>Files</td></tr>"
+                + ''.join(rows) + "<tr><td colspan='8'></td></tr></table></body></html>")
+
+    # Preview page of a doc with the link to its zip file (None if there is no such doc)
+    def getPreviewPage(self, doc_number):
+        for meeting in self.meetings:
+            for doc in meeting['docs']:
+                if doc['number'] == doc_number:
+                    return f"<html><body><a href='{self.getZipLink(meeting, doc)}'>{doc_number}</a></body></html>"
+
+        return None
+
+    # Listing of the notes site with the folders of all meetings but the first (it has no notes)
+    def getNotesIndexPage(self):
+        links = ''.join(f"<a href='{notes_path}{self.getNotesFolder(meeting)}/'>{self.getNotesFolder(meeting)}/</a><br>"
+                        for meeting in self.meetings[1:])
+
+        return f"<html><body><a href='/wftp3/av-arch/'>[To Parent Directory]</a><br>{links}</body></html>"
+
+    # Listing of the notes folder of a meeting
+    def getNotesPage(self, folder):
+        return (f"<html><body><a href='{notes_path}{folder}/JVET_notes_d1.docx'>JVET_notes_d1.docx</a><br>"
+                f"<a href='{notes_path}{folder}/JVET_logistics.docx'>JVET_logistics.docx</a></body></html>")
+
+    # Body and content type of the resource at path (None if there is none)
+    def getResource(self, path, query):
+        if path == docs_path + 'all_meeting.php':
+            return self.getAllMeetingsPage().encode('utf-8'), 'text/html'
+        if path == docs_path + 'meeting.php' and query.get('id', [''])[0].isdigit():
+            number = int(query['id'][0])
+            if 1 <= number <= len(self.meetings):
+                return self.getMeetingPage(number).encode('utf-8'), 'text/html'
+        if path == docs_path + 'preview.php' and 'doc' in query:
+            page = self.getPreviewPage(query['doc'][0])
+            if page is not None:
+                return page.encode('utf-8'), 'text/html'
+        if path == notes_path:
+            return self.getNotesIndexPage().encode('utf-8'), 'text/html'
+        if path.startswith(notes_path):
+            if path.endswith('/'):
+                return self.getNotesPage(path.split('/')[-2]).encode('utf-8'), 'text/html'
+            return path.encode('utf-8') * 64, 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        if path.startswith(docs_path + 'documents/'):
+            # Zip files are named <doc number>-v<version>.zip, other names are not found
+            match = re.fullmatch(r'(.+)-v(\d+)\.zip', path.split('/')[-1])
+            if match is not None:
+                return self.getZip(match.group(1), int(match.group(2))), 'application/zip'
+
+        return None, None
+
+
+# Handler of the requests to the site, keeps the connections alive like the real servers
+class JVETSiteHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    # Site served, latency in seconds and bandwidth in bytes/s (set by startServer)
+    site = None
+    latency = 0
+    bandwidth = 0
+
+    # Requests are not logged
+    def log_message(self, format, *args):
+        pass
+
+    # Send an answer without body (requests are counted before they are answered, so clients see them counted)
+    def sendEmpty(self, status, headers=None):
+        self.site.countRequest(0)
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    # Answer a GET or HEAD request
+    def serve(self, send_body):
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.site.drawError():
+            self.sendEmpty(503, {'Retry-After': '1'})
+            return
+
+        url = urllib.parse.urlparse(self.path)
+        body, content_type = self.site.getResource(urllib.parse.unquote(url.path), urllib.parse.parse_qs(url.query))
+
+        if body is None:
+            self.sendEmpty(404)
+            return
+
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        last_modified = email.utils.formatdate(self.site.modified, usegmt=True)
+        validators = {'ETag': etag, 'Last-Modified': last_modified}
+
+        # Conditional requests
+        if self.headers.get('If-None-Match') is not None:
+            if etag in [tag.strip() for tag in self.headers['If-None-Match'].split(',')]:
+                self.sendEmpty(304, validators)
+                return
+        elif self.headers.get('If-Modified-Since') is not None:
+            since = email.utils.parsedate_to_datetime(self.headers['If-Modified-Since'])
+            if since is not None and int(self.site.modified) <= since.timestamp():
+                self.sendEmpty(304, validators)
+                return
+
+        # Range requests, ignored if the If-Range validator does not match
+        start = 0
+        status = 200
+        byte_range = self.headers.get('Range', '')
+        if byte_range.startswith('bytes=') and self.headers.get('If-Range') in (None, etag, last_modified):
+            first = byte_range[len('bytes='):].split('-')[0]
+            if first.isdigit():
+                start = int(first)
+                status = 206
+                if start >= len(body):
+                    self.sendEmpty(416, {'Content-Range': f'bytes */{len(body)}'})
+                    return
+
+        data = body[start:] if send_body else b''
+        self.site.countRequest(len(data))
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Accept-Ranges', 'bytes')
+        for name, value in validators.items():
+            self.send_header(name, value)
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+        self.send_header('Content-Length', str(len(body) - start))
+        self.end_headers()
+
+        if self.bandwidth:
+            for offset in range(0, len(data), block_size):
+                self.wfile.write(data[offset:offset + block_size])
+                time.sleep(min(block_size, len(data) - offset) / self.bandwidth)
+        else:
+            self.wfile.write(data)
+
+    def do_GET(self):
+        self.serve(True)
+
+    def do_HEAD(self):
+        self.serve(False)
+
+
+# Start serving site on port in a background thread, latency in seconds and bandwidth in bytes/s (0 for no limit)
+# Returns the server, its base url is http://127.0.0.1:<server.server_port>
+def startServer(site, port=0, latency=0, bandwidth=0):
+    handler = type('Handler', (JVETSiteHandler,), {'site': site, 'latency': latency, 'bandwidth': bandwidth})
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+# Urls of the pages with all meetings and all notes of a server started with startServer
+def getSourceUrls(server):
+    base_url = f'http://127.0.0.1:{server.server_port}'
+
+    return [base_url + docs_path + 'all_meeting.php', base_url + notes_path]
+
+
+# Defining main function
+def main():
+    args = getArgs()
+
+    site = JVETSite(args.meetings, args.docs, args.zipsize * 1024, args.zipfiles, args.withdrawn, args.missing, args.seed, args.errorrate)
+    server = startServer(site, args.port, args.latency / 1000, args.bandwidth * 1024)
+
+    docs_url, notes_url = getSourceUrls(server)
+    print(f'Serving {args.meetings} meetings with {args.docs} docs each')
+    print(f'    Docs source:  {docs_url}')
+    print(f'    Notes source: {notes_url}')
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+# Call main function
+if __name__=="__main__":
+    main()
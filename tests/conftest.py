@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Shared fixtures of the tests: the local stand-in of the JVET site
+#     (benchmarks/jvet_standin.py) and crawler arguments pointing at it
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import contextlib
+import hashlib
+import io
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path[:0] = [os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'),
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks')]
+import JVETHttp
+import jvet_standin
+import NeoJVETCrawler
+
+
+# Serve site in the background for a test
+def serveSite(site):
+    server = jvet_standin.startServer(site)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+# Stand-in site with 2 meetings of 6 docs (all with a zip file of 2 files)
+@pytest.fixture
+def site():
+    return jvet_standin.JVETSite(2, 6, 8 * 1024, 2, withdrawn=0, missing=0)
+
+
+# Server of the site fixture
+@pytest.fixture
+def server(site):
+    yield from serveSite(site)
+
+
+# Crawler arguments to sync the stand-in site to tmp_path/out (no cache or xlsx files, quick retries), extra options can
+# be given; the shared session is set up with them
+def getCrawlerArgs(tmp_path, server, *options):
+    output_dir = tmp_path / 'out'
+    output_dir.mkdir(exist_ok=True)
+
+    docs_url, notes_url = jvet_standin.getSourceUrls(server)
+    args = NeoJVETCrawler.getArgs(['-o', str(output_dir), '-d', docs_url, '-n', notes_url, '--nosavexls', '--nocache',
+                                   '--backoff', '0.01'] + list(options))
+
+    JVETHttp.initSession(args.jobs, args.timeout, args.retries, args.backoff)
+    JVETHttp.initCache(None)
+
+    return args
+
+
+# Sync all the meetings of the site, returns the table of all meetings
+def syncSite(args):
+    meeting_info_table = NeoJVETCrawler.getAllMeetingsTable(args)
+    NeoJVETCrawler.parseGlobalInfo(args, meeting_info_table)
+
+    return meeting_info_table
+
+
+# Folder of each meeting synced to the output directory as {meeting letter: folder}
+def getMeetingFolders(args, meeting_info_table):
+    return {row[4]: os.path.join(args.outputdir, NeoJVETCrawler.getMeetingName(row)) for row in meeting_info_table[1:]}
+
+
+# Contents of a folder tree as {path relative to it: contents}, folders end in /
+def readTree(directory):
+    tree = {}
+
+    for root, dirs, files in os.walk(directory):
+        relative_root = os.path.relpath(root, directory).replace(os.path.sep, '/')
+        prefix = '' if relative_root == '.' else relative_root + '/'
+        for name in dirs:
+            tree[prefix + name + '/'] = b''
+        for name in files:
+            with open(os.path.join(root, name), 'rb') as fp:
+                tree[prefix + name] = fp.read()
+
+    return tree
+
+
+# Contents of the folder tree a zip file (bytes) is extracted to, the same as readTree
+def readZipTree(data):
+    tree = {}
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for info in archive.infolist():
+            parts = info.filename.rstrip('/').split('/')
+            for no_parts in range(1, len(parts)):
+                tree['/'.join(parts[:no_parts]) + '/'] = b''
+            tree[info.filename] = b'' if info.is_dir() else archive.read(info)
+
+    return tree
+
+
+# Check every doc of the site was extracted and recorded in the sync manifest of its meeting with its zip file
+def checkSynced(args, site, meeting_info_table):
+    meeting_folders = getMeetingFolders(args, meeting_info_table)
+
+    for meeting in site.meetings:
+        with contextlib.closing(NeoJVETCrawler.openSyncManifest(meeting_folders[meeting['letter']])) as conn:
+            manifest = NeoJVETCrawler.readSyncManifest(conn)
+
+        for doc in meeting['docs']:
+            data = site.getZip(doc['number'], doc['version'])
+
+            assert readTree(os.path.join(meeting_folders[meeting['letter']], doc['number'])) == readZipTree(data)
+            assert [manifest[doc['number']]['size'], manifest[doc['number']]['sha256'], manifest[doc['number']]['status']] == \
+                   [len(data), hashlib.sha256(data).hexdigest(), 'extracted']
+
+
+# Docs table with a doc per [doc number, version], as built by getDocsTable
+def makeDocsTable(docs):
+    return [['JVET Number', 'Title', 'Zip', 'Authors', 'Last Uploaded']] + \
+           [[doc_number, f'Title of {doc_number}', f'https://example.org/documents/{doc_number}-v{version}.zip', 'Author A',
+             f'2026-01-0{version} 10:00:00'] for doc_number, version in docs]
+
+
+# Meeting folder with its zip folder and sync manifest
+@pytest.fixture
+def meeting(tmp_path):
+    zip_folder = tmp_path / 'zipfiles'
+    zip_folder.mkdir()
+
+    with contextlib.closing(NeoJVETCrawler.openSyncManifest(str(tmp_path))) as conn:
+        yield str(tmp_path), str(zip_folder), conn
+
+
+# Write a zip file and the doc folder of a doc as a sync would, with the sync manifest entry status given
+def addSyncedDoc(meeting_folder, zip_folder, conn, doc, status='extracted'):
+    zip_file = os.path.join(zip_folder, doc[2].split('/')[-1])
+    with zipfile.ZipFile(zip_file, 'w') as archive:
+        archive.writestr('a.txt', doc[0])
+    os.makedirs(os.path.join(meeting_folder, doc[0]), exist_ok=True)
+
+    if status is not None:
+        NeoJVETCrawler.writeSyncManifestEntry(conn, doc, os.path.basename(zip_file), *NeoJVETCrawler.hashFile(zip_file), status)
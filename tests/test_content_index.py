@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Tests of the full text index of the JVET Meetings File Finder
+#     (JVETContentIndex): the text of the Office files, the update with the
+#     documents that changed and the ranked searches
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import os
+import zipfile
+
+import pytest
+
+from JVETContentIndex import ContentIndex, extract_text
+
+
+# Write a docx file with a paragraph per line of text
+def makeDocx(path, text):
+    paragraphs = ''.join(f'<w:p><w:r><w:t>{line}</w:t></w:r></w:p>' for line in text.split('\n'))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('word/document.xml', '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                                              f'<w:body>{paragraphs}</w:body></w:document>')
+
+
+# Write an Office XML file with the parts given as {name: xml}
+def makeOffice(path, parts):
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, xml in parts.items():
+            archive.writestr(name, xml)
+
+
+# Names and snippets found by a search
+def searchDocs(index, text):
+    return sorted([name, snippet] for batch in index.search_batches(text) for parent, name, snippet in batch)
+
+
+# Documents of a meeting, with an Office lock file and a file of the crawler that are not indexed
+@pytest.fixture
+def documents(tmp_path):
+    directory = tmp_path / 'documents'
+    doc_folder = directory / '2026_01_A_City' / 'JVET-A0001' / 'JVET-A0001-v1'
+    makeDocx(str(doc_folder / 'JVET-A0001.docx'), 'Adaptive loop filter\nwith fewer taps')
+    makeDocx(str(doc_folder / 'JVET-A0001_crosscheck.docx'), 'Crosscheck of intra prediction')
+    makeDocx(str(doc_folder / '~$JVET-A0001.docx'), 'Adaptive loop filter')
+    makeDocx(str(directory / '2026_01_A_City' / '#notes.docx'), 'Adaptive loop filter')
+    (doc_folder / 'readme.txt').write_text('Adaptive loop filter')
+
+    return str(directory)
+
+
+# Index kept in the test folder
+@pytest.fixture
+def index(tmp_path):
+    return ContentIndex(tmp_path / 'content_index.sqlite')
+
+
+# Only the documents that are new or changed are read, and the ones that are gone removed
+def test_update(documents, index):
+    doc_folder = os.path.join(documents, '2026_01_A_City', 'JVET-A0001', 'JVET-A0001-v1')
+    progress = []
+
+    assert index.update(documents, jobs=1, progress=lambda done, total: progress.append([done, total])) == 2
+    assert progress == [[0, 2], [2, 2]]
+    assert searchDocs(index, 'loop filter') == [['JVET-A0001.docx', 'Adaptive [loop] [filter]\nwith fewer taps\n']]
+
+    assert index.update(documents, jobs=1) == 0
+
+    makeDocx(os.path.join(doc_folder, 'JVET-A0001_crosscheck.docx'), 'Crosscheck of the adaptive loop filter')
+    os.remove(os.path.join(doc_folder, 'JVET-A0001.docx'))
+
+    assert index.update(documents, jobs=1) == 1
+    assert [name for name, snippet in searchDocs(index, 'loop filter')] == ['JVET-A0001_crosscheck.docx']
+    assert searchDocs(index, 'intra') == []
+
+
+# An update that is cancelled keeps nothing half done, the next one reads what is left
+def test_update_cancelled(documents, index):
+    index.update(documents, jobs=1, is_cancelled=lambda: True)
+    assert searchDocs(index, 'crosscheck') == []
+
+    assert index.update(documents, jobs=1) == 2
+    assert [name for name, snippet in searchDocs(index, 'crosscheck')] == ['JVET-A0001_crosscheck.docx']
+
+
+# The index of another folder is built from scratch
+def test_update_other_folder(documents, index, tmp_path):
+    index.update(documents, jobs=1)
+
+    other = tmp_path / 'other'
+    makeDocx(str(other / 'JVET-B0001.docx'), 'Intra block copy')
+
+    assert index.update(str(other), jobs=1) == 1
+    assert index.get_root() == str(other)
+    assert searchDocs(index, 'loop') == []
+    assert [name for name, snippet in searchDocs(index, 'intra')] == ['JVET-B0001.docx']
+
+
+# The text of the Office files: paragraphs, rows and shared strings end a line, slides in their natural order
+def test_extract_text(tmp_path):
+    makeDocx(str(tmp_path / 'a.docx'), 'First line\nSecond line')
+    makeOffice(tmp_path / 'a.pptx', {f'ppt/slides/slide{no}.xml': f'<p:sld xmlns:p="p" xmlns:a="a"><a:p><a:t>Slide {no}</a:t></a:p></p:sld>'
+                                     for no in [10, 2, 1]} | {'ppt/media/image1.xml': '<a><t>Image</t></a>'})
+    makeOffice(tmp_path / 'a.xlsx', {'xl/sharedStrings.xml': '<sst><si><t>QP</t></si><si><t>BD-rate</t></si></sst>',
+                                     'xl/worksheets/sheet1.xml': '<ws><row><c><v>0</v></c><c><v>1</v></c></row></ws>'})
+    (tmp_path / 'b.docx').write_text('not a zip file')
+
+    assert extract_text(str(tmp_path / 'a.docx')) == 'First line\nSecond line\n'
+    assert extract_text(str(tmp_path / 'a.pptx')) == 'Slide 1\n\nSlide 2\n\nSlide 10\n'
+    assert extract_text(str(tmp_path / 'a.xlsx')).split() == ['QP', 'BD-rate']
+    assert extract_text(str(tmp_path / 'b.docx')) is None
+
+
+# The documents are read in a pool of processes, the matches in their names are ranked first
+def test_search_ranked(tmp_path, index):
+    directory = tmp_path / 'documents'
+    makeDocx(str(directory / 'JVET-A0001.docx'), 'Intra prediction\n' + 'Intra block copy for screen content\n' * 3)
+    makeDocx(str(directory / 'JVET-A0002_intra.docx'), 'Tools for screen content')
+    makeDocx(str(directory / 'JVET-A0003.docx'), 'Inter prediction')
+
+    assert index.update(str(directory), jobs=2) == 3
+    assert [name for parent, name, snippet in next(index.search_batches('intra'))] == ['JVET-A0002_intra.docx', 'JVET-A0001.docx']
+    assert [len(batch) for batch in index.search_batches('prediction', batch_size=1)] == [1, 1]
+    assert list(index.search_batches(' ')) == []
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Tests of the docs table of the meeting pages: the streaming parser
+#     (parseDocsTable) and the table built from it (getDocsTable) against the
+#     docs of the stand-in of the JVET site
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import urllib.parse
+
+import pytest
+
+import jvet_standin
+import NeoJVETCrawler
+from conftest import getCrawlerArgs
+
+
+# Stand-in site with withdrawn docs and docs without a zip link, the preview page of one of them has no link either
+class PreviewSite(jvet_standin.JVETSite):
+    def __init__(self):
+        super().__init__(1, 40, 1024, 1, withdrawn=0.2, missing=0.2, seed=3)
+        self.no_link_doc = [doc['number'] for doc in self.meetings[0]['docs'] if doc['kind'] == 'missing'][0]
+
+    def getPreviewPage(self, doc_number):
+        if doc_number == self.no_link_doc:
+            return f'<html><body>{doc_number}</body></html>'
+
+        return super().getPreviewPage(doc_number)
+
+
+@pytest.fixture
+def site():
+    return PreviewSite()
+
+
+# Meeting page with a table before the docs table, a nested table and a short row in it, and a table after it
+LAYOUT_PAGE = b"""<html><body>
+<table><tr><td>Meeting</td><td>1</td><td>2</td><td>3</td><td>4</td><td>5</td><td>6</td><td>7</td></tr></table>
+<table>
+  <tr><th>JVET number</th><th>MPEG number</th><th>Created</th><th>First upload</th><th>Last upload</th><th>Title</th><th>Source</th><th>Files</th></tr>
+  <tr><td><a href='preview.php?doc=JVET-A0001'>JVET-A0001</a></td><td>m1</td><td>c</td><td>f</td><td>2026-01-01 10:00:00</td>
+      <td>Adaptive
+          loop   filter</td><td>Author A<table><tr><td>1</td><td>2</td><td>3</td><td>4</td><td>5</td><td>6</td><td>7</td><td>8</td></tr></table></td>
+      <td><a href='../doc_end_user/documents/1_City/wg11/JVET-A0001-v1.zip'>JVET-A0001-v1.zip</a></td></tr>
+  <tr><td>Break</td></tr>
+  <tr><td><a href='preview.php?doc=JVET-A0002'>JVET-A0002</a></td><td colspan='3'>m2</td><td>2026-01-02 10:00:00</td>
+      <td>Intra</td><td>Author B</td><td>withdrawn</td></tr>
+  <tr><td colspan='8'>Last row</td></tr>
+</table>
+<table><tr><td>1</td><td>2</td><td>3</td><td>4</td><td>5</td><td>6</td><td>7</td><td>8</td></tr></table>
+</body></html>"""
+
+
+# Only the document rows of the docs table are parsed (headers, last row, short rows and other tables are skipped), the
+# same whatever the size of the chunks the page is fed in
+# Whitespace is collapsed as pandas.read_html did (each line break and each run of spaces turn into a space)
+@pytest.mark.parametrize('chunk_size', [1, 7, 64 * 1024])
+def test_parse_layout(chunk_size):
+    assert list(NeoJVETCrawler.parseDocsTable(LAYOUT_PAGE, chunk_size)) == [
+        NeoJVETCrawler.DocRecord('JVET-A0001', 'preview.php?doc=JVET-A0001', '2026-01-01 10:00:00', 'Adaptive  loop filter',
+                                 'Author A12345678', 'JVET-A0001-v1.zip', '../doc_end_user/documents/1_City/wg11/JVET-A0001-v1.zip'),
+        NeoJVETCrawler.DocRecord('JVET-A0002', 'preview.php?doc=JVET-A0002', '2026-01-02 10:00:00', 'Intra', 'Author B',
+                                 'withdrawn', None)]
+
+
+# The docs table has every doc of the meeting page but the withdrawn ones, the zip urls of the docs without a zip link
+# are taken from their preview pages (docs whose preview page has no link either are skipped)
+def test_get_docs_table(tmp_path, site, server):
+    args = getCrawlerArgs(tmp_path, server)
+    meeting = site.meetings[0]
+    assert {doc['kind'] for doc in meeting['docs']} == {'zip', 'missing', 'withdrawn'}
+
+    base_url = args.docsource.replace('doc_end_user/all_meeting.php', '')
+    expected = [['JVET Number', 'Title', 'Zip', 'Authors', 'Last Uploaded']] + \
+               [[doc['number'], f"Title of {doc['number']}", urllib.parse.urljoin(base_url, site.getZipLink(meeting, doc).replace('..', '')),
+                 'Author A, Author B (Company)', doc['uploaded']]
+                for doc in meeting['docs'] if doc['kind'] != 'withdrawn' and doc['number'] != site.no_link_doc]
+
+    meeting_url = args.docsource.replace('all_meeting.php', 'meeting.php?id=1')
+    assert NeoJVETCrawler.getDocsTable(args, meeting_url) == expected
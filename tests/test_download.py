@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Tests of the downloads of JVETHttp (downloadFile): the partial downloads
+#     resumed with Range and If-Range, and the files put in place only once
+#     they are checked complete
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import hashlib
+import http.server
+import io
+import os
+import threading
+import zipfile
+
+import pytest
+
+import JVETHttp
+import jvet_standin
+
+
+# Stop event set once it has been checked a number of times (i.e. after a few chunks of a download)
+class StopAfter:
+    def __init__(self, no_checks):
+        self.no_checks = no_checks
+
+    def is_set(self):
+        self.no_checks -= 1
+        return self.no_checks < 0
+
+
+# Handler answering every request with the body of its server, without Content-Length (the end of the reply is the end
+# of the connection)
+class NoLengthHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+
+# Download of the zip file of the first doc of the site: its url, its contents and the path to download it to
+@pytest.fixture
+def download(tmp_path, site, server):
+    meeting = site.meetings[0]
+    doc = meeting['docs'][0]
+    url = jvet_standin.getSourceUrls(server)[0].replace('all_meeting.php', '') + \
+          site.getZipLink(meeting, doc).replace('../doc_end_user/', '')
+
+    return url, site.getZip(doc['number'], 1), str(tmp_path / 'JVET-A0001-v1.zip')
+
+
+# Small chunks, no retries and no cache (the validators to resume are kept next to the part)
+@pytest.fixture(autouse=True)
+def session(monkeypatch):
+    monkeypatch.setattr(JVETHttp, 'read_size', 1024)
+    JVETHttp.initSession(retries=0, backoff_delay=0.01)
+    JVETHttp.initCache(None)
+
+
+# Stop the download of url after 2 chunks, leaving path.part behind
+def stopDownload(url, path):
+    with pytest.raises(JVETHttp.TransferStopped):
+        JVETHttp.downloadFile(url, path, stop_event=StopAfter(3))
+
+    assert not os.path.exists(path)
+    assert os.path.getsize(path + '.part') == 2 * 1024
+
+
+# A stopped download is resumed from its part, even without the cache
+def test_resume(site, download):
+    url, body, path = download
+    stopDownload(url, path)
+
+    site.resetStats()
+    assert JVETHttp.downloadFile(url, path) == [len(body), hashlib.sha256(body).hexdigest()]
+
+    assert site.bytes_sent == len(body) - 2 * 1024
+    with open(path, 'rb') as fp:
+        assert fp.read() == body
+    assert sorted(os.listdir(os.path.dirname(path))) == ['JVET-A0001-v1.zip']
+
+
+# A part of a file that changed on the server since (other If-Range validator) is downloaded again from the start
+def test_resume_changed(site, download):
+    url, body, path = download
+    stopDownload(url, path)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('JVET-A0001-v1/JVET-A0001.docx', os.urandom(len(body)))
+    site.zips[('JVET-A0001', 1)] = buffer.getvalue()
+
+    site.resetStats()
+    assert JVETHttp.downloadFile(url, path) == [len(buffer.getvalue()), hashlib.sha256(buffer.getvalue()).hexdigest()]
+    assert site.bytes_sent == len(buffer.getvalue())
+
+
+# A part without its validators can not be checked against the file on the server, it is downloaded again
+def test_resume_no_validators(site, download):
+    url, body, path = download
+    stopDownload(url, path)
+    os.remove(path + '.part.meta')
+
+    site.resetStats()
+    assert JVETHttp.downloadFile(url, path)[0] == len(body)
+    assert site.bytes_sent == len(body)
+
+
+# Without Content-Length the file is only put in place if it is a complete zip archive
+@pytest.mark.parametrize('truncated', [False, True])
+def test_no_content_length(download, truncated):
+    url, body, path = download
+
+    server = http.server.HTTPServer(('127.0.0.1', 0), NoLengthHandler)
+    server.body = body[:-100] if truncated else body
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f'http://127.0.0.1:{server.server_port}/JVET-A0001-v1.zip'
+
+        if truncated:
+            with pytest.raises(JVETHttp.IncompleteDownload):
+                JVETHttp.downloadFile(url, path)
+            assert not os.path.exists(path)
+            assert os.path.getsize(path + '.part') == len(body) - 100
+        else:
+            assert JVETHttp.downloadFile(url, path)[0] == len(body)
+            assert os.listdir(os.path.dirname(path)) == ['JVET-A0001-v1.zip']
+    finally:
+        server.shutdown()
+        server.server_close()
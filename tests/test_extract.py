@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Tests of the extraction of NeoJVETCrawler: the delta extraction
+#     (extractZipDelta) of a doc folder of an older version updated to a new
+#     zip file, and the zip files that can not be extracted
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import contextlib
+import io
+import os
+import struct
+import zipfile
+
+import pytest
+
+import jvet_standin
+import NeoJVETCrawler
+from conftest import getCrawlerArgs, getMeetingFolders, readTree, serveSite, syncSite
+
+
+# Zip file with the members given as {name: contents}, names ending in / are folders
+def makeZip(members):
+    buffer = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+    return zipfile.ZipFile(buffer)
+
+
+# Version 1 of the doc, and version 2 with a file unchanged, changed, removed and added, and members changing between
+# file and folder (folders of version 2 only implied by their files)
+OLD_MEMBERS = {'same.txt': b'same', 'changed.txt': b'old', 'gone.txt': b'gone', 'was_dir/': b'', 'was_dir/inner.txt': b'inner',
+               'was_file': b'file'}
+NEW_MEMBERS = {'same.txt': b'same', 'changed.txt': b'new contents', 'added.txt': b'added', 'was_dir': b'now a file',
+               'was_file/inner.txt': b'now in a folder'}
+
+
+# The folder ends with the contents of the new zip file, only what changed is written
+def test_extract_zip_delta(tmp_path):
+    args = NeoJVETCrawler.getArgs(['-o', str(tmp_path)])
+    extract_dir = str(tmp_path / 'JVET-A0001')
+
+    makeZip(OLD_MEMBERS).extractall(extract_dir)
+
+    no_written, no_removed, no_unchanged, no_bytes = NeoJVETCrawler.extractZipDelta(args, makeZip(NEW_MEMBERS), extract_dir)
+
+    assert readTree(extract_dir) == {'same.txt': b'same', 'changed.txt': b'new contents', 'added.txt': b'added',
+                                     'was_dir': b'now a file', 'was_file/': b'', 'was_file/inner.txt': b'now in a folder'}
+    assert [no_written, no_removed, no_unchanged] == [4, 1, 1]
+    assert no_bytes == sum(len(NEW_MEMBERS[name]) for name in ['changed.txt', 'added.txt', 'was_dir', 'was_file/inner.txt'])
+
+    # Up to date, nothing is written
+    assert NeoJVETCrawler.extractZipDelta(args, makeZip(NEW_MEMBERS), extract_dir) == [0, 0, 5, 0]
+
+
+# Files linked to the document store are replaced, not written through, so the blobs of the old version keep their contents
+def test_extract_zip_delta_store(tmp_path):
+    args = NeoJVETCrawler.getArgs(['-o', str(tmp_path), '--store', str(tmp_path / 'store')])
+    extract_dir = str(tmp_path / 'JVET-A0001')
+
+    makeZip(OLD_MEMBERS).extractall(extract_dir)
+    NeoJVETCrawler.storeTree(args, extract_dir)
+    old_blob = NeoJVETCrawler.getBlobPath(args, NeoJVETCrawler.hashFile(os.path.join(extract_dir, 'changed.txt'))[1])
+
+    NeoJVETCrawler.extractZipDelta(args, makeZip(NEW_MEMBERS), extract_dir)
+
+    with open(old_blob, 'rb') as fp:
+        assert fp.read() == b'old'
+    assert os.path.samefile(os.path.join(extract_dir, 'changed.txt'),
+                            NeoJVETCrawler.getBlobPath(args, NeoJVETCrawler.hashFile(os.path.join(extract_dir, 'changed.txt'))[1]))
+
+
+# Zip file (bytes) of a doc that can not be extracted: its member compressed with deflate64 (not supported), encrypted or
+# with corrupt compressed data
+def makeUnreadableZip(doc_number, problem):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr(f'{doc_number}-v1/{doc_number}.docx', bytes(range(256)) * 40, compress_type=zipfile.ZIP_DEFLATED)
+
+    data = bytearray(buffer.getvalue())
+    local_header = data.find(b'PK\x03\x04')
+    central_header = data.find(b'PK\x01\x02')
+
+    if problem == 'deflate64':
+        data[local_header + 8:local_header + 10] = data[central_header + 10:central_header + 12] = struct.pack('<H', 9)
+    elif problem == 'encrypted':
+        data[local_header + 6] |= 1
+        data[central_header + 8] |= 1
+    else:
+        name_size, extra_size = struct.unpack('<HH', data[local_header + 26:local_header + 30])
+        start = local_header + 30 + name_size + extra_size
+        data[start:start + 8] = b'\xff' * 8
+
+    return bytes(data)
+
+
+# Stand-in site whose zip files of JVET-B0001, JVET-B0002 and JVET-B0003 can not be extracted
+class UnreadableZipSite(jvet_standin.JVETSite):
+    PROBLEMS = {'JVET-B0001': 'deflate64', 'JVET-B0002': 'encrypted', 'JVET-B0003': 'corrupt'}
+
+    def __init__(self):
+        super().__init__(2, 4, 8 * 1024, 2, withdrawn=0, missing=0)
+
+    def getZip(self, doc_number, version):
+        if doc_number in self.PROBLEMS:
+            return makeUnreadableZip(doc_number, self.PROBLEMS[doc_number])
+
+        return super().getZip(doc_number, version)
+
+
+# Server of the site with zip files that can not be extracted
+@pytest.fixture
+def unreadable_server():
+    yield from serveSite(UnreadableZipSite())
+
+
+# Zip files that can not be extracted fail only their doc, which is recorded as bad and listed in the errors
+@pytest.mark.parametrize('options', [[], ['--extractjobs', '2'], ['--stream']])
+def test_unreadable_zip(tmp_path, unreadable_server, options):
+    args = getCrawlerArgs(tmp_path, unreadable_server, *options)
+    meeting_folder = getMeetingFolders(args, syncSite(args))['B']
+
+    with contextlib.closing(NeoJVETCrawler.openSyncManifest(meeting_folder)) as conn:
+        assert {doc_number: entry['status'] for doc_number, entry in NeoJVETCrawler.readSyncManifest(conn).items()} == \
+               {'JVET-B0001': 'bad', 'JVET-B0002': 'bad', 'JVET-B0003': 'bad', 'JVET-B0004': 'extracted'}
+
+    with open(os.path.join(meeting_folder, '#extraction_error_list.txt')) as fp:
+        assert fp.read() == ''.join(f'{doc_number}:    {os.path.join(meeting_folder, args.zipdir, f"{doc_number}-v1.zip")}\n'
+                                    for doc_number in UnreadableZipSite.PROBLEMS)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Tests of the extraction of the zip files in a pool of processes
+#     (--extractjobs): large zip files split in chunks of members
+#     (--splitsize), and the progress messages and errors in the docs order
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import contextlib
+import os
+import re
+import time
+
+import pytest
+
+import jvet_standin
+import NeoJVETCrawler
+from conftest import checkSynced, getCrawlerArgs, serveSite, syncSite
+
+
+# Stand-in site of a meeting whose first zip file is the slowest to download, and whose zip files of JVET-A0002 and
+# JVET-A0005 are not zip files
+class SlowBadZipSite(jvet_standin.JVETSite):
+    def __init__(self):
+        super().__init__(1, 6, 8 * 1024, 5, withdrawn=0, missing=0)
+
+    def getZip(self, doc_number, version):
+        if doc_number in ('JVET-A0002', 'JVET-A0005'):
+            return b'not a zip file' * 100
+
+        return super().getZip(doc_number, version)
+
+    def getResource(self, path, query):
+        if path.endswith('/JVET-A0001-v1.zip'):
+            time.sleep(0.5)
+
+        return super().getResource(path, query)
+
+
+# Server of the slow site with bad zip files
+@pytest.fixture
+def slow_server():
+    yield from serveSite(SlowBadZipSite())
+
+
+# Every doc is extracted whole or split in chunks of members, and the files of each doc are recorded
+@pytest.mark.parametrize('options', [['--extractjobs', '2'], ['--extractjobs', '3', '--splitsize', '0']])
+def test_extract_pool(tmp_path, site, server, options):
+    args = getCrawlerArgs(tmp_path, server, *options)
+    meeting_info_table = syncSite(args)
+
+    checkSynced(args, site, meeting_info_table)
+
+
+# Progress messages and errors follow the docs order whatever the order the downloads and extractions finish in
+@pytest.mark.parametrize('options', [['--extractjobs', '1'], ['--extractjobs', '3', '--splitsize', '0']])
+def test_extract_pool_order(tmp_path, slow_server, capsys, options):
+    args = getCrawlerArgs(tmp_path, slow_server, '--jobs', '4', *options)
+    docs_table = NeoJVETCrawler.getDocsTable(args, args.docsource.replace('all_meeting.php', 'meeting.php?id=1'))
+
+    meeting_folder = tmp_path / 'meeting'
+    zip_folder = meeting_folder / 'zipfiles'
+    zip_folder.mkdir(parents=True)
+    capsys.readouterr()
+
+    with contextlib.closing(NeoJVETCrawler.openSyncManifest(str(meeting_folder))) as conn:
+        errors = NeoJVETCrawler.fetchAndExtractZipFiles(args, docs_table, str(zip_folder), str(meeting_folder), conn)
+
+        extracted_files = [tuple(row) for row in conn.execute('SELECT jvet_number, path, size FROM extracted_files ORDER BY jvet_number, path')]
+
+    assert errors == [f'JVET-A0002:    {zip_folder / "JVET-A0002-v1.zip"}', f'JVET-A0005:    {zip_folder / "JVET-A0005-v1.zip"}']
+
+    output = capsys.readouterr().out
+    # The first zip file is downloaded last
+    assert re.findall(r'Downloading (JVET-A\d+) \.\.\.    Done', output)[-1] == 'JVET-A0001'
+    assert re.findall(r'Extracting (JVET-A\d+) \.\.\.    Done!(.*)', output) == \
+           [(doc_number, ' (in 3 parts)' if '--splitsize' in options else '') for doc_number in ['JVET-A0001', 'JVET-A0003', 'JVET-A0004', 'JVET-A0006']]
+
+    assert extracted_files == [(doc_number, f'{doc_number}-v1/{doc_number}_{file_ix}.docx', 8 * 1024 // 5)
+                               for doc_number in ['JVET-A0001', 'JVET-A0003', 'JVET-A0004', 'JVET-A0006'] for file_ix in range(5)]
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Tests of the index of file names of the JVET Meetings File Finder
+#     (JVETFileIndex): the searches of the index against the tree walk the
+#     finder used to do, the refresh of the folders that changed, the live
+#     updates of the inotify watcher and the folders indexed from the files
+#     manifest of the crawler
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import glob
+import json
+import os
+import platform
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from JVETFileIndex import MANIFEST_NAME, FileIndex, IndexWatcher
+from conftest import getCrawlerArgs, syncSite
+
+
+# Create files (paths relative to directory, with their folders)
+def makeFiles(directory, paths):
+    for path in paths:
+        path = os.path.join(directory, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as fp:
+            fp.write(path)
+
+
+# Set the modification time of every folder of a tree (and its files manifests) an hour back, as if they had not changed
+# for a while (folders changed just before they are indexed are scanned again on every refresh)
+def ageTree(directory):
+    past = time.time() - 3600
+
+    for root, dirs, files in os.walk(directory, topdown=False):
+        if MANIFEST_NAME in files:
+            os.utime(os.path.join(root, MANIFEST_NAME), (past, past))
+        os.utime(root, (past, past))
+
+
+# Wait until condition returns True (False if it does not within timeout seconds)
+def waitFor(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+
+    return True
+
+
+# Names found by a search
+def searchNames(index, target):
+    return sorted(name for parent, name in index.search(target))
+
+
+# Search by walking the whole tree, as the finder did before the index
+def walkSearch(documents_directory, target_string):
+    found_files = []
+
+    for file_path in Path(documents_directory).rglob('*'):
+        if file_path.name.startswith(f'{target_string}_'):
+            continue
+        elif (file_path.is_file() and not file_path.parent.name.startswith(f'{target_string}_') and target_string in str(Path(file_path.parent.name, file_path.name)).lower()) or \
+             (file_path.is_dir() and target_string in str(file_path.name).lower()):
+            found_files.append([str(file_path.parent.absolute()), file_path.name])
+
+    return sorted(found_files)
+
+
+# Documents folder with 2 meetings, not changed for a while
+@pytest.fixture
+def documents(tmp_path):
+    directory = tmp_path / 'documents'
+    makeFiles(directory, ['2026_01_A_City/JVET-A0001/JVET-A0001-v1/JVET-A0001_alf.docx',
+                          '2026_01_A_City/JVET-A0001/JVET-A0001-v1/JVET-A0001_alf/attachment.txt',
+                          '2026_01_A_City/JVET-A0002/JVET-A0002-v1/JVET-A0002_cclm.pptx',
+                          '2026_04_B_City/JVET-B0001/JVET-B0001-v1/JVET-B0001_alf.docx'])
+    ageTree(directory)
+
+    return str(directory)
+
+
+# Index kept in the test folder
+@pytest.fixture
+def index(tmp_path):
+    return FileIndex(tmp_path / 'file_index.sqlite')
+
+
+# The index finds what the tree walk finds: names and parent folder names matched, entries named after the target
+# followed by a _ (and the files inside them) left out, short targets (no trigrams) included
+@pytest.mark.parametrize('target', ['alf', 'jvet-a0001', 'jvet-a0001_alf', 'a0001-v1/jvet', 'v1', 'x', 'attachment',
+                                    'cclm.pptx', '2026', 'missing'])
+def test_search(documents, index, target):
+    index.build(documents)
+
+    assert index.get_root() == documents
+    assert sorted(index.search(target)) == walkSearch(documents, target)
+
+
+# Matches are sorted by folder and name and returned in batches
+def test_search_batches(documents, index):
+    index.build(documents)
+
+    batches = list(index.search_batches('jvet', batch_size=4))
+
+    assert [len(batch) for batch in batches[:-1]] == [4] * (len(batches) - 1)
+    assert [match for batch in batches for match in batch] == walkSearch(documents, 'jvet')
+
+
+# A cancelled build leaves the index as it was
+def test_build_cancelled(documents, index):
+    index.build(documents, is_cancelled=lambda: True)
+
+    assert index.get_root() is None
+    assert os.listdir(index.index_path.parent) == ['documents']
+
+
+# Files and folders added, removed and renamed are found after a refresh, which scans only the folders that changed
+def test_refresh(documents, index):
+    assert index.refresh(documents) is None
+    assert index.refresh(documents) == 0
+
+    makeFiles(documents, ['2026_01_A_City/JVET-A0003/JVET-A0003-v1/JVET-A0003_alf.docx'])
+    shutil.rmtree(os.path.join(documents, '2026_04_B_City', 'JVET-B0001'))
+    os.rename(os.path.join(documents, '2026_01_A_City', 'JVET-A0002', 'JVET-A0002-v1', 'JVET-A0002_cclm.pptx'),
+              os.path.join(documents, '2026_01_A_City', 'JVET-A0002', 'JVET-A0002-v1', 'JVET-A0002_alf.pptx'))
+
+    # The 3 folders changed and the 2 folders removed
+    assert index.refresh(documents) == 5
+    assert searchNames(index, 'alf.') == ['JVET-A0001_alf.docx', 'JVET-A0002_alf.pptx', 'JVET-A0003_alf.docx']
+    assert searchNames(index, 'cclm') == []
+    for target in ['alf', 'jvet-a0003', 'b0001']:
+        assert sorted(index.search(target)) == walkSearch(documents, target)
+
+
+# The index of another folder is built from scratch
+def test_refresh_other_folder(documents, index, tmp_path):
+    index.refresh(documents)
+
+    other = tmp_path / 'other'
+    makeFiles(other, ['JVET-C0001_alf.docx'])
+
+    assert index.refresh(str(other)) is None
+    assert searchNames(index, 'alf') == ['JVET-C0001_alf.docx']
+
+
+# A cancelled refresh leaves the folders it did not check for the next one
+def test_refresh_cancelled(documents, index):
+    index.refresh(documents)
+    makeFiles(documents, ['2026_04_B_City/JVET-B0002/JVET-B0002_alf.docx'])
+
+    assert index.refresh(documents, is_cancelled=lambda: True) == 0
+    assert searchNames(index, 'b0002') == []
+
+    assert index.refresh(documents) == 1
+    assert searchNames(index, 'b0002') == ['JVET-B0002', 'JVET-B0002_alf.docx']
+
+
+# The watcher applies the changes as they happen, new folders included
+@pytest.mark.skipif(platform.system() != 'Linux', reason='inotify is only available on Linux')
+def test_watcher(documents, index):
+    index.build(documents)
+
+    watcher = IndexWatcher(index, documents)
+    watcher.start()
+    try:
+        assert waitFor(lambda: len(watcher.watches) == len(index.get_directories()))
+
+        makeFiles(documents, ['2026_07_C_City/JVET-C0001/JVET-C0001_alf.docx'])
+        assert waitFor(lambda: searchNames(index, 'c0001') == ['JVET-C0001', 'JVET-C0001_alf.docx'])
+
+        # Files added to the folders found by the watcher
+        makeFiles(documents, ['2026_07_C_City/JVET-C0001/JVET-C0001_alf_fix.docx'])
+        shutil.rmtree(os.path.join(documents, '2026_04_B_City'))
+        assert waitFor(lambda: searchNames(index, 'alf.') == ['JVET-A0001_alf.docx', 'JVET-C0001_alf.docx'] and
+                               searchNames(index, 'alf_fix') == ['JVET-C0001_alf_fix.docx'])
+    finally:
+        watcher.stop()
+
+    assert watcher.error is None
+
+
+# Meeting folder with a files manifest listing only part of its files (the index trusts the manifest while it is current)
+@pytest.fixture
+def manifest_documents(documents):
+    meeting_folder = os.path.join(documents, '2026_01_A_City')
+    manifest = {'meeting': '2026_01_A_City',
+                'docs': [{'jvet_number': 'JVET-A0001', 'files': [['JVET-A0001-v1', None], ['JVET-A0001-v1/JVET-A0001_alf.docx', 10]]}],
+                'files': [['JVET-A0002', None], ['JVET-A0002/JVET-A0002-v1', None]]}
+    with open(os.path.join(meeting_folder, MANIFEST_NAME), 'w') as fp:
+        json.dump(manifest, fp)
+
+    ageTree(documents)
+    os.utime(os.path.join(meeting_folder, MANIFEST_NAME))
+
+    return documents
+
+
+# Folders with a current manifest are indexed from it, files added later by hand are found after a refresh
+def test_refresh_manifest(manifest_documents, index):
+    meeting_folder = os.path.join(manifest_documents, '2026_01_A_City')
+
+    index.refresh(manifest_documents)
+    assert searchNames(index, 'jvet-a0002') == ['JVET-A0002', 'JVET-A0002-v1']
+    assert index.refresh(manifest_documents) == 0
+
+    makeFiles(meeting_folder, ['notes.docx', 'JVET-A0001/JVET-A0001-v1/JVET-A0001_alf_fix.docx'])
+
+    assert index.refresh(manifest_documents) == 2
+    assert searchNames(index, 'notes') == ['notes.docx']
+    assert sorted(index.search('alf')) == walkSearch(manifest_documents, 'alf')
+
+    # A new manifest is read again
+    os.remove(os.path.join(meeting_folder, 'notes.docx'))
+    os.utime(os.path.join(meeting_folder, MANIFEST_NAME), ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+
+    index.refresh(manifest_documents)
+    assert searchNames(index, 'notes') == []
+    assert searchNames(index, 'jvet-a0002') == ['JVET-A0002', 'JVET-A0002-v1']
+
+
+# Folders changed after their manifest was written are scanned
+def test_build_stale_manifest(manifest_documents, index):
+    makeFiles(os.path.join(manifest_documents, '2026_01_A_City', 'JVET-A0001'), ['JVET-A0001_alf_fix.docx'])
+
+    index.refresh(manifest_documents)
+    assert searchNames(index, 'jvet-a0002') == ['JVET-A0002', 'JVET-A0002-v1', 'JVET-A0002_cclm.pptx']
+    for target in ['jvet-a0002', 'alf']:
+        assert sorted(index.search(target)) == walkSearch(manifest_documents, target)
+
+
+# The manifests written by the crawler list every file of the meeting, the crawler log of the worker processes included
+@pytest.mark.parametrize('meetingjobs', ['1', '2'])
+def test_crawler_manifest(tmp_path, server, index, meetingjobs):
+    args = getCrawlerArgs(tmp_path, server, '--meetingjobs', meetingjobs)
+    syncSite(args)
+    ageTree(args.outputdir)
+
+    index.refresh(args.outputdir)
+
+    conn = index.connect()
+    assert conn.execute('SELECT COUNT(*) FROM manifests').fetchone()[0] == 2
+    conn.close()
+
+    # The same index scanned (the manifests made older than their folders)
+    for manifest in glob.glob(os.path.join(args.outputdir, '*', MANIFEST_NAME)):
+        os.utime(manifest, (0, 0))
+    scanned = FileIndex(tmp_path / 'scanned.sqlite')
+    scanned.refresh(args.outputdir)
+
+    assert index.search('') == scanned.search('')
+    assert len(index.search('#crawler_log.txt')) == (2 if meetingjobs == '2' else 0)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Tests of the retries of JVETHttp (retryRequest) against the stand-in
+#     of the JVET site answering 503 with Retry-After
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import threading
+import time
+
+import pytest
+import requests
+
+import JVETHttp
+import jvet_standin
+from conftest import serveSite
+
+
+# Stand-in site answering its first no_errors requests with 503 (Retry-After: 1)
+class BusySite(jvet_standin.JVETSite):
+    def __init__(self, no_errors):
+        super().__init__(1, 1)
+        self.no_errors = no_errors
+
+    def drawError(self):
+        with self.lock:
+            self.no_errors -= 1
+            return self.no_errors >= 0
+
+
+# Server of a site answering 503 twice, and its page of all meetings
+@pytest.fixture
+def busy_server():
+    site = BusySite(2)
+
+    for server in serveSite(site):
+        yield site, jvet_standin.getSourceUrls(server)[0]
+
+
+# Quick retries (the backoff alone would wait a few milliseconds)
+@pytest.fixture(autouse=True)
+def session():
+    JVETHttp.initSession(retries=3, backoff_delay=0.01)
+
+
+# The replies with 503 are retried after the time asked in Retry-After
+def test_retry_after(busy_server):
+    site, url = busy_server
+
+    start = time.monotonic()
+    assert b'<table>' in JVETHttp.fetchContent(url)
+
+    assert time.monotonic() - start >= 2
+    assert site.requests == 3
+
+
+# The last error is raised once the retries are exhausted
+def test_retries_exhausted(busy_server):
+    site, url = busy_server
+    JVETHttp.initSession(retries=1, backoff_delay=0.01)
+
+    with pytest.raises(requests.HTTPError) as error:
+        JVETHttp.fetchContent(url)
+
+    assert error.value.response.status_code == 503
+    assert site.requests == 2
+
+
+# Errors that do not go away by retrying are raised at once
+def test_not_found_not_retried(busy_server):
+    site, url = busy_server
+    site.no_errors = 0
+
+    with pytest.raises(requests.HTTPError) as error:
+        JVETHttp.fetchContent(url.replace('all_meeting.php', 'missing.php'))
+
+    assert error.value.response.status_code == 404
+    assert site.requests == 1
+
+
+# A stop ends the wait for Retry-After and no more attempts are made
+def test_retry_stopped(busy_server):
+    site, url = busy_server
+    stop_event = threading.Event()
+    threading.Timer(0.2, stop_event.set).start()
+
+    start = time.monotonic()
+    with pytest.raises(JVETHttp.TransferStopped):
+        JVETHttp.fetchContent(url, stop_event)
+
+    assert time.monotonic() - start < 1
+    assert site.requests == 1
+
+
+# Retry-After in seconds (0 if there is none or it can not be read)
+@pytest.mark.parametrize('value, seconds', [['7', 7], ['', 0], ['soon', 0], [None, 0]])
+def test_get_retry_after(value, seconds):
+    response = requests.Response()
+    if value is not None:
+        response.headers['Retry-After'] = value
+
+    assert JVETHttp.getRetryAfter(response) == seconds
+
+
+# Retry-After as an HTTP date, the seconds left until then
+def test_get_retry_after_date():
+    response = requests.Response()
+    response.headers['Retry-After'] = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(time.time() + 30))
+
+    assert 25 < JVETHttp.getRetryAfter(response) <= 30
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/17
+# Updated Date: 2026/10/17
+# version ='1.0'
+#
+# Description:
+#     Tests of the scheduling of the downloads of NeoJVETCrawler: the doc
+#     ranges of --priority and --watchlist (getPriorityRanges), the sizes of
+#     the zip files and the order of the downloads (scheduleZipDownloads)
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import contextlib
+import os
+
+import pytest
+import requests
+
+import JVETHttp
+import NeoJVETCrawler
+from conftest import addSyncedDoc, getCrawlerArgs, getMeetingFolders, makeDocsTable
+
+
+# Size of the zip file of each doc told by the server, None when its HEAD request fails
+SIZES = {'JVET-A0001': 500, 'JVET-A0002': 100, 'JVET-A0003': None, 'JVET-A0004': 300, 'JVET-A0005': 200, 'JVET-A0006': 400}
+
+
+# Crawler arguments with the options given
+def getScheduleArgs(tmp_path, *options):
+    return NeoJVETCrawler.getArgs(['-o', str(tmp_path)] + list(options))
+
+
+# Answer the HEAD requests with SIZES, the urls asked are kept in the list returned
+@pytest.fixture
+def head_requests(monkeypatch):
+    urls = []
+
+    def fetchSize(url, stop_event=None):
+        urls.append(url)
+        size = SIZES[url.split('/')[-1].split('-v')[0]]
+        if size is None:
+            raise requests.ConnectionError(url)
+        return size
+
+    monkeypatch.setattr(JVETHttp, 'fetchSize', fetchSize)
+
+    return urls
+
+
+# Doc numbers in the order their downloads are scheduled
+def getScheduled(args, docs_table, meeting):
+    meeting_folder, zip_folder, conn = meeting
+    downloads = NeoJVETCrawler.planZipDownloads(docs_table, zip_folder, meeting_folder, conn)
+
+    return [download[1] for download in NeoJVETCrawler.scheduleZipDownloads(args, downloads, conn)]
+
+
+# Doc numbers and ranges are read from --priority and from the watchlist (comments and blank lines skipped), reversed
+# ranges are put in order
+def test_priority_ranges(tmp_path):
+    watchlist = tmp_path / 'watchlist.txt'
+    watchlist.write_text('JVET-AB0150  # urgent\n\n# next ones\nJVET-AB0012:JVET-AB0010\n')
+
+    args = getScheduleArgs(tmp_path, '--priority', 'JVET-A0003, JVET-A0005:JVET-A0008', '--watchlist', str(watchlist))
+    assert NeoJVETCrawler.getPriorityRanges(args) == [['JVET-A', 3, 3], ['JVET-A', 5, 8], ['JVET-AB', 150, 150], ['JVET-AB', 10, 12]]
+
+    assert NeoJVETCrawler.isPriorityDoc('JVET-A0006', NeoJVETCrawler.getPriorityRanges(args))
+    assert not NeoJVETCrawler.isPriorityDoc('JVET-AB0006', NeoJVETCrawler.getPriorityRanges(args))
+
+    # The watchlist is read again on each call
+    watchlist.write_text('JVET-AB0001\n')
+    assert NeoJVETCrawler.getPriorityRanges(args) == [['JVET-A', 3, 3], ['JVET-A', 5, 8], ['JVET-AB', 1, 1]]
+
+
+# Ranges across prefixes and items that are not doc numbers are refused
+@pytest.mark.parametrize('priority', ['JVET-A0001:JVET-B0002', 'JVET-A', 'JVET-A0001:'])
+def test_priority_ranges_invalid(tmp_path, priority):
+    with pytest.raises(ValueError):
+        NeoJVETCrawler.getPriorityRanges(getScheduleArgs(tmp_path, '--priority', priority))
+
+
+# The downloads are sorted by size with --order, those of unknown size taken as the largest ones
+# Balanced interleaves the largest and the smallest ones
+@pytest.mark.parametrize('order, expected', [
+    ['table', [1, 2, 3, 4, 5, 6]],
+    ['small', [2, 5, 4, 6, 1, 3]],
+    ['large', [3, 1, 6, 4, 5, 2]],
+    ['balanced', [3, 2, 1, 5, 6, 4]]])
+def test_schedule_order(tmp_path, meeting, head_requests, order, expected):
+    docs_table = makeDocsTable([[doc_number, 1] for doc_number in SIZES])
+
+    assert getScheduled(getScheduleArgs(tmp_path, '--order', order), docs_table, meeting) == [f'JVET-A000{ix}' for ix in expected]
+    # The table order needs no sizes
+    assert len(head_requests) == (0 if order == 'table' else len(SIZES))
+
+
+# The docs given with --priority are downloaded first, each group sorted with --order
+@pytest.mark.parametrize('order, expected', [['table', [4, 5, 6, 1, 2, 3]], ['small', [5, 4, 6, 2, 1, 3]]])
+def test_schedule_priority(tmp_path, meeting, head_requests, order, expected):
+    docs_table = makeDocsTable([[doc_number, 1] for doc_number in SIZES])
+    args = getScheduleArgs(tmp_path, '--order', order, '--priority', 'JVET-A0006:JVET-A0004')
+
+    assert getScheduled(args, docs_table, meeting) == [f'JVET-A000{ix}' for ix in expected]
+
+
+# A revised doc takes the size of its previous version from the sync manifest instead of asking the server
+def test_schedule_revised(tmp_path, meeting, head_requests):
+    meeting_folder, zip_folder, conn = meeting
+    addSyncedDoc(*meeting, makeDocsTable([['JVET-A0002', 1]])[1])
+    size = NeoJVETCrawler.readSyncManifest(conn)['JVET-A0002']['size']
+
+    docs_table = makeDocsTable([['JVET-A0001', 1], ['JVET-A0002', 2]])
+    downloads = NeoJVETCrawler.planZipDownloads(docs_table, zip_folder, meeting_folder, conn)
+
+    assert NeoJVETCrawler.getDownloadSizes(getScheduleArgs(tmp_path), downloads, conn) == {0: 500, 1: size}
+    assert [url.split('/')[-1] for url in head_requests] == ['JVET-A0001-v1.zip']
+
+
+# The sizes of the zip files are asked to the server with HEAD requests
+def test_download_sizes(tmp_path, site, server):
+    args = getCrawlerArgs(tmp_path, server)
+    meeting_info_table = NeoJVETCrawler.getAllMeetingsTable(args)
+    meeting_folder = getMeetingFolders(args, meeting_info_table)['A']
+    zip_folder = os.path.join(meeting_folder, args.zipdir)
+    os.makedirs(zip_folder)
+
+    docs_table = NeoJVETCrawler.getDocsTable(args, args.docsource.replace('all_meeting.php', 'meeting.php?id=1'))
+    with contextlib.closing(NeoJVETCrawler.openSyncManifest(meeting_folder)) as conn:
+        downloads = NeoJVETCrawler.planZipDownloads(docs_table, zip_folder, meeting_folder, conn)
+        sizes = NeoJVETCrawler.getDownloadSizes(args, downloads, conn)
+
+    assert sizes == {ix: len(site.getZip(doc['number'], doc['version'])) for ix, doc in enumerate(site.meetings[0]['docs'])}
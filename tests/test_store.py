@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Tests of the document store of NeoJVETCrawler: the garbage collection
+#     of the blobs no longer used, with the store given by a relative or an
+#     absolute path and inside or outside the output directory
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import glob
+import os
+import shutil
+
+import pytest
+
+import NeoJVETCrawler
+from conftest import getCrawlerArgs, syncSite
+
+
+# Blobs of a store
+def listStore(store_dir):
+    return sorted(os.path.join(root, name) for root, dirs, files in os.walk(store_dir) for name in files)
+
+
+# Blobs of the files of a folder tree (or of a single file)
+def getBlobs(args, path):
+    paths = [path] if os.path.isfile(path) else [os.path.join(root, name) for root, dirs, files in os.walk(path) for name in files]
+
+    return set(NeoJVETCrawler.getBlobPath(args, NeoJVETCrawler.hashFile(file_path)[1]) for file_path in paths)
+
+
+# Every blob in use is kept, and only the blobs of a removed doc (its zip and extracted files) are removed
+@pytest.mark.parametrize('store', ['store', 'absolute', os.path.join('out', '#store')])
+@pytest.mark.parametrize('storelink', ['hardlink', 'reflink'])
+def test_collect_store_garbage(tmp_path, monkeypatch, server, store, storelink):
+    monkeypatch.chdir(tmp_path)
+    if store == 'absolute':
+        store = str(tmp_path / 'store')
+
+    args = getCrawlerArgs(tmp_path, server, '--store', store, '--storelink', storelink)
+    meeting_info_table = syncSite(args)
+
+    assert os.path.isabs(args.store)
+    blobs = listStore(args.store)
+    assert blobs
+
+    NeoJVETCrawler.collectStoreGarbage(args)
+    assert listStore(args.store) == blobs
+
+    # Remove a doc of the first meeting (A) from the output directory
+    meeting_row = [row for row in meeting_info_table[1:] if row[4] == 'A'][0]
+    meeting_folder = os.path.join(args.outputdir, NeoJVETCrawler.getMeetingName(meeting_row))
+    zip_file = glob.glob(os.path.join(meeting_folder, args.zipdir, 'JVET-A0001-*.zip'))[0]
+    removed = getBlobs(args, os.path.join(meeting_folder, 'JVET-A0001')) | getBlobs(args, zip_file)
+    shutil.rmtree(os.path.join(meeting_folder, 'JVET-A0001'))
+    os.remove(zip_file)
+
+    NeoJVETCrawler.collectStoreGarbage(args)
+    assert listStore(args.store) == sorted(set(blobs) - removed)
+    assert len(removed) == 3
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Tests of the streaming extraction mode of NeoJVETCrawler (--stream):
+#     zip files extracted from memory or from their spilled temporary file,
+#     in this process or in the extraction processes, never stored
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import contextlib
+import os
+
+import pytest
+
+import jvet_standin
+import NeoJVETCrawler
+from conftest import checkSynced, getCrawlerArgs, getMeetingFolders, serveSite, syncSite
+
+
+# Stand-in site whose zip file of JVET-B0002 is not a zip file
+class BadZipSite(jvet_standin.JVETSite):
+    def __init__(self):
+        super().__init__(2, 4, 8 * 1024, 2, withdrawn=0, missing=0)
+
+    def getZip(self, doc_number, version):
+        if doc_number == 'JVET-B0002':
+            return b'not a zip file' * 100
+
+        return super().getZip(doc_number, version)
+
+
+# Server of a site with a bad zip file
+@pytest.fixture
+def bad_zip_server():
+    yield from serveSite(BadZipSite())
+
+
+# Every doc is extracted and recorded without writing the zip files: kept in memory or spilled to a temporary file
+# (--spillsize 0), extracted in this process or sent to the extraction processes
+@pytest.mark.parametrize('options', [[], ['--spillsize', '0'], ['--extractjobs', '2'], ['--spillsize', '0', '--extractjobs', '2']])
+def test_stream(tmp_path, site, server, options):
+    args = getCrawlerArgs(tmp_path, server, '--stream', *options)
+    meeting_info_table = syncSite(args)
+
+    checkSynced(args, site, meeting_info_table)
+    for meeting_folder in getMeetingFolders(args, meeting_info_table).values():
+        assert not os.path.exists(os.path.join(meeting_folder, args.zipdir))
+
+
+# A streamed zip file that can not be extracted is recorded as bad and listed in the errors, the other docs are extracted
+def test_stream_bad_zip(tmp_path, bad_zip_server):
+    args = getCrawlerArgs(tmp_path, bad_zip_server, '--stream')
+    meeting_folder = getMeetingFolders(args, syncSite(args))['B']
+
+    with contextlib.closing(NeoJVETCrawler.openSyncManifest(meeting_folder)) as conn:
+        assert {doc_number: entry['status'] for doc_number, entry in NeoJVETCrawler.readSyncManifest(conn).items()} == \
+               {'JVET-B0001': 'extracted', 'JVET-B0002': 'bad', 'JVET-B0003': 'extracted', 'JVET-B0004': 'extracted'}
+
+    with open(os.path.join(meeting_folder, '#extraction_error_list.txt')) as fp:
+        assert fp.read() == f'JVET-B0002:    {os.path.join(meeting_folder, args.zipdir, "JVET-B0002-v1.zip")}\n'
+
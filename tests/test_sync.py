@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Tests of the sync manifest of NeoJVETCrawler: the zip files planned for
+#     download (planZipDownloads) in a new, synced or revised meeting
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import contextlib
+import os
+
+import pytest
+
+import NeoJVETCrawler
+from conftest import addSyncedDoc, getCrawlerArgs, makeDocsTable, syncSite
+
+
+# Doc numbers planned for download
+def getPlanned(docs_table, meeting):
+    meeting_folder, zip_folder, conn = meeting
+
+    return [download[1] for download in NeoJVETCrawler.planZipDownloads(docs_table, zip_folder, meeting_folder, conn)]
+
+
+# Every doc of a new meeting is downloaded, and none once they are synced
+def test_plan_new_and_synced(meeting):
+    docs_table = makeDocsTable([['JVET-A0001', 1], ['JVET-A0002', 1]])
+
+    assert getPlanned(docs_table, meeting) == ['JVET-A0001', 'JVET-A0002']
+
+    for doc in docs_table[1:]:
+        addSyncedDoc(*meeting, doc)
+
+    assert getPlanned(docs_table, meeting) == []
+
+
+# A revised doc is downloaded again, its old zip file is removed and the partial download of the new one kept
+def test_plan_revised(meeting):
+    meeting_folder, zip_folder, conn = meeting
+    addSyncedDoc(*meeting, makeDocsTable([['JVET-A0001', 1]])[1])
+
+    part_file = os.path.join(zip_folder, 'JVET-A0001-v2.zip.part')
+    for path in [part_file, part_file + '.meta']:
+        with open(path, 'wb') as fp:
+            fp.write(b'partial')
+
+    assert getPlanned(makeDocsTable([['JVET-A0001', 2]]), meeting) == ['JVET-A0001']
+    assert sorted(os.listdir(zip_folder)) == ['JVET-A0001-v2.zip.part', 'JVET-A0001-v2.zip.part.meta']
+
+
+# Docs whose zip file was bad or whose download failed, and docs whose folder is gone, are downloaded again
+@pytest.mark.parametrize('status', ['bad', 'failed', 'missing folder'])
+def test_plan_retried(meeting, status):
+    meeting_folder, zip_folder, conn = meeting
+    docs_table = makeDocsTable([['JVET-A0001', 1]])
+    addSyncedDoc(*meeting, docs_table[1], 'extracted' if status == 'missing folder' else status)
+
+    if status == 'missing folder':
+        os.rmdir(os.path.join(meeting_folder, 'JVET-A0001'))
+
+    assert getPlanned(docs_table, meeting) == ['JVET-A0001']
+
+
+# Docs synced before the sync manifest existed are added to it instead of being downloaded, unless the zip file is damaged
+def test_plan_legacy(meeting):
+    meeting_folder, zip_folder, conn = meeting
+    docs_table = makeDocsTable([['JVET-A0001', 1], ['JVET-A0002', 1]])
+    for doc in docs_table[1:]:
+        addSyncedDoc(*meeting, doc, None)
+
+    with open(os.path.join(zip_folder, 'JVET-A0002-v1.zip'), 'r+b') as fp:
+        fp.truncate(10)
+
+    assert getPlanned(docs_table, meeting) == ['JVET-A0002']
+    assert NeoJVETCrawler.readSyncManifest(conn)['JVET-A0001']['status'] == 'extracted'
+
+
+# After syncing the stand-in site only the docs revised on it are downloaded again
+def test_sync_revised_doc(tmp_path, site, server):
+    args = getCrawlerArgs(tmp_path, server)
+    meeting_info_table = syncSite(args)
+
+    meeting_row = [row for row in meeting_info_table[1:] if row[4] == 'A'][0]
+    meeting_folder = os.path.join(args.outputdir, NeoJVETCrawler.getMeetingName(meeting_row))
+
+    site.bumpVersion('JVET-A0002')
+    docs_table = NeoJVETCrawler.getDocsTable(args, meeting_row[-1])
+
+    with contextlib.closing(NeoJVETCrawler.openSyncManifest(meeting_folder)) as conn:
+        assert [download[1] for download in NeoJVETCrawler.planZipDownloads(
+            docs_table, os.path.join(meeting_folder, args.zipdir), meeting_folder, conn)] == ['JVET-A0002']
+
+    # Synced again, nothing is left to download
+    syncSite(args)
+    with contextlib.closing(NeoJVETCrawler.openSyncManifest(meeting_folder)) as conn:
+        assert NeoJVETCrawler.planZipDownloads(docs_table, os.path.join(meeting_folder, args.zipdir), meeting_folder, conn) == []
+        assert NeoJVETCrawler.readSyncManifest(conn)['JVET-A0002']['zip_file'] == 'JVET-A0002-v2.zip'
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#----------------------------------------------------------------------------
+# Created By  : João Santos
+# Created Date: 2026/10/16
+# Updated Date: 2026/10/16
+# version ='1.0'
+#
+# Description:
+#     Tests of the watch mode of NeoJVETCrawler: the docs found new, revised,
+#     withdrawn or failed (diffDocsTable) and the polls of the active meeting
+#     of the stand-in site (watchMeeting), run on a fake clock
+# ---------------------------------------------------------------------------
+
+__author__ = "João Santos"
+__copyright__ = "Copyright 2026, João Santos"
+__license__ = "GPL2"
+__version__ = "1.0"
+__maintainer__ = "João Santos"
+__email__ = "joaompssantos@gmail.com"
+__status__ = "Production"
+
+
+import contextlib
+import os
+import time
+
+import pytest
+
+import jvet_standin
+import NeoJVETCrawler
+from conftest import addSyncedDoc, getCrawlerArgs, makeDocsTable, syncSite
+
+
+# Stand-in site whose meeting pages or zip files of some docs can be made unavailable (not found)
+class FaultySite(jvet_standin.JVETSite):
+    def __init__(self):
+        super().__init__(2, 4, 8 * 1024, 2, withdrawn=0, missing=0)
+        self.meeting_pages_down = False
+        self.missing_zips = set()
+
+    def getResource(self, path, query):
+        if self.meeting_pages_down and path.endswith('/meeting.php'):
+            return None, None
+        if path.endswith('.zip') and path.split('/')[-1].split('-v')[0] in self.missing_zips:
+            return None, None
+
+        return super().getResource(path, query)
+
+
+@pytest.fixture
+def site():
+    return FaultySite()
+
+
+# Clock of the watch: sleeping moves time.monotonic forward at once and runs the next action (one after each poll), the
+# watch is stopped (Ctrl+C) once the actions are done
+class WatchClock:
+    def __init__(self, monkeypatch, actions):
+        self.offset = 0
+        self.actions = list(actions)
+
+        monotonic = time.monotonic
+        monkeypatch.setattr(time, 'monotonic', lambda: monotonic() + self.offset)
+        monkeypatch.setattr(time, 'sleep', self.sleep)
+
+    def sleep(self, seconds):
+        self.offset += seconds
+
+        if not self.actions:
+            raise KeyboardInterrupt
+        self.actions.pop(0)()
+
+
+# Sync the stand-in site and get the table of all meetings, the folder of the watched meeting and its doc numbers prefix
+def syncWatchedMeeting(tmp_path, server):
+    args = getCrawlerArgs(tmp_path, server, '--watch', '10')
+    meeting_info_table = syncSite(args)
+
+    meeting_folder = os.path.join(args.outputdir, NeoJVETCrawler.getMeetingName(meeting_info_table[-1]))
+
+    return args, meeting_info_table, meeting_folder, f'JVET-{meeting_info_table[-1][4]}'
+
+
+# Sync manifest entry of a doc
+def getEntry(meeting_folder, doc_number):
+    with contextlib.closing(NeoJVETCrawler.openSyncManifest(meeting_folder)) as conn:
+        return NeoJVETCrawler.readSyncManifest(conn)[doc_number]
+
+
+# New, revised, withdrawn and failed docs of a docs table compared with the sync manifest
+def test_diff_docs_table(meeting):
+    synced = makeDocsTable([['JVET-A0001', 1], ['JVET-A0002', 1], ['JVET-A0003', 1], ['JVET-A0004', 1], ['JVET-A0005', 1]])
+    for doc, status in zip(synced[1:], ['extracted', 'extracted', 'extracted', 'failed', 'bad']):
+        addSyncedDoc(*meeting, doc, status)
+
+    # A0002 revised, A0003 withdrawn, A0004 still failed, A0005 failed but revised since, A0006 new
+    docs_table = makeDocsTable([['JVET-A0001', 1], ['JVET-A0002', 2], ['JVET-A0004', 1], ['JVET-A0005', 2], ['JVET-A0006', 1]])
+
+    conn = meeting[2]
+    assert NeoJVETCrawler.diffDocsTable(conn, docs_table) == [['JVET-A0006'], ['JVET-A0002', 'JVET-A0005'], ['JVET-A0003'],
+                                                              ['JVET-A0004']]
+    assert NeoJVETCrawler.diffDocsTable(conn, synced) == [[], [], [], ['JVET-A0004', 'JVET-A0005']]
+
+
+# A revised doc is synced on the next poll, and only once
+def test_watch_revised(tmp_path, site, server, monkeypatch, capsys):
+    args, meeting_info_table, meeting_folder, prefix = syncWatchedMeeting(tmp_path, server)
+    capsys.readouterr()
+
+    WatchClock(monkeypatch, [lambda: None, lambda: site.bumpVersion(f'{prefix}0002'), lambda: None])
+    NeoJVETCrawler.watchMeeting(args, meeting_info_table)
+
+    output = capsys.readouterr().out
+    assert output.count('0 new, 1 revised, 0 withdrawn, 0 retried doc(s)') == 1
+    assert f'Revised: {prefix}0002' in output
+    assert getEntry(meeting_folder, f'{prefix}0002')['zip_file'] == f'{prefix}0002-v2.zip'
+
+
+# A poll that fails is logged and the watch goes on
+def test_watch_poll_failed(tmp_path, site, server, monkeypatch, capsys):
+    args, meeting_info_table, meeting_folder, prefix = syncWatchedMeeting(tmp_path, server)
+    capsys.readouterr()
+
+    def recover():
+        site.meeting_pages_down = False
+        site.bumpVersion(f'{prefix}0001')
+
+    WatchClock(monkeypatch, [lambda: setattr(site, 'meeting_pages_down', True), recover])
+    NeoJVETCrawler.watchMeeting(args, meeting_info_table)
+
+    output = capsys.readouterr().out
+    assert output.count('poll failed, trying again on the next one') == 1
+    assert getEntry(meeting_folder, f'{prefix}0001')['zip_file'] == f'{prefix}0001-v2.zip'
+
+
+# A doc that failed is retried after the watch interval, and then at a doubling interval while it keeps failing
+def test_watch_retry_backoff(tmp_path, site, server, monkeypatch, capsys):
+    site.missing_zips.add(f'{site.meetings[-1]["docs"][2]["number"]}')
+    args, meeting_info_table, meeting_folder, prefix = syncWatchedMeeting(tmp_path, server)
+    capsys.readouterr()
+    assert getEntry(meeting_folder, f'{prefix}0003')['status'] == 'failed'
+
+    # Whether the doc was retried on each poll (every 10 seconds)
+    retried = []
+    WatchClock(monkeypatch, [lambda: retried.append(f'Retried: {prefix}0003' in capsys.readouterr().out)] * 5)
+    NeoJVETCrawler.watchMeeting(args, meeting_info_table)
+
+    # Retried at 10 s, then 20 s later (on the poll at 30 or 40 s, the delay starts after the sync)
+    assert retried[:3] == [False, True, False]
+    assert sum(retried) == 2
+
+
+# A doc that failed is synced once it can be downloaded
+def test_watch_retry_recovered(tmp_path, site, server, monkeypatch, capsys):
+    site.missing_zips.add(f'{site.meetings[-1]["docs"][2]["number"]}')
+    args, meeting_info_table, meeting_folder, prefix = syncWatchedMeeting(tmp_path, server)
+
+    WatchClock(monkeypatch, [site.missing_zips.clear, lambda: None])
+    NeoJVETCrawler.watchMeeting(args, meeting_info_table)
+
+    assert f'Retried: {prefix}0003' in capsys.readouterr().out
+    assert getEntry(meeting_folder, f'{prefix}0003')['status'] == 'extracted'
+    assert not os.path.exists(os.path.join(meeting_folder, '#extraction_error_list.txt'))